@@ -35,7 +35,8 @@ function createZip(itemName, itemType) {
   try {
     // Change to the parent directory and create zip with parent folder included
     const marketplaceTypeDir = path.join(MARKETPLACE_PATH, itemType);
-    const zipCommand = `cd "${marketplaceTypeDir}" && zip -r "${zipFilePath}" "${itemName}/"`;
+    // registry-entry.json shards are registry metadata, not part of the installable item
+    const zipCommand = `cd "${marketplaceTypeDir}" && zip -r "${zipFilePath}" "${itemName}/" -x "${itemName}/registry-entry.json"`;
 
     execSync(zipCommand, { stdio: 'pipe' });
 
@@ -32,6 +32,7 @@ const REGISTRY_ONLY_FIELDS = [
   "dependencies",
   "skill_file_url",
   "zip_file_path",
+  "contentHash",
 ];
 
 // Optional metadata fields copied through to the marketplace plugin as-is.
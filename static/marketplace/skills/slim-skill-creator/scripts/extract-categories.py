@@ -2,22 +2,875 @@
 """
 Extract categories and analyze tags from SLIM marketplace registry.json.
 """
-import json
+import os
+import re
 import sys
+import csv
+import json
+import math
+import mmap
+import heapq
+import bisect
+import struct
+import hashlib
 import argparse
+import tempfile
+from array import array
 from pathlib import Path
+from functools import lru_cache
 from collections import Counter, defaultdict
 
+TOKEN_PATTERN = re.compile(r'[a-z0-9]+')
+STOPWORDS = frozenset({
+    'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was',
+    'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'could',
+    'can', 'may', 'might', 'must', 'shall', 'a', 'an', 'as', 'it', 'its', 'this', 'that', 'these',
+    'those', 'from', 'into', 'your', 'you', 'our', 'their', 'using', 'use', 'via', 'any', 'all', 'not',
+    'so', 'if', 'than', 'then', 'also', 'each', 'such', 'more', 'other',
+})
+
+# BM25 parameters (standard Okapi defaults)
+BM25_K1 = 1.2
+BM25_B = 0.75
+# Term frequency multipliers per skill field; names, categories and tags are curated, bodies are not
+FIELD_WEIGHTS = {'name': 3.0, 'category': 3.0, 'tags': 2.0, 'description': 1.5, 'body': 1.0}
+
+# Trigram Jaccard similarity at which two tags (or sibling categories) are proposed for merging
+DEFAULT_SIMILARITY = 0.7
+
+# Machine-readable analytics: dataset -> (record generator method, columns in output order).
+# A column name means the same thing in every dataset, so a mixed CSV stays unambiguous:
+# *Count columns are numbers, plural names (tags, categories, skillNames) are lists.
+EXPORT_DATASETS = {
+    'categories': ('iter_category_records', [
+        'kind', 'categoryPath', 'segment', 'depth', 'skillCount', 'directSkillCount', 'categoryCount',
+        'childCount', 'tagCount', 'tagUses', 'icon', 'skillNames']),
+    'tags': ('iter_tag_records', [
+        'kind', 'tag', 'uses', 'rank', 'categories', 'skillNames']),
+    'cooccurrence': ('iter_cooccurrence_records', [
+        'kind', 'tag', 'otherTag', 'sharedSkillCount']),
+    'skills': ('iter_skill_records', [
+        'kind', 'skillName', 'categoryPath', 'depth', 'tagCount', 'tags', 'descriptionWords', 'lastUpdated',
+        'hasIcon']),
+}
+# Joins list values into one CSV cell
+CSV_LIST_SEPARATOR = ';'
+
+# Full-text --search over every text file under the skills root
+DEFAULT_SEARCH_INDEX = ".slim-cache/search-index.json"
+# Bump whenever search tokenization or the index layout changes so saved indexes are rebuilt
+SEARCH_INDEX_VERSION = 1
+# Larger files are generated or vendored content, not something authors search
+MAX_SEARCH_FILE_SIZE = 1024 * 1024
+# Never content worth searching, even when they decode as text
+SEARCH_SKIP_SUFFIXES = {'.svg', '.pyc', '.zip', '.png', '.jpg', '.jpeg', '.gif', '.ico', '.pdf'}
+SEARCH_SKIP_FILES = {'registry-entry.json'}
+QUERY_PATTERN = re.compile(r'"([^"]*)"|(\S+)')
+SNIPPETS_PER_FILE = 3
+SNIPPET_WIDTH = 120
+
+DEFAULT_INDEX_PATH = ".slim-cache/suggest-index.bin"
+# Bump whenever tokenization, weights or the file layout change so saved indexes are rebuilt
+INDEX_VERSION = 1
+INDEX_MAGIC = b'SLIMSUGG'
+INDEX_HEADER = struct.Struct('<8sII')
+# Sections in file order; typed ones are native-endian arrays cast straight from the mapping
+INDEX_SECTIONS = ('meta', 'keys', 'terms', 'term_offsets', 'posting_offsets', 'posting_docs',
+                  'posting_impacts', 'vector_offsets', 'vector_terms', 'vector_weights')
+SECTION_TYPES = {
+    'term_offsets': 'I', 'posting_offsets': 'I', 'posting_docs': 'I', 'posting_impacts': 'd',
+    'vector_offsets': 'I', 'vector_terms': 'I', 'vector_weights': 'd',
+}
+
+def normalize_token(token):
+    """Fold simple English plurals so 'tests' and 'test' index together."""
+    if len(token) > 4 and token.endswith('ies'):
+        return token[:-3] + 'y'
+    if len(token) > 3 and token.endswith('s') and not token.endswith(('ss', 'us', 'is')):
+        return token[:-1]
+    return token
+
+def tokenize(text):
+    """Split text into lowercase index terms, dropping stopwords."""
+    return [normalize_token(token) for token in TOKEN_PATTERN.findall(text.lower())
+            if len(token) > 1 and token not in STOPWORDS]
+
+def label_key(label):
+    """Normalize a tag or category segment so case, separator and plural variants compare equal."""
+    return ''.join(normalize_token(token) for token in TOKEN_PATTERN.findall(label.lower()))
+
+def trigrams(key):
+    """Character trigrams of a normalized label, padded so short labels still have some."""
+    padded = f'${key}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+def cluster_labels(counts, order, threshold=DEFAULT_SIMILARITY, hierarchical=False):
+    """Group near-duplicate labels and pick a canonical spelling for each group.
+
+    Labels with the same normalized form always merge. Otherwise only labels that
+    share a trigram in the inverted index are compared, and they merge when their
+    trigram Jaccard similarity reaches threshold. With hierarchical, labels are
+    categories and only siblings under the same parent are compared.
+
+    counts maps labels to uses and order maps them to first-seen rank. Returns
+    clusters of more than one label as {'canonical': label, 'uses': uses, 'variants':
+    [(label, uses, similarity)]}, where the canonical label is the most used, then first seen.
+    """
+    labels = sorted(counts, key=order.get)
+    parent = {label: label for label in labels}
+    links = {}
+
+    def find(label):
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def link(label, other, similarity):
+        first, second = sorted((find(label), find(other)), key=order.get)
+        parent[second] = first
+        links[label] = max(links.get(label, 0.0), similarity)
+        links[other] = max(links.get(other, 0.0), similarity)
+
+    # Identical normalized forms merge outright
+    by_key = {}
+    for label in labels:
+        scope, _, leaf = label.rpartition('/') if hierarchical else ('', '', label)
+        key = ('/'.join(label_key(segment) for segment in scope.split('/')), label_key(leaf))
+        if key in by_key:
+            link(label, by_key[key], 1.0)
+        else:
+            by_key[key] = label
+
+    # Near duplicates: postings are keyed by (parent, trigram), so only labels
+    # sharing a trigram within the same parent are ever compared
+    postings = defaultdict(list)
+    gram_sets = {}
+    for key, label in by_key.items():
+        scope, leaf = key
+        if not leaf:
+            continue
+        grams = gram_sets[key] = trigrams(leaf)
+        shared = Counter()
+        for gram in grams:
+            for other in postings[scope, gram]:
+                shared[other] += 1
+            postings[scope, gram].append(key)
+        for other, overlap in shared.items():
+            similarity = overlap / (len(grams) + len(gram_sets[other]) - overlap)
+            if similarity >= threshold:
+                link(label, by_key[other], similarity)
+
+    groups = defaultdict(list)
+    for label in labels:
+        groups[find(label)].append(label)
+
+    clusters = []
+    for members in groups.values():
+        if len(members) < 2:
+            continue
+        canonical = min(members, key=lambda label: (-counts[label], order[label]))
+        clusters.append({
+            'canonical': canonical,
+            'uses': counts[canonical],
+            'variants': [(label, counts[label], links[label]) for label in members if label != canonical],
+        })
+    clusters.sort(key=lambda cluster: order[cluster['canonical']])
+    return clusters
+
+def read_skill_body(skill_dir):
+    """Return the SKILL.md text after its frontmatter, or '' if unavailable."""
+    try:
+        content = (skill_dir / 'SKILL.md').read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
+        return ''
+    if content.startswith('---'):
+        parts = content.split('---', 2)
+        return parts[2] if len(parts) == 3 else ''
+    return content
+
+def resolve_skills_root(registry_path, skills_root=None):
+    """Return the directory of skill folders, or None if it does not exist."""
+    if skills_root is None:
+        # static/data/registry.json sits beside static/marketplace/skills
+        skills_root = Path(registry_path).resolve().parent.parent / 'marketplace' / 'skills'
+    skills_root = Path(skills_root)
+    return skills_root if skills_root.is_dir() else None
+
+def body_stamp(skills_root, name):
+    """Return [mtime_ns, size] of a skill's SKILL.md, or None if there is no body to index."""
+    if not skills_root or not name:
+        return None
+    try:
+        stat = os.stat(skills_root / name / 'SKILL.md')
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+def document_key(skill, stamp):
+    """Fingerprint everything a skill contributes to the suggestion index."""
+    payload = json.dumps([skill.get('name', ''), skill.get('category', ''), skill.get('tags', []),
+                          skill.get('description', ''), stamp])
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+def rank_tags_for_category(target_category, category_tag_uses, tag_counter, tag_rank, limit=10):
+    """Score tags by their use in categories similar to target_category."""
+    target_main = target_category.split('/')[0]
+    category_tags = {}
+
+    # Weigh each distinct category once, then credit its tags by use count
+    for category, uses in category_tag_uses.items():
+        # Check if categories are similar
+        if target_category in category or category in target_category:
+            weight = 1
+        # Check for main category match
+        elif '/' in category and '/' in target_category and category.split('/')[0] == target_main:
+            weight = 0.5  # Weight similar main categories
+        else:
+            continue
+
+        for tag, count in uses.items():
+            category_tags[tag] = category_tags.get(tag, 0) + count * tag_counter[tag] * weight
+
+    # Highest scores first; ties keep first-seen tag order
+    key = lambda item: (-item[1], tag_rank[item[0]])
+    if limit is None:
+        return sorted(category_tags.items(), key=key)
+    return heapq.nsmallest(limit, category_tags.items(), key=key)
+
+class SuggestionRanking:
+    """Query side of the BM25 index, shared by in-memory and memory-mapped indexes.
+
+    Subclasses provide skills (dicts with at least name and category) and
+    postings_for(term), returning parallel sequences of skill positions and
+    that term's final BM25 contribution to each skill.
+    """
+
+    def score(self, terms):
+        """Accumulate BM25 scores per skill for the distinct query terms."""
+        scores = {}
+        get = scores.get
+        for term in dict.fromkeys(terms):
+            docs, impacts = self.postings_for(term)
+            for doc, impact in zip(docs, impacts):
+                scores[doc] = get(doc, 0.0) + impact
+        return scores
+
+    def top_skills(self, terms, limit=5):
+        """Best matching skills as (skill, score), ties in registry order."""
+        best = heapq.nsmallest(limit, self.score(terms).items(), key=lambda item: (-item[1], item[0]))
+        return [(self.skills[doc], score) for doc, score in best]
+
+    def rank_categories(self, terms, limit=None):
+        """Categories ordered by their best matching skill, then by total score."""
+        best = {}
+        for doc, score in self.score(terms).items():
+            category = self.skills[doc].get('category', '')
+            if not category:
+                continue
+            top, total, first = best.get(category, (0.0, 0.0, doc))
+            best[category] = (max(top, score), total + score, min(first, doc))
+        key = lambda item: (-item[1][0], -item[1][1], item[1][2])
+        ranked = heapq.nsmallest(limit, best.items(), key=key) if limit else sorted(best.items(), key=key)
+        return [(category, top) for category, (top, _, _) in ranked]
+
+class SuggestionIndex(SuggestionRanking):
+    """BM25 ranking over skill names, categories, tags, descriptions and SKILL.md bodies.
+
+    Each posting stores the term's final BM25 contribution to the skill, so a query
+    only sums posting lists and keeps the best results with a heap. reuse maps
+    document keys to term weights from an earlier build; matching skills skip
+    tokenization and SKILL.md reads.
+    """
+
+    def __init__(self, skills, skills_root=None, reuse=None):
+        self.skills = skills
+        self.postings = {}
+        # Per skill: weighted term frequencies, fingerprint and SKILL.md stamp, kept for saving
+        self.doc_terms = []
+        self.doc_keys = []
+        self.body_stamps = []
+        reuse = reuse or {}
+
+        for skill in skills:
+            name = skill.get('name', '')
+            stamp = body_stamp(skills_root, name)
+            key = document_key(skill, stamp)
+            frequencies = reuse.get(key)
+            if frequencies is None:
+                frequencies = {}
+                fields = {
+                    'name': name,
+                    'category': skill.get('category', ''),
+                    'tags': ' '.join(skill.get('tags', [])),
+                    'description': skill.get('description', ''),
+                    'body': read_skill_body(skills_root / name) if stamp else '',
+                }
+                for field, text in fields.items():
+                    weight = FIELD_WEIGHTS[field]
+                    for term in tokenize(text):
+                        frequencies[term] = frequencies.get(term, 0.0) + weight
+            self.doc_terms.append(frequencies)
+            self.doc_keys.append(key)
+            self.body_stamps.append(stamp)
+
+        term_frequencies = defaultdict(dict)
+        for doc, frequencies in enumerate(self.doc_terms):
+            for term, tf in frequencies.items():
+                term_frequencies[term][doc] = tf
+
+        lengths = [sum(frequencies.values()) for frequencies in self.doc_terms]
+        total = len(lengths)
+        average_length = sum(lengths) / total if total and sum(lengths) else 1.0
+        for term, frequencies in term_frequencies.items():
+            idf = math.log(1 + (total - len(frequencies) + 0.5) / (len(frequencies) + 0.5))
+            self.postings[term] = (tuple(frequencies), tuple(
+                idf * tf * (BM25_K1 + 1) /
+                (tf + BM25_K1 * (1 - BM25_B + BM25_B * lengths[doc] / average_length))
+                for doc, tf in frequencies.items()
+            ))
+
+    def postings_for(self, term):
+        return self.postings.get(term, ((), ()))
+
+class MappedSuggestionIndex(SuggestionRanking):
+    """Saved suggestion index read through mmap.
+
+    Only the small JSON metadata section is parsed on open; term lookups binary
+    search the sorted term table and read postings in place.
+    """
+
+    def __init__(self, index_path, registry_path, skills_root=None):
+        self.registry_path = Path(registry_path)
+        self.skills_root = skills_root
+        with open(index_path, 'rb') as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count = INDEX_HEADER.unpack_from(self.map)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION or count != len(INDEX_SECTIONS):
+            raise ValueError("unsupported index format")
+        spans = struct.unpack_from(f'<{2 * count}Q', self.map, INDEX_HEADER.size)
+
+        view = memoryview(self.map)
+        self.sections = {}
+        for name, offset, length in zip(INDEX_SECTIONS, spans[::2], spans[1::2]):
+            section = view[offset:offset + length]
+            self.sections[name] = section.cast(SECTION_TYPES[name]) if name in SECTION_TYPES else section
+
+        self.meta = json.loads(bytes(self.sections['meta']))
+        if self.meta['byteorder'] != sys.byteorder:
+            raise ValueError("index was written on a machine with a different byte order")
+        self.skills = [{'name': name, 'category': category} for name, category in self.meta['docs']]
+
+    def is_current(self):
+        """True if the registry and every indexed SKILL.md are unchanged since the index was written."""
+        stored = self.meta['registry']
+        if self.meta['skills_root'] != (str(self.skills_root) if self.skills_root else None):
+            return False
+        try:
+            stat = os.stat(self.registry_path)
+        except OSError:
+            return False
+        if [stat.st_size, stat.st_mtime_ns] != [stored['size'], stored['mtime_ns']]:
+            # Touched is not necessarily changed; the content hash decides
+            if hashlib.sha256(self.registry_path.read_bytes()).hexdigest() != stored['sha256']:
+                return False
+        return all(body_stamp(self.skills_root, name) == stamp
+                   for (name, _), stamp in zip(self.meta['docs'], self.meta['bodies']))
+
+    def term(self, position):
+        offsets = self.sections['term_offsets']
+        return bytes(self.sections['terms'][offsets[position]:offsets[position + 1]])
+
+    def postings_for(self, term):
+        key = term.encode('utf-8')
+        low, high = 0, len(self.sections['term_offsets']) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.term(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == len(self.sections['term_offsets']) - 1 or self.term(low) != key:
+            return (), ()
+        offsets = self.sections['posting_offsets']
+        start, end = offsets[low], offsets[low + 1]
+        return self.sections['posting_docs'][start:end], self.sections['posting_impacts'][start:end]
+
+    def document_terms(self):
+        """Map each stored document key to its term weights, for incremental rebuilds."""
+        terms = [self.term(position).decode('utf-8')
+                 for position in range(len(self.sections['term_offsets']) - 1)]
+        offsets = self.sections['vector_offsets']
+        vector_terms = self.sections['vector_terms']
+        vector_weights = self.sections['vector_weights']
+        return {
+            key: {terms[vector_terms[i]]: vector_weights[i] for i in range(offsets[doc], offsets[doc + 1])}
+            for doc, key in enumerate(json.loads(bytes(self.sections['keys'])))
+        }
+
+    def get_suggestion_index(self):
+        return self
+
+    def get_category_suggestions(self, keywords=None):
+        """Suggest categories based on keywords."""
+        if not keywords:
+            return list(self.meta['main_categories'])
+
+        ranked = self.rank_categories(tokenize(' '.join(keywords)))
+        if ranked:
+            return [category for category, score in ranked]
+        # Substring matching needs descriptions, which only the registry has
+        return CategoryExtractor(self.registry_path, self.skills_root).match_category_keywords(keywords)
+
+    def suggest_tags_for_category(self, target_category, limit=10):
+        """Suggest relevant tags for a given category."""
+        category_tag_uses = self.meta['category_tags']
+        tag_counter = Counter()
+        for uses in category_tag_uses.values():
+            tag_counter.update(uses)
+        tag_rank = {tag: rank for rank, tag in enumerate(self.meta['tags'])}
+        return rank_tags_for_category(target_category, category_tag_uses, tag_counter, tag_rank, limit)
+
+def write_suggestion_index(extractor, index_path, previous=None):
+    """Build the suggestion index for extractor's registry and save it as one mappable file.
+
+    Skills whose registry entry and SKILL.md are unchanged since previous reuse its term weights.
+    """
+    skills = extractor.registry_data.get('skills', [])
+    index = SuggestionIndex(skills, extractor.skills_root, previous.document_terms() if previous else None)
+
+    sections = {name: array(code) for name, code in SECTION_TYPES.items()}
+    terms = sorted(index.postings)
+    term_ids = {term: position for position, term in enumerate(terms)}
+    term_blob = bytearray()
+    sections['term_offsets'].append(0)
+    sections['posting_offsets'].append(0)
+    for term in terms:
+        term_blob += term.encode('utf-8')
+        sections['term_offsets'].append(len(term_blob))
+        docs, impacts = index.postings[term]
+        sections['posting_docs'].extend(docs)
+        sections['posting_impacts'].extend(impacts)
+        sections['posting_offsets'].append(len(sections['posting_docs']))
+
+    sections['vector_offsets'].append(0)
+    for frequencies in index.doc_terms:
+        sections['vector_terms'].extend(term_ids[term] for term in frequencies)
+        sections['vector_weights'].extend(frequencies.values())
+        sections['vector_offsets'].append(len(sections['vector_terms']))
+
+    meta = {
+        'byteorder': sys.byteorder,
+        'registry': extractor.registry_stamp,
+        'skills_root': str(extractor.skills_root) if extractor.skills_root else None,
+        'docs': [[skill.get('name', ''), skill.get('category', '')] for skill in skills],
+        'bodies': index.body_stamps,
+        'main_categories': list(extractor.main_categories),
+        'tags': list(extractor.tag_rank),
+        'category_tags': {category: dict(uses) for category, uses in extractor.category_tag_uses.items()},
+    }
+    payloads = {
+        'meta': json.dumps(meta, ensure_ascii=False).encode('utf-8'),
+        'keys': json.dumps(index.doc_keys).encode('utf-8'),
+        'terms': bytes(term_blob),
+    }
+    payloads.update((name, values.tobytes()) for name, values in sections.items())
+
+    # Lay sections out on 8-byte boundaries after the header and span table
+    position = INDEX_HEADER.size + 16 * len(INDEX_SECTIONS)
+    spans, body = [], bytearray()
+    for name in INDEX_SECTIONS:
+        padding = -(position + len(body)) % 8
+        body += b'\0' * padding
+        spans.extend((position + len(body), len(payloads[name])))
+        body += payloads[name]
+    content = (INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(INDEX_SECTIONS)) +
+               struct.pack(f'<{len(spans)}Q', *spans) + body)
+
+    index_path = Path(index_path)
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=index_path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, index_path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+def load_suggestion_index(registry_path, skills_root=None, index_path=DEFAULT_INDEX_PATH):
+    """Open the saved suggestion index, rebuilding it first if the registry or a SKILL.md changed."""
+    resolved_root = resolve_skills_root(registry_path, skills_root)
+    previous = None
+    try:
+        previous = MappedSuggestionIndex(index_path, registry_path, resolved_root)
+    except FileNotFoundError:
+        pass
+    except (OSError, ValueError, TypeError, KeyError, struct.error) as e:
+        print(f"⚠️  Rebuilding unreadable suggestion index {index_path}: {e}")
+
+    if previous is not None and previous.is_current():
+        return previous
+
+    extractor = CategoryExtractor(registry_path, skills_root)
+    write_suggestion_index(extractor, index_path, previous)
+    return MappedSuggestionIndex(index_path, registry_path, resolved_root)
+
+def search_tokens(text):
+    """Tokens for full-text search; stopwords are kept so phrases match exactly."""
+    return [normalize_token(token) for token in TOKEN_PATTERN.findall(text.lower())]
+
+def count_search_terms(text):
+    """Term frequencies of text, counting raw words first so plural folding runs once per word."""
+    counts = {}
+    for word, count in Counter(TOKEN_PATTERN.findall(text.lower())).items():
+        term = normalize_token(word)
+        counts[term] = counts.get(term, 0) + count
+    return counts
+
+def decode_text(data):
+    """Decode file bytes as UTF-8 text, or return None for binary content."""
+    if b'\0' in data[:8192]:
+        return None
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        return None
+
+def parse_search_query(query):
+    """Split a query into phrases, each a token list.
+
+    Quoted text and hyphenated words such as project-setup are phrases; lone
+    stopwords are dropped unless the query has nothing else.
+    """
+    phrases, stopwords = [], []
+    for quoted, word in QUERY_PATTERN.findall(query):
+        tokens = search_tokens(quoted or word)
+        if not tokens:
+            continue
+        if not quoted and len(tokens) == 1 and tokens[0] in STOPWORDS:
+            stopwords.append(tokens)
+        else:
+            phrases.append(tokens)
+    return phrases or stopwords
+
+@lru_cache(maxsize=None)
+def phrase_pattern(phrase):
+    """Regex matching every span that could tokenize to phrase (a tuple of tokens).
+
+    Each token matches any word starting with it (minus a trailing 'y', which
+    plural folding restores from 'ies'), so the pattern over-approximates and
+    find_phrase_lines confirms each hit by tokenizing just the matched span.
+    """
+    words = [re.escape(token[:-1] if token.endswith('y') else token) + '[a-z0-9]*' for token in phrase]
+    return re.compile('(?<![a-z0-9])' + '[^a-z0-9]+'.join(words) + '(?![a-z0-9])')
+
+def find_phrase_lines(text, phrase):
+    """Line numbers (1-based) where each occurrence of a token phrase starts in text."""
+    lowered = text.lower()
+    lines, line_no, counted = [], 1, 0
+    for match in phrase_pattern(tuple(phrase)).finditer(lowered):
+        if search_tokens(match.group()) == phrase:
+            line_no += lowered.count('\n', counted, match.start())
+            counted = match.start()
+            lines.append(line_no)
+    return lines
+
+class SkillSearchIndex:
+    """Inverted index over every text file under the skills root, kept in one JSON cache.
+
+    files maps each relative path to its id, stat stamp, content hash and token
+    count; postings maps each term to a flat [file id, frequency, ...] list, which
+    loads far faster than nested objects. update() only re-reads files whose
+    mtime or size changed and only re-tokenizes those whose hash changed. Phrases
+    are checked, and snippets taken, by reading the few candidate files a query leaves.
+    """
+
+    def __init__(self, skills_root, index_path=DEFAULT_SEARCH_INDEX):
+        self.skills_root = Path(skills_root)
+        self.index_path = Path(index_path)
+        self.files = {}
+        self.postings = {}
+        self.next_id = 0
+        self.dirty = False
+        self.load()
+
+    def load(self):
+        """Load the saved index, starting empty if it is missing, stale or for another root."""
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if (isinstance(data, dict) and data.get('version') == SEARCH_INDEX_VERSION
+                and data.get('root') == str(self.skills_root.resolve())):
+            self.files = data.get('files', {})
+            self.postings = data.get('postings', {})
+            self.next_id = data.get('nextId', 0)
+
+    def save(self):
+        """Atomically write the index back to disk if it changed."""
+        if not self.dirty:
+            return
+        data = {
+            'version': SEARCH_INDEX_VERSION,
+            'root': str(self.skills_root.resolve()),
+            'nextId': self.next_id,
+            'files': self.files,
+            'postings': self.postings,
+        }
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.index_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False, separators=(',', ':'))
+            os.replace(tmp_path, self.index_path)
+        except BaseException:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self.dirty = False
+
+    def iter_files(self):
+        """Yield (relative path, stat) for every candidate file under the skills root."""
+        for directory, dirnames, filenames in os.walk(self.skills_root):
+            dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d != '__pycache__')
+            for filename in sorted(filenames):
+                path = Path(directory) / filename
+                if (filename.startswith('.') or filename in SEARCH_SKIP_FILES
+                        or path.suffix.lower() in SEARCH_SKIP_SUFFIXES):
+                    continue
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                if stat.st_size <= MAX_SEARCH_FILE_SIZE:
+                    yield path.relative_to(self.skills_root).as_posix(), stat
+
+    def read_text(self, relative):
+        """Return a file's text, or None if it is unreadable or binary."""
+        try:
+            data = (self.skills_root / relative).read_bytes()
+        except OSError:
+            return None
+        return decode_text(data)
+
+    def update(self):
+        """Bring the index in line with the files on disk; returns (reindexed, removed) counts."""
+        seen = set()
+        stale_ids = set()
+        fresh = []
+        for relative, stat in self.iter_files():
+            seen.add(relative)
+            entry = self.files.get(relative)
+            if entry and (entry['mtime_ns'], entry['size']) == (stat.st_mtime_ns, stat.st_size):
+                continue
+
+            try:
+                data = (self.skills_root / relative).read_bytes()
+            except OSError:
+                seen.discard(relative)
+                continue
+            digest = hashlib.sha1(data).hexdigest()
+            self.dirty = True
+            if entry and entry['sha1'] == digest:
+                # Touched but unchanged: refresh the stamp, keep the postings
+                entry['mtime_ns'], entry['size'] = stat.st_mtime_ns, stat.st_size
+                continue
+
+            if entry:
+                stale_ids.add(entry['id'])
+            text = decode_text(data)
+            # Binary files are recorded without terms so they are not re-read every run
+            fresh.append((relative, stat, digest, count_search_terms(text) if text is not None else {}))
+
+        removed = [relative for relative in self.files if relative not in seen]
+        for relative in removed:
+            stale_ids.add(self.files.pop(relative)['id'])
+
+        if stale_ids:
+            self.dirty = True
+            for term, posting in list(self.postings.items()):
+                ids = posting[0::2]
+                if stale_ids.isdisjoint(ids):
+                    continue
+                kept = []
+                for file_id, count in zip(ids, posting[1::2]):
+                    if file_id not in stale_ids:
+                        kept += (file_id, count)
+                if kept:
+                    self.postings[term] = kept
+                else:
+                    del self.postings[term]
+
+        for relative, stat, digest, counts in fresh:
+            file_id = self.next_id
+            self.next_id += 1
+            for term, count in counts.items():
+                self.postings.setdefault(term, []).extend((file_id, count))
+            self.files[relative] = {
+                'id': file_id,
+                'mtime_ns': stat.st_mtime_ns,
+                'size': stat.st_size,
+                'sha1': digest,
+                'length': sum(counts.values()),
+            }
+        return len(fresh), len(removed)
+
+    def search(self, query, limit=10):
+        """Rank files containing every phrase of query.
+
+        Returns [(relative path, score, [(line number, line)])], best first. Each
+        candidate's upper bound comes from index term counts alone, so files are
+        read in bound order and reading stops once no remaining file can make the top.
+        """
+        phrases = parse_search_query(query)
+        if not phrases:
+            return []
+        frequencies = {}
+        for term in {term for phrase in phrases for term in phrase}:
+            posting = self.postings.get(term)
+            if not posting:
+                return []
+            frequencies[term] = dict(zip(posting[0::2], posting[1::2]))
+
+        paths = {entry['id']: relative for relative, entry in self.files.items()}
+        lengths = [entry['length'] for entry in self.files.values()]
+        average_length = sum(lengths) / len(lengths) if sum(lengths) else 1.0
+
+        def weight(phrase, frequency, length):
+            # A phrase is at most as common as its rarest term, so that term's
+            # document frequency stands in for the phrase's
+            documents = min(len(frequencies[term]) for term in phrase)
+            idf = math.log(1 + (len(lengths) - documents + 0.5) / (documents + 0.5))
+            return idf * frequency * (BM25_K1 + 1) / (
+                frequency + BM25_K1 * (1 - BM25_B + BM25_B * length / average_length))
+
+        ordered = sorted(frequencies.values(), key=len)
+        bounds = []
+        for file_id in set(ordered[0]).intersection(*ordered[1:]):
+            relative = paths[file_id]
+            length = self.files[relative]['length']
+            # A phrase occurs no more often than its least frequent term
+            bound = sum(weight(phrase, min(frequencies[term][file_id] for term in phrase), length)
+                        for phrase in phrases)
+            bounds.append((-bound, relative))
+        heapq.heapify(bounds)
+
+        best = []
+        while bounds:
+            negative_bound, relative = heapq.heappop(bounds)
+            if len(best) == limit and -negative_bound < best[0][0]:
+                break
+            text = self.read_text(relative)
+            if text is None:
+                continue
+            matches = []
+            for phrase in phrases:
+                found = find_phrase_lines(text, phrase)
+                if not found:
+                    break
+                matches.append(found)
+            if len(matches) < len(phrases):
+                continue
+
+            length = self.files[relative]['length']
+            score = sum(weight(phrase, len(found), length) for phrase, found in zip(phrases, matches))
+            lines = text.split('\n')
+            line_numbers = sorted({line_no for found in matches for line_no in found})[:SNIPPETS_PER_FILE]
+            snippets = [(line_no, lines[line_no - 1].strip()[:SNIPPET_WIDTH]) for line_no in line_numbers]
+            # Min-heap on (score, reversed path) keeps the best results, ties by path
+            item = (score, [-ord(c) for c in relative], relative, snippets)
+            if len(best) < limit:
+                heapq.heappush(best, item)
+            elif item[:2] > best[0][:2]:
+                heapq.heapreplace(best, item)
+
+        return [(relative, score, snippets)
+                for score, _, relative, snippets in sorted(best, key=lambda item: (-item[0], item[2]))]
+
+class CategoryNode:
+    """One category path segment with counts aggregated over its whole subtree."""
+
+    def __init__(self, name, path):
+        self.name = name
+        self.path = path
+        self.children = {}
+        self.skills = []              # Skills filed directly under this exact category
+        self.skill_count = 0          # Skills anywhere in the subtree
+        self.category_count = 0       # Distinct categories with skills in the subtree
+        self.tag_counts = Counter()   # Tag uses anywhere in the subtree
+
+    def walk(self, depth=0):
+        """Yield (depth, node) for this node's descendants, children in name order."""
+        for name in sorted(self.children):
+            child = self.children[name]
+            yield depth, child
+            yield from child.walk(depth + 1)
+
+class CategoryTrie:
+    """Category paths split on '/' with per-node skill, category and tag aggregates.
+
+    Every node on a skill's path is updated when it is inserted, so prefix lookups
+    and subtree statistics cost O(depth) regardless of how many skills sit below.
+    """
+
+    def __init__(self):
+        self.root = CategoryNode('', '')
+
+    def insert(self, category, skill_name, tags):
+        path = [self.root]
+        for segment in category.split('/'):
+            parent = path[-1]
+            child = parent.children.get(segment)
+            if child is None:
+                child = parent.children[segment] = CategoryNode(
+                    segment, f"{parent.path}/{segment}" if parent.path else segment)
+            path.append(child)
+
+        first_skill = not path[-1].skills
+        path[-1].skills.append(skill_name)
+        for node in path:
+            node.skill_count += 1
+            node.tag_counts.update(tags)
+            if first_skill:
+                node.category_count += 1
+
+    def find(self, prefix):
+        """Return the node for a category prefix such as 'collaboration/', or None."""
+        node = self.root
+        for segment in prefix.strip('/').split('/') if prefix.strip('/') else []:
+            node = node.children.get(segment)
+            if node is None:
+                return None
+        return node
+
+    def paths(self):
+        """Every node path in the trie, including intermediate ones no skill uses directly."""
+        return [node.path for _, node in self.root.walk()]
+
+    def depth(self):
+        return max((depth + 1 for depth, _ in self.root.walk()), default=0)
+
 class CategoryExtractor:
-    def __init__(self, registry_path):
+    def __init__(self, registry_path, skills_root=None):
         self.registry_path = Path(registry_path)
         self.registry_data = self.load_registry()
+        self.skills_root = resolve_skills_root(self.registry_path, skills_root)
+        self.suggestion_index = None
+        self.build_indexes()
 
     def load_registry(self):
         """Load and parse the registry.json file."""
         try:
-            with open(self.registry_path, 'r') as f:
-                return json.load(f)
+            stat = os.stat(self.registry_path)
+            content = self.registry_path.read_bytes()
+            # Identifies this registry version for the saved suggestion index
+            self.registry_stamp = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': hashlib.sha256(content).hexdigest(),
+            }
+            return json.loads(content)
         except FileNotFoundError:
             print(f"❌ Registry file not found: {self.registry_path}")
             sys.exit(1)
@@ -25,140 +878,332 @@ class CategoryExtractor:
             print(f"❌ Invalid JSON in registry file: {e}")
             sys.exit(1)
 
-    def extract_categories(self):
-        """Extract all categories from skills in the registry."""
-        categories = []
-        category_skills = defaultdict(list)
+    def build_indexes(self):
+        """Build every category and tag index in one pass over the skills.
 
-        for skill in self.registry_data.get('skills', []):
+        All queries below read these tables instead of rescanning the registry.
+        """
+        self.categories = []
+        self.category_skills = defaultdict(list)
+        self.main_categories = defaultdict(list)
+        self.category_trie = CategoryTrie()
+        self.tag_counter = Counter()
+        self.tag_categories = defaultdict(list)
+        # First-seen position of each tag, used to break ties the way Counter insertion order did
+        self.tag_rank = {}
+        # category -> tag -> number of uses by skills in that category
+        self.category_tag_uses = defaultdict(Counter)
+        # tag -> tags appearing on the same skills, with counts
+        self.tag_cooccurrence = defaultdict(Counter)
+
+        # Keyword search tables; rows are skills in registry order, keyed by raw category
+        self.row_categories = []
+        self.category_rows = {}
+        self.lower_tag_rows = defaultdict(list)
+        descriptions = []
+
+        for row, skill in enumerate(self.registry_data.get('skills', [])):
+            name = skill.get('name', 'unknown')
             category = skill.get('category', '')
+            tags = skill.get('tags', [])
+
             if category:
-                categories.append(category)
-                category_skills[category].append(skill.get('name', 'unknown'))
+                self.categories.append(category)
+                self.category_skills[category].append(name)
+                # Group by main category (before first slash)
+                main_cat, _, sub_cat = category.partition('/')
+                self.main_categories[main_cat].append(sub_cat)
+                self.category_trie.insert(category, name, tags)
+
+            for tag in tags:
+                self.tag_counter[tag] += 1
+                self.tag_categories[tag].append((name, category))
+                self.tag_rank.setdefault(tag, len(self.tag_rank))
+                self.category_tag_uses[category][tag] += 1
+
+            distinct_tags = list(dict.fromkeys(tags))
+            for tag in distinct_tags:
+                for other in distinct_tags:
+                    if other != tag:
+                        self.tag_cooccurrence[tag][other] += 1
 
-        return categories, category_skills
+            self.row_categories.append(category)
+            first_row, count = self.category_rows.get(category, (row, 0))
+            self.category_rows[category] = (first_row, count + 1)
+            for tag in {tag.lower() for tag in tags}:
+                self.lower_tag_rows[tag].append(row)
+            descriptions.append(skill.get('description', '').lower())
+
+        # Descriptions joined into one string so a keyword is located with str.find
+        self.description_offsets = []
+        offset = 0
+        for description in descriptions:
+            self.description_offsets.append(offset)
+            offset += len(description) + 1
+        self.description_text = '\0'.join(descriptions)
+
+    def extract_categories(self):
+        """Extract all categories from skills in the registry."""
+        return self.categories, self.category_skills
 
     def analyze_category_structure(self):
         """Analyze the hierarchical structure of categories."""
-        categories, category_skills = self.extract_categories()
-
-        # Group by main category (before first slash)
-        main_categories = defaultdict(list)
-        for category in categories:
-            if '/' in category:
-                main_cat = category.split('/')[0]
-                sub_cat = category.split('/', 1)[1]
-                main_categories[main_cat].append(sub_cat)
-            else:
-                main_categories[category].append('')
+        return self.main_categories, self.category_skills
 
-        return main_categories, category_skills
+    def subtree_stats(self, prefix):
+        """Skill, category and tag totals for everything under a category prefix, or None."""
+        node = self.category_trie.find(prefix)
+        if node is None:
+            return None
+        return {
+            'path': node.path,
+            'skills': node.skill_count,
+            'categories': node.category_count,
+            'tags': node.tag_counts,
+        }
 
-    def extract_tags(self):
-        """Extract and count all tags from skills."""
-        tag_counter = Counter()
-        tag_categories = defaultdict(list)
+    def categories_under(self, prefix):
+        """Categories with skills at or below a prefix, as (category, skill names) in path order."""
+        node = self.category_trie.find(prefix)
+        if node is None:
+            return []
+        nodes = ([node] if node.path else []) + [child for _, child in node.walk()]
+        return [(child.path, child.skills) for child in nodes if child.skills]
 
-        for skill in self.registry_data.get('skills', []):
-            skill_name = skill.get('name', 'unknown')
-            category = skill.get('category', '')
-            for tag in skill.get('tags', []):
-                tag_counter[tag] += 1
-                tag_categories[tag].append((skill_name, category))
+    def top_subtree_tags(self, node, limit=5):
+        """Most used tags in a subtree; ties keep first-seen tag order."""
+        return heapq.nsmallest(limit, node.tag_counts.items(), key=lambda item: (-item[1], self.tag_rank[item[0]]))
 
-        return tag_counter, tag_categories
+    def validate_category_icons(self):
+        """Compare the category tree with metadata.categoryIcons.
 
-    def suggest_tags_for_category(self, target_category, limit=10):
-        """Suggest relevant tags for a given category."""
-        tag_counter, tag_categories = self.extract_tags()
+        Returns (missing, unused): category paths, including intermediate groups the
+        site renders as tree nodes, that have no icon and fall back to 📁; and icons
+        defined for categories no skill uses.
+        """
+        icons = self.registry_data.get('metadata', {}).get('categoryIcons', {})
+        paths = self.category_trie.paths()
+        used = set(paths)
+        return [path for path in paths if path not in icons], sorted(set(icons) - used)
 
-        # Find tags used by skills in similar categories
-        category_tags = Counter()
+    def extract_tags(self):
+        """Extract and count all tags from skills."""
+        return self.tag_counter, self.tag_categories
 
-        for tag, skill_info_list in tag_categories.items():
-            for skill_name, category in skill_info_list:
-                # Check if categories are similar
-                if target_category in category or category in target_category:
-                    category_tags[tag] += tag_counter[tag]
-                # Check for main category match
-                elif '/' in category and '/' in target_category:
-                    target_main = target_category.split('/')[0]
-                    cat_main = category.split('/')[0]
-                    if target_main == cat_main:
-                        category_tags[tag] += tag_counter[tag] * 0.5  # Weight similar main categories
+    def suggest_tags_for_category(self, target_category, limit=10):
+        """Suggest relevant tags for a given category."""
+        return rank_tags_for_category(target_category, self.category_tag_uses, self.tag_counter,
+                                      self.tag_rank, limit)
 
-        return category_tags.most_common(limit)
+    def get_suggestion_index(self):
+        """Build the BM25 index on first use; plain analysis never needs it."""
+        if self.suggestion_index is None:
+            self.suggestion_index = SuggestionIndex(self.registry_data.get('skills', []), self.skills_root)
+        return self.suggestion_index
 
     def get_category_suggestions(self, keywords=None):
         """Suggest categories based on keywords."""
-        main_categories, category_skills = self.analyze_category_structure()
-        suggestions = []
-
         if not keywords:
-            return list(main_categories.keys())
+            return list(self.main_categories.keys())
+
+        ranked = self.get_suggestion_index().rank_categories(tokenize(' '.join(keywords)))
+        if ranked:
+            return [category for category, score in ranked]
+        # No whole-term hits; fall back to substring matching so partial words still help
+        return self.match_category_keywords(keywords)
 
+    def match_category_keywords(self, keywords):
+        """Score categories by substring matches against names, descriptions and tags."""
         keywords = [k.lower() for k in keywords]
 
-        # Score categories based on keyword matches
+        # Score categories based on keyword matches; remember the first (skill, keyword)
+        # match per category so ties keep registry order
         category_scores = defaultdict(int)
+        first_match = {}
 
-        for category in self.registry_data.get('skills', []):
-            cat_name = category.get('category', '').lower()
-            cat_desc = category.get('description', '').lower()
-            cat_tags = [tag.lower() for tag in category.get('tags', [])]
+        def credit(category, points, row, keyword_index):
+            category_scores[category] += points
+            position = (row, keyword_index)
+            if category not in first_match or position < first_match[category]:
+                first_match[category] = position
 
-            for keyword in keywords:
-                # Direct category match
-                if keyword in cat_name:
-                    category_scores[category.get('category', '')] += 3
+        for keyword_index, keyword in enumerate(keywords):
+            # Direct category match, once per skill in the category
+            for category, (first_row, count) in self.category_rows.items():
+                if keyword in category.lower():
+                    credit(category, 3 * count, first_row, keyword_index)
 
-                # Description match
-                if keyword in cat_desc:
-                    category_scores[category.get('category', '')] += 2
+            # Description match
+            position = self.description_text.find(keyword)
+            while position != -1:
+                row = bisect.bisect_right(self.description_offsets, position) - 1
+                credit(self.row_categories[row], 2, row, keyword_index)
+                if row + 1 == len(self.description_offsets):
+                    break
+                position = self.description_text.find(keyword, self.description_offsets[row + 1])
 
-                # Tag match
-                if keyword in cat_tags:
-                    category_scores[category.get('category', '')] += 1
+            # Tag match
+            for row in self.lower_tag_rows.get(keyword, []):
+                credit(self.row_categories[row], 1, row, keyword_index)
 
         # Return top scoring categories
-        sorted_suggestions = sorted(category_scores.items(), key=lambda x: x[1], reverse=True)
+        sorted_suggestions = sorted(category_scores.items(), key=lambda x: (-x[1], first_match[x[0]]))
         return [cat for cat, score in sorted_suggestions if score > 0]
 
+    def related_tags(self, tag, limit=10):
+        """Tags most often used on the same skills as tag."""
+        return self.tag_cooccurrence[tag].most_common(limit) if tag in self.tag_cooccurrence else []
+
+    def find_near_duplicates(self, threshold=DEFAULT_SIMILARITY):
+        """Cluster near-duplicate tags and categories; returns (tag clusters, category clusters)."""
+        tag_clusters = cluster_labels(self.tag_counter, self.tag_rank, threshold)
+        category_counts = {category: len(skills) for category, skills in self.category_skills.items()}
+        category_order = {category: rank for rank, category in enumerate(self.category_skills)}
+        category_clusters = cluster_labels(category_counts, category_order, threshold, hierarchical=True)
+        return tag_clusters, category_clusters
+
+    def print_consolidation(self, threshold=DEFAULT_SIMILARITY, plan_path=None):
+        """Print proposed tag and category merges, optionally writing them as a rewrite plan."""
+        print("\n🧹 Consolidation Suggestions")
+        print("=" * 60)
+
+        tag_clusters, category_clusters = self.find_near_duplicates(threshold)
+        for title, unit, clusters in (("🏷️  Tags", "use", tag_clusters),
+                                      ("📂 Categories", "skill", category_clusters)):
+            print(f"\n{title} ({len(clusters)} merge{'s' if len(clusters) != 1 else ''} proposed):")
+            if not clusters:
+                print("  No near-duplicates found")
+            for cluster in clusters:
+                variants = ', '.join(
+                    f"{label} ({count} {unit}{'s' if count != 1 else ''}, {'same normalized form' if similarity == 1.0 else f'{similarity:.2f} similar'})"
+                    for label, count, similarity in cluster['variants'])
+                print(f"  {cluster['canonical']} ({cluster['uses']} {unit}{'s' if cluster['uses'] != 1 else ''}) ← {variants}")
+
+        if plan_path:
+            plan = {
+                'tags': {label: c['canonical'] for c in tag_clusters for label, _, _ in c['variants']},
+                'categories': {label: c['canonical'] for c in category_clusters for label, _, _ in c['variants']},
+            }
+            with open(plan_path, 'w', encoding='utf-8') as f:
+                json.dump(plan, f, indent=2, ensure_ascii=False)
+                f.write('\n')
+            print(f"\n💾 Rewrite plan written to {plan_path}")
+            print(f"   Apply it with: python scripts/update-registry.py --apply-rewrites {plan_path}")
+
+    def iter_category_records(self):
+        """Yield one record per category tree node, parents before children."""
+        icons = self.registry_data.get('metadata', {}).get('categoryIcons', {})
+        for depth, node in self.category_trie.root.walk():
+            yield {
+                'kind': 'category',
+                'categoryPath': node.path,
+                'segment': node.name,
+                'depth': depth + 1,
+                'skillCount': node.skill_count,
+                'directSkillCount': len(node.skills),
+                'categoryCount': node.category_count,
+                'childCount': len(node.children),
+                'tagCount': len(node.tag_counts),
+                'tagUses': sum(node.tag_counts.values()),
+                'icon': icons.get(node.path),
+                'skillNames': node.skills,
+            }
+
+    def iter_tag_records(self):
+        """Yield one record per tag, most used first."""
+        for tag, uses in self.tag_counter.most_common():
+            uses_by = self.tag_categories[tag]
+            yield {
+                'kind': 'tag',
+                'tag': tag,
+                'uses': uses,
+                'rank': self.tag_rank[tag] + 1,
+                'categories': sorted({category for _, category in uses_by if category}),
+                'skillNames': [name for name, _ in uses_by],
+            }
+
+    def iter_cooccurrence_records(self):
+        """Yield each pair of tags used on the same skills once, in first-seen tag order."""
+        for tag in self.tag_rank:
+            for other, skills in self.tag_cooccurrence[tag].items():
+                if self.tag_rank[other] > self.tag_rank[tag]:
+                    yield {'kind': 'cooccurrence', 'tag': tag, 'otherTag': other, 'sharedSkillCount': skills}
+
+    def iter_skill_records(self):
+        """Yield one record per skill in registry order."""
+        icons = self.registry_data.get('metadata', {}).get('categoryIcons', {})
+        for skill in self.registry_data.get('skills', []):
+            category = skill.get('category', '')
+            tags = skill.get('tags', [])
+            yield {
+                'kind': 'skill',
+                'skillName': skill.get('name', 'unknown'),
+                'categoryPath': category,
+                'depth': len(category.split('/')) if category else 0,
+                'tagCount': len(tags),
+                'tags': tags,
+                'descriptionWords': len(skill.get('description', '').split()),
+                'lastUpdated': skill.get('lastUpdated'),
+                'hasIcon': category in icons,
+            }
+
     def print_category_analysis(self):
         """Print comprehensive category analysis."""
         print("📂 SLIM Marketplace Category Analysis")
         print("=" * 60)
 
-        main_categories, category_skills = self.analyze_category_structure()
+        category_skills = self.category_skills
+        trie = self.category_trie
 
         print(f"\n📊 Summary:")
         total_skills = len(self.registry_data.get('skills', []))
-        total_categories = len(set(self.extract_categories()[0]))
+        total_categories = len(category_skills)
         print(f"  Total skills: {total_skills}")
         print(f"  Total categories: {total_categories}")
-        print(f"  Main category groups: {len(main_categories)}")
+        print(f"  Main category groups: {len(trie.root.children)}")
+        print(f"  Deepest category level: {trie.depth()}")
 
         print(f"\n🏗️  Category Structure:")
-        for main_cat, sub_cats in sorted(main_categories.items()):
-            skill_count = sum(len(category_skills[f"{main_cat}/{sub}" if sub else main_cat])
-                            for sub in sub_cats)
-            print(f"  {main_cat}/ ({skill_count} skills)")
-
-            for sub_cat in sorted(set(sub_cats)):
-                if sub_cat:  # Only show subcategories
-                    full_cat = f"{main_cat}/{sub_cat}"
-                    sub_skill_count = len(category_skills[full_cat])
-                    print(f"    ├── {sub_cat} ({sub_skill_count} skills)")
+        for depth, node in trie.root.walk():
+            if depth == 0:
+                print(f"  {node.name}/ ({node.skill_count} skills)")
+            else:
+                print(f"    {'│   ' * (depth - 1)}├── {node.name} ({node.skill_count} skills)")
 
         print(f"\n📋 All Categories (with skill counts):")
-        categories, category_skills = self.extract_categories()
-        category_counts = Counter(categories)
-
-        for category, count in sorted(category_counts.items()):
-            skills = category_skills[category]
+        for category, skills in sorted(category_skills.items()):
+            count = len(skills)
             print(f"  {category} ({count} skills): {', '.join(skills[:3])}" +
                   (f" +{len(skills)-3} more" if len(skills) > 3 else ""))
 
+        print(f"\n🎨 Category Icons:")
+        missing, unused = self.validate_category_icons()
+        for path in missing:
+            print(f"  ⚠️  No icon for '{path}' in metadata.categoryIcons (site shows 📁)")
+        for path in unused:
+            print(f"  ℹ️  Icon defined for unused category '{path}'")
+        if not missing and not unused:
+            print(f"  ✅ Every category has an icon")
+
+    def print_subtree(self, prefix, top_n=5):
+        """Print statistics and categories for everything under a category prefix."""
+        node = self.category_trie.find(prefix)
+        if node is None:
+            print(f"❌ No categories under '{prefix}'")
+            return False
+
+        label = f"{node.path}/" if node.path else "all categories"
+        print(f"\n🌳 Categories under {label}")
+        print("=" * 60)
+        print(f"  Skills: {node.skill_count} in {node.category_count} categories")
+        top_tags = [f"{tag}({count})" for tag, count in self.top_subtree_tags(node, top_n)]
+        if top_tags:
+            print(f"  Top tags: {', '.join(top_tags)}")
+        for category, skills in self.categories_under(prefix):
+            print(f"  {category} ({len(skills)} skills): {', '.join(skills[:3])}" +
+                  (f" +{len(skills)-3} more" if len(skills) > 3 else ""))
+        return True
+
     def print_tag_analysis(self, top_n=20):
         """Print comprehensive tag analysis."""
         print("\n🏷️  Tag Analysis")
@@ -180,18 +1225,44 @@ class CategoryExtractor:
 
         # Find tags by category
         print(f"\n📂 Tags by Main Category:")
-        main_categories, _ = self.analyze_category_structure()
+        for main_cat, node in sorted(self.category_trie.root.children.items()):
+            if node.tag_counts:
+                top_tags = [f"{tag}({count})" for tag, count in self.top_subtree_tags(node)]
+                print(f"  {main_cat:25} {', '.join(top_tags)}")
 
-        for main_cat in sorted(main_categories.keys()):
-            cat_tags = Counter()
-            for tag, skill_info_list in tag_categories.items():
-                for skill_name, category in skill_info_list:
-                    if category.startswith(main_cat):
-                        cat_tags[tag] += 1
+def write_export(extractor, datasets, output_format, stream=sys.stdout):
+    """Stream the selected analytics datasets as JSON, NDJSON or CSV, one record at a time.
 
-            if cat_tags:
-                top_tags = [f"{tag}({count})" for tag, count in cat_tags.most_common(5)]
-                print(f"  {main_cat:25} {', '.join(top_tags)}")
+    JSON is an object with one array per dataset; CSV has the union of the
+    datasets' columns, with list values joined by CSV_LIST_SEPARATOR.
+    """
+    def records(dataset):
+        return getattr(extractor, EXPORT_DATASETS[dataset][0])()
+
+    if output_format == 'ndjson':
+        for dataset in datasets:
+            for record in records(dataset):
+                stream.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    elif output_format == 'json':
+        stream.write('{')
+        for position, dataset in enumerate(datasets):
+            stream.write(f'{"," if position else ""}\n  {json.dumps(dataset)}: [')
+            separator = '\n    '
+            for record in records(dataset):
+                stream.write(separator + json.dumps(record, ensure_ascii=False))
+                separator = ',\n    '
+            stream.write(']' if separator == '\n    ' else '\n  ]')
+        stream.write('\n}\n')
+
+    else:
+        columns = list(dict.fromkeys(column for dataset in datasets for column in EXPORT_DATASETS[dataset][1]))
+        writer = csv.DictWriter(stream, fieldnames=columns, lineterminator='\n')
+        writer.writeheader()
+        for dataset in datasets:
+            for record in records(dataset):
+                writer.writerow({key: CSV_LIST_SEPARATOR.join(value) if isinstance(value, list) else value
+                                 for key, value in record.items()})
 
 def print_suggestions_for_skill(extractor, skill_description, skill_keywords=None):
     """Print category and tag suggestions for a new skill."""
@@ -200,12 +1271,7 @@ def print_suggestions_for_skill(extractor, skill_description, skill_keywords=Non
 
     # Extract keywords from description
     if not skill_keywords:
-        # Simple keyword extraction (could be improved with NLP)
-        import re
-        words = re.findall(r'\b\w+\b', skill_description.lower())
-        # Filter common words
-        common_words = {'the', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for', 'of', 'with', 'by', 'is', 'are', 'was', 'were', 'be', 'been', 'have', 'has', 'had', 'do', 'does', 'did', 'will', 'would', 'should', 'could', 'can', 'may', 'might', 'must', 'shall'}
-        skill_keywords = [word for word in words if len(word) > 3 and word not in common_words][:10]
+        skill_keywords = list(dict.fromkeys(tokenize(skill_description)))
 
     print(f"Skill description: {skill_description}")
     print(f"Extracted keywords: {', '.join(skill_keywords)}")
@@ -216,6 +1282,12 @@ def print_suggestions_for_skill(extractor, skill_description, skill_keywords=Non
     for i, category in enumerate(category_suggestions[:5], 1):
         print(f"  {i}. {category}")
 
+    similar_skills = extractor.get_suggestion_index().top_skills(tokenize(' '.join(skill_keywords)))
+    if similar_skills:
+        print(f"\n🔍 Most Similar Skills:")
+        for skill, score in similar_skills:
+            print(f"  {skill.get('name', 'unknown')} ({skill.get('category', '')}, score: {score:.2f})")
+
     # Suggest tags for top category
     if category_suggestions:
         top_category = category_suggestions[0]
@@ -224,10 +1296,38 @@ def print_suggestions_for_skill(extractor, skill_description, skill_keywords=Non
         for tag, score in tag_suggestions[:10]:
             print(f"  {tag} (relevance: {score:.1f})")
 
+def exit_on_broken_pipe():
+    """Exit quietly after the reader stopped early (e.g. piped into head), silencing the flush at exit."""
+    os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    sys.exit(1)
+
+def print_search_results(skills_root, query, index_path=DEFAULT_SEARCH_INDEX, limit=10):
+    """Update the full-text index under skills_root and print ranked hits with line snippets."""
+    index = SkillSearchIndex(skills_root, index_path)
+    reindexed, removed = index.update()
+    index.save()
+
+    results = index.search(query, limit)
+    print(f"\n🔎 Search: {query}")
+    print("=" * 60)
+    print(f"  Indexed {len(index.files)} files ({reindexed} updated, {removed} removed)")
+    if not results:
+        print(f"  No matches")
+        return False
+
+    for relative, score, snippets in results:
+        print(f"\n  📄 {relative} (score: {score:.2f})")
+        for line_no, line in snippets:
+            print(f"    {line_no:>5}: {line}")
+    return True
+
 def main():
     parser = argparse.ArgumentParser(description="Extract categories and analyze tags from SLIM marketplace")
     parser.add_argument("--registry", default="website/static/data/registry.json",
                        help="Path to registry.json file")
+    parser.add_argument("--skills-root",
+                       help="Directory of skill folders whose SKILL.md bodies feed --suggest "
+                            "(default: marketplace/skills beside the registry's data directory)")
     parser.add_argument("--categories", action="store_true",
                        help="Show category analysis")
     parser.add_argument("--tags", action="store_true",
@@ -236,17 +1336,79 @@ def main():
     parser.add_argument("--keywords", help="Comma-separated keywords for suggestions")
     parser.add_argument("--top-tags", type=int, default=20,
                        help="Number of top tags to show")
+    parser.add_argument("--related", help="Show tags most often used together with this tag")
+    parser.add_argument("--format", choices=["text", "json", "ndjson", "csv"], default="text", dest="output_format",
+                       help="Print the analysis as text, or stream complete analytics records in a machine-readable format")
+    parser.add_argument("--datasets", default=",".join(EXPORT_DATASETS),
+                       help=f"Comma-separated datasets for --format json/ndjson/csv (default: {','.join(EXPORT_DATASETS)})")
+    parser.add_argument("--search", metavar="QUERY",
+                       help='Full-text search of every SKILL.md and text asset; quote phrases, e.g. \'"code of conduct" template\'')
+    parser.add_argument("--search-index", default=DEFAULT_SEARCH_INDEX,
+                       help=f"Incremental --search index (default: {DEFAULT_SEARCH_INDEX})")
+    parser.add_argument("--limit", type=int, default=10,
+                       help="Maximum --search results (default: 10)")
+    parser.add_argument("--under", metavar="PREFIX",
+                       help="Show skill and tag totals for categories under PREFIX (e.g. collaboration/)")
+    parser.add_argument("--suggest-consolidation", action="store_true",
+                       help="Propose merges for near-duplicate tags and categories")
+    parser.add_argument("--similarity", type=float, default=DEFAULT_SIMILARITY,
+                       help=f"Trigram similarity needed to propose a merge (default: {DEFAULT_SIMILARITY})")
+    parser.add_argument("--rewrite-plan", metavar="PATH",
+                       help="With --suggest-consolidation, write proposed merges as a plan for "
+                            "update-registry.py --apply-rewrites")
+    parser.add_argument("--index", default=DEFAULT_INDEX_PATH,
+                       help=f"Saved --suggest index, rebuilt when the registry changes (default: {DEFAULT_INDEX_PATH})")
+    parser.add_argument("--no-index", action="store_true",
+                       help="Build the --suggest index in memory instead of using the saved one")
 
     args = parser.parse_args()
 
+    datasets = [dataset.strip() for dataset in args.datasets.split(',') if dataset.strip()]
+    unknown = [dataset for dataset in datasets if dataset not in EXPORT_DATASETS]
+    if unknown or not datasets:
+        parser.error(f"--datasets must be a comma-separated subset of {', '.join(EXPORT_DATASETS)}")
+    if args.output_format != "text" and (args.suggest or args.related or args.under or args.search or
+                                         args.suggest_consolidation or args.rewrite_plan):
+        parser.error("--format json/ndjson/csv only exports analytics; it cannot be combined with "
+                     "--suggest, --related, --under, --search or --suggest-consolidation")
+
+    # Search reads skill files only; the registry just locates the default skills root
+    if args.search:
+        skills_root = resolve_skills_root(args.registry, args.skills_root)
+        if skills_root is None:
+            print("❌ Skills directory not found; pass --skills-root")
+            sys.exit(1)
+        try:
+            found = print_search_results(skills_root, args.search, args.search_index, args.limit)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            exit_on_broken_pipe()
+        if not (args.categories or args.tags or args.suggest or args.related or args.under
+                or args.suggest_consolidation or args.rewrite_plan):
+            sys.exit(0 if found else 1)
+
     registry_path = Path(args.registry)
     if not registry_path.exists():
         print(f"❌ Registry file not found: {registry_path}")
         sys.exit(1)
 
-    extractor = CategoryExtractor(registry_path)
+    if args.output_format != "text":
+        extractor = CategoryExtractor(registry_path, args.skills_root)
+        try:
+            write_export(extractor, datasets, args.output_format)
+            sys.stdout.flush()
+        except BrokenPipeError:
+            exit_on_broken_pipe()
+        return
 
-    if args.categories or (not args.tags and not args.suggest):
+    consolidate = args.suggest_consolidation or bool(args.rewrite_plan)
+    show_categories = args.categories or not (args.tags or args.suggest or args.related or args.under or consolidate)
+    # --suggest alone runs from the saved index without loading the registry
+    extractor = None
+    if show_categories or args.tags or args.related or args.under or consolidate or (args.suggest and args.no_index):
+        extractor = CategoryExtractor(registry_path, args.skills_root)
+
+    if show_categories:
         extractor.print_category_analysis()
 
     if args.tags:
@@ -256,7 +1418,23 @@ def main():
         keywords = None
         if args.keywords:
             keywords = [k.strip() for k in args.keywords.split(',')]
-        print_suggestions_for_skill(extractor, args.suggest, keywords)
+        suggester = extractor if args.no_index else load_suggestion_index(registry_path, args.skills_root, args.index)
+        print_suggestions_for_skill(suggester, args.suggest, keywords)
+
+    if args.related:
+        related = extractor.related_tags(args.related, args.top_tags)
+        if not related:
+            print(f"⚠️  No skills use tag '{args.related}' together with other tags")
+        else:
+            print(f"\n🔗 Tags used with '{args.related}':")
+            for tag, count in related:
+                print(f"  {tag}: {count} skills")
+
+    if args.under and not extractor.print_subtree(args.under):
+        sys.exit(1)
+
+    if consolidate:
+        extractor.print_consolidation(args.similarity, args.rewrite_plan)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -2,25 +2,157 @@
 """
 Update registry.json with new skill entries for SLIM marketplace.
 """
+import os
+import re
+import csv
 import json
 import sys
+import yaml
+import hashlib
 import argparse
+import bisect
 import shutil
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
 
-def backup_registry(registry_path):
-    """Create a backup of the registry file."""
-    backup_path = registry_path.with_suffix(f'.json.backup.{datetime.now().strftime("%Y%m%d_%H%M%S")}')
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks
+    fcntl = None
+
+# Skill names are lowercase words joined by single hyphens
+SKILL_NAME_PATTERN = re.compile(r'^[a-z0-9]+(-[a-z0-9]+)*$')
+# A whole '---' line (CRLF or trailing spaces allowed) opening or closing SKILL.md frontmatter
+FRONTMATTER_DELIMITER = re.compile(r'^---[ \t]*\r?$', re.MULTILINE)
+
+# Manifest column aliases accepted by --batch, mapped to generate_skill_entry arguments
+MANIFEST_FIELDS = {
+    'name': 'skill_name', 'skill_name': 'skill_name',
+    'displayName': 'display_name', 'display_name': 'display_name',
+    'description': 'description',
+    'category': 'category',
+    'tags': 'tags',
+    'example': 'example',
+    'version': 'version'
+}
+REQUIRED_MANIFEST_FIELDS = ['skill_name', 'display_name', 'description', 'category', 'tags']
+
+# Sections of an extract-categories.py --rewrite-plan file, each mapping old names to new ones
+REWRITE_SECTIONS = ('tags', 'categories')
+
+# Timestamped full-file backups kept next to the registry; older ones are pruned.
+# The change journal replaces them, so they are only taken by default with --no-journal.
+DEFAULT_KEEP_BACKUPS = 3
+
+# Per-skill registry shards (<skills_root>/<name>/registry-entry.json) and the
+# cache that lets --merge-shards re-read only shards whose mtime or size changed
+SHARD_FILE_NAME = "registry-entry.json"
+DEFAULT_SHARD_CACHE = ".slim-cache/registry-shards.json"
+# Registry entry field marking entries merged from a shard, so --merge-shards can
+# remove them once their shard is deleted without relying on the local cache
+SHARD_MARKER = "sharded"
+
+# Fields generate-marketplace.js copies from registry entries into marketplace plugins
+PASSTHROUGH_FIELDS = ["version", "author", "homepage", "repository", "license"]
+
+# Registry sections, the entry type each holds, and where local entries live
+ENTRY_SECTIONS = [
+    ("skills", "skill", "skills", "SKILL.md"),
+    ("agents", "agent", "agents", "AGENT.md"),
+    ("mcp", "mcp", "mcp-servers", "MCP.md")
+]
+
+# How concurrent updaters coordinate: 'lock' holds registry.json.lock for the whole
+# read-modify-write cycle, 'optimistic' only for a compare-and-commit with retries
+DEFAULT_CONCURRENCY = {
+    'mode': 'lock',
+    'timeout': 30.0,
+    'retries': 5
+}
+LOCK_POLL_INTERVAL = 0.05
+
+class RegistryConflict(Exception):
+    """registry.json changed on disk between load and an optimistic commit."""
+
+@contextmanager
+def registry_lock(registry_path, timeout=DEFAULT_CONCURRENCY['timeout']):
+    """Hold an exclusive advisory lock on registry.json.lock.
+
+    The registry itself is replaced by rename on every write, so the lock
+    lives on a sibling file. A timeout of None waits indefinitely;
+    otherwise TimeoutError is raised once it expires.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lock_path = registry_path.with_name(registry_path.name + ".lock")
+    with open(lock_path, 'a') as lock_file:
+        if timeout is None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        else:
+            deadline = time.monotonic() + timeout
+            waiting = False
+            while True:
+                try:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.monotonic() >= deadline:
+                        raise TimeoutError(f"Timed out after {timeout}s waiting for {lock_path}")
+                    if not waiting:
+                        print(f"⏳ Waiting for registry lock: {lock_path}")
+                        waiting = True
+                    time.sleep(LOCK_POLL_INTERVAL)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+def journal_path_for(registry_path):
+    """Path of the append-only change journal kept next to the registry."""
+    return registry_path.with_name(registry_path.name + ".journal")
+
+def backup_registry(registry_path, keep=DEFAULT_KEEP_BACKUPS):
+    """Create a backup of the registry file, keeping only the newest `keep` backups."""
+    if keep <= 0:
+        return None
+
+    # Nanoseconds keep names unique, and sortable, for several writes within one second
+    now_ns = time.time_ns()
+    stamp = f'{datetime.fromtimestamp(now_ns // 10**9).strftime("%Y%m%d_%H%M%S")}_{now_ns % 10**9:09d}'
+    backup_path = registry_path.with_suffix(f'.json.backup.{stamp}')
     shutil.copy2(registry_path, backup_path)
     print(f"📋 Created backup: {backup_path}")
+    prune_backups(registry_path, keep)
     return backup_path
 
-def load_registry(registry_path):
-    """Load and parse the registry.json file."""
+def prune_backups(registry_path, keep):
+    """Delete all but the newest `keep` timestamped backups of the registry."""
+    # Timestamp suffixes sort chronologically
+    backups = sorted(registry_path.parent.glob(f"{registry_path.name}.backup.*"))
+    for old_backup in backups[:max(len(backups) - keep, 0)]:
+        try:
+            old_backup.unlink()
+        except OSError as e:
+            print(f"⚠️  Could not remove old backup {old_backup}: {e}")
+
+def file_digest(path):
+    """sha256 of a file's bytes."""
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def load_registry(registry_path, with_digest=False):
+    """Load and parse the registry.json file, optionally with the sha256 of its bytes."""
     try:
-        with open(registry_path, 'r') as f:
-            return json.load(f)
+        with open(registry_path, 'rb') as f:
+            raw = f.read()
+        data = json.loads(raw)
+        return (data, hashlib.sha256(raw).hexdigest()) if with_digest else data
     except FileNotFoundError:
         print(f"❌ Registry file not found: {registry_path}")
         sys.exit(1)
@@ -28,32 +160,459 @@ def load_registry(registry_path):
         print(f"❌ Invalid JSON in registry file: {e}")
         sys.exit(1)
 
-def save_registry(registry_data, registry_path):
-    """Save registry data back to file with proper formatting."""
+def write_atomic(path, content):
+    """Replace path with content via temp file, fsync and rename.
+
+    Readers see either the old or the new file, never a partial write,
+    even if the process dies midway.
+    """
+    path = Path(path)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+            f.flush()
+            os.fsync(f.fileno())
+        if path.exists():
+            shutil.copymode(path, temp_path)
+        else:
+            os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+
+    # Persist the rename itself
+    if hasattr(os, 'O_DIRECTORY'):
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+def append_journal(registry_path, changes):
+    """Append change records (op, name, before, after) to the registry journal."""
+    if not changes:
+        return
+    timestamp = datetime.now().isoformat(timespec='seconds')
+    with open(journal_path_for(registry_path), 'a', encoding='utf-8') as f:
+        for change in changes:
+            f.write(json.dumps({'time': timestamp, **change}, ensure_ascii=False) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+def render_json(data):
+    """Serialize like generate-marketplace.js: JSON.stringify(data, null, 2) + newline."""
+    return json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+
+def site_root_for(registry_path):
+    """Site root containing static/data/registry.json."""
+    parents = Path(registry_path).resolve().parents
+    return parents[min(2, len(parents) - 1)]
+
+def marketplace_path_for(registry_path):
+    """Default .claude-plugin/marketplace.json next to the site, or None if the site has none."""
+    plugin_dir = site_root_for(registry_path) / ".claude-plugin"
+    return plugin_dir / "marketplace.json" if plugin_dir.is_dir() else None
+
+def read_base_url(config_path):
+    """Read the docusaurus baseUrl as text, the same way generate-marketplace.js does."""
+    base_url = "/"
+    try:
+        match = re.search(r'baseUrl:\s*["\'`]([^"\'`]+)["\'`]', Path(config_path).read_text(encoding='utf-8'))
+        if match:
+            base_url = match.group(1)
+    except OSError as e:
+        print(f"⚠️  Could not read baseUrl from config: {e}")
+    return base_url if base_url.endswith("/") else base_url + "/"
+
+def is_external(entry):
+    """Whether an MCP entry is hosted externally."""
+    return bool(entry.get('external_only') or entry.get('npm_package') or isinstance(entry.get('source'), dict))
+
+def hydrate_registry(registry_data, base_url):
+    """Fill in derived type, skill_file_url and zip_file_path fields in place."""
+    for section, entry_type, directory, file_name in ENTRY_SECTIONS:
+        if not isinstance(registry_data.get(section), list):
+            continue
+        for entry in registry_data[section]:
+            entry['type'] = entry_type
+            if entry_type == "mcp" and is_external(entry):
+                # External MCP: skill_file_url is hand-authored; no local zip
+                entry.pop('zip_file_path', None)
+            else:
+                entry['skill_file_url'] = f"{base_url}marketplace/{directory}/{entry['name']}/{file_name}"
+                entry['zip_file_path'] = f"assets/zip/{entry['name']}.zip"
+
+def to_plugin(entry, marketplace_source):
+    """Transform a hydrated registry entry into a marketplace plugin object."""
+    plugin = {'name': entry['name'], 'description': entry.get('description') or ""}
+
+    if entry['type'] == "skill":
+        plugin.update(source=marketplace_source, strict=False, skills=[f"./skills/{entry['name']}"])
+    elif entry['type'] == "agent":
+        plugin.update(source=marketplace_source, strict=False, agents=f"./agents/{entry['name']}")
+    elif entry['type'] == "mcp":
+        if is_external(entry):
+            # External MCP server: carry through its source/package descriptors
+            if entry.get('source'):
+                plugin['source'] = entry['source']
+            if entry.get('npm_package'):
+                plugin['npm_package'] = entry['npm_package']
+            if entry.get('external_only'):
+                plugin['external_only'] = True
+        else:
+            plugin.update(source=marketplace_source, strict=False)
+
+    plugin['keywords'] = entry['tags'] if isinstance(entry.get('tags'), list) else []
+    for field in PASSTHROUGH_FIELDS:
+        if field in entry:
+            plugin[field] = entry[field]
+    return plugin
+
+def build_marketplace(registry_data):
+    """Build the marketplace.json document from a hydrated registry.
+
+    Raises ValueError if the registry cannot produce a valid manifest.
+    """
+    mp = registry_data.get('marketplace')
+    if not isinstance(mp, dict) or not all(mp.get(field) for field in ('name', 'owner', 'metadata')):
+        raise ValueError("registry.json must contain a top-level `marketplace` block with `name`, `owner`, and `metadata`")
+
+    plugins = []
+    for section, _, _, _ in ENTRY_SECTIONS:
+        for entry in registry_data.get(section) or []:
+            if not entry.get('name') or not entry.get('description'):
+                raise ValueError(f"{section} entry missing required field 'name' or 'description': "
+                                 f"{json.dumps(entry.get('name') or entry)}")
+            plugins.append(to_plugin(entry, mp.get('source') or "./static/marketplace"))
+
+    return {'name': mp['name'], 'owner': mp['owner'], 'metadata': mp['metadata'], 'plugins': plugins}
+
+def write_marketplace(registry_data, marketplace_path):
+    """Regenerate marketplace.json atomically from hydrated registry data."""
+    try:
+        marketplace = build_marketplace(registry_data)
+        write_atomic(marketplace_path, render_json(marketplace))
+    except (ValueError, OSError) as e:
+        print(f"❌ Could not regenerate {marketplace_path}: {e}")
+        return False
+    print(f"✅ Marketplace regenerated: {marketplace_path} ({len(marketplace['plugins'])} plugins)")
+    return True
+
+def check_generated(registry_path, marketplace_path):
+    """Check that registry.json is hydrated and marketplace.json matches it, writing nothing.
+
+    Compares sha256 digests of the expected and committed bytes, and tells
+    formatting-only drift apart from content drift.
+    """
+    registry_data = load_registry(registry_path)
+    hydrate_registry(registry_data, read_base_url(site_root_for(registry_path) / "docusaurus.config.js"))
+    try:
+        expected = {registry_path: registry_data}
+        if marketplace_path is not None:
+            expected[marketplace_path] = build_marketplace(registry_data)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+
+    in_sync = True
+    for path, data in expected.items():
+        expected_digest = hashlib.sha256(render_json(data).encode('utf-8')).hexdigest()
+        try:
+            with open(path, 'rb') as f:
+                committed = f.read()
+        except FileNotFoundError:
+            print(f"❌ {path}: missing")
+            in_sync = False
+            continue
+
+        if hashlib.sha256(committed).hexdigest() == expected_digest:
+            print(f"✅ {path}: up to date")
+            continue
+
+        in_sync = False
+        try:
+            same_content = json.loads(committed) == data
+        except ValueError:
+            same_content = False
+        reason = "formatting differs" if same_content else "content is stale"
+        print(f"❌ {path}: {reason}; run update-registry.py --regenerate (or npm run prebuild) and commit the result")
+    return in_sync
+
+def regenerate_outputs(registry_path, marketplace_path, concurrency=None):
+    """Hydrate registry.json in its current order and regenerate marketplace.json under the registry lock."""
+    concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+    lock = registry_lock(Path(registry_path), concurrency['timeout']) if concurrency['mode'] != 'none' else nullcontext()
+    try:
+        with lock:
+            registry_data = load_registry(registry_path)
+            hydrate_registry(registry_data, read_base_url(site_root_for(registry_path) / "docusaurus.config.js"))
+            if not save_registry(registry_data, registry_path, journal=False):
+                return False
+            return marketplace_path is None or write_marketplace(registry_data, marketplace_path)
+    except TimeoutError as e:
+        print(f"❌ {e}")
+        return False
+
+def save_registry(registry_data, registry_path, changes=None, journal=True):
+    """Save registry data back to file with proper formatting.
+
+    The data is serialized and checked in memory before the live file is
+    touched, then written atomically. Changes are recorded in the journal
+    once the write has committed.
+    """
     try:
-        with open(registry_path, 'w') as f:
-            json.dump(registry_data, f, indent=2, ensure_ascii=False)
-        print(f"✅ Registry updated successfully: {registry_path}")
-    except Exception as e:
+        content = render_json(registry_data)
+        json.loads(content)
+    except (TypeError, ValueError) as e:
+        print(f"❌ JSON validation failed: {e}")
+        return False
+
+    try:
+        write_atomic(registry_path, content)
+    except OSError as e:
         print(f"❌ Error saving registry: {e}")
         sys.exit(1)
+    print(f"✅ Registry updated successfully: {registry_path}")
 
-def validate_json_syntax(registry_path):
-    """Validate that the registry file contains valid JSON."""
-    try:
-        with open(registry_path, 'r') as f:
-            json.load(f)
+    if journal and changes:
+        try:
+            append_journal(registry_path, changes)
+        except OSError as e:
+            print(f"⚠️  Could not append to journal {journal_path_for(registry_path)}: {e}")
+    return True
+
+class Registry:
+    """registry.json loaded lazily with name, category and tag indexes.
+
+    The skills list is kept sorted by name, so inserts and lookups use
+    bisection instead of rescanning or re-sorting the list. refresh()
+    checks the file's mtime once per operation (open_registry calls it) and
+    reloads on change unless there are unsaved changes; lookups never stat.
+    """
+
+    def __init__(self, registry_path):
+        self.path = Path(registry_path)
+        self._data = None
+        self._mtime = None
+        self.digest = None
+        self.dirty = False
+        # marketplace.json regenerated on every save; None disables it
+        self.marketplace_path = marketplace_path_for(self.path)
+
+    def reload(self):
+        """Discard in-memory state, including unsaved changes; reload on next access."""
+        self._data = None
+        self.dirty = False
+
+    def refresh(self):
+        """Reload on next access if registry.json changed on disk, unless there are unsaved changes."""
+        if self._data is None or self.dirty:
+            return
+        mtime = self.path.stat().st_mtime_ns if self.path.exists() else None
+        if mtime != self._mtime:
+            self._data = None
+
+    def _ensure_loaded(self):
+        if self._data is not None:
+            return
+
+        self._mtime = self.path.stat().st_mtime_ns if self.path.exists() else None
+        self._data, self.digest = load_registry(self.path, with_digest=True)
+        self.dirty = False
+        skills = self._data.setdefault('skills', [])
+        skills.sort(key=lambda skill: skill.get('name', ''))
+
+        self.names = [skill.get('name', '') for skill in skills]
+        self.by_name = {}
+        self.by_category = {}
+        self.by_tag = {}
+        for skill in skills:
+            self._index(skill)
+
+    def _index(self, skill):
+        name = skill.get('name')
+        if not name:
+            return
+        self.by_name[name] = skill
+        if skill.get('category'):
+            self.by_category.setdefault(skill['category'], set()).add(name)
+        for tag in skill.get('tags', []):
+            self.by_tag.setdefault(tag, set()).add(name)
+
+    def _unindex(self, skill):
+        name = skill['name']
+        del self.by_name[name]
+        for index, key in [(self.by_category, skill.get('category'))] + \
+                          [(self.by_tag, tag) for tag in skill.get('tags', [])]:
+            names = index.get(key)
+            if names is not None:
+                names.discard(name)
+                if not names:
+                    del index[key]
+
+    @property
+    def data(self):
+        """The full registry document."""
+        self._ensure_loaded()
+        return self._data
+
+    def __contains__(self, skill_name):
+        self._ensure_loaded()
+        return skill_name in self.by_name
+
+    def __len__(self):
+        self._ensure_loaded()
+        return len(self.by_name)
+
+    def skill_names(self):
+        """Names of all named entries, in sorted order."""
+        self._ensure_loaded()
+        return [name for name in self.names if name in self.by_name]
+
+    def get(self, skill_name):
+        """Return the entry for skill_name, or None."""
+        self._ensure_loaded()
+        return self.by_name.get(skill_name)
+
+    def upsert(self, entry):
+        """Insert or replace an entry in name order; returns the replaced entry or None."""
+        self._ensure_loaded()
+        skills = self._data['skills']
+        name = entry['name']
+        previous = self.by_name.get(name)
+        position = bisect.bisect_left(self.names, name)
+
+        if previous is not None:
+            # Entries without a name sort first and never match
+            while skills[position] is not previous:
+                position += 1
+            self._unindex(previous)
+            skills[position] = entry
+        else:
+            self.names.insert(position, name)
+            skills.insert(position, entry)
+
+        self._index(entry)
+        self.dirty = True
+        return previous
+
+    def delete(self, skill_name):
+        """Remove an entry; returns it, or None if it was not present."""
+        self._ensure_loaded()
+        previous = self.by_name.get(skill_name)
+        if previous is None:
+            return None
+
+        position = bisect.bisect_left(self.names, skill_name)
+        while self._data['skills'][position] is not previous:
+            position += 1
+        del self.names[position]
+        del self._data['skills'][position]
+        self._unindex(previous)
+        self.dirty = True
+        return previous
+
+    def categories(self):
+        """Sorted list of categories in use."""
+        self._ensure_loaded()
+        return sorted(self.by_category)
+
+    def tag_counts(self):
+        """Map each tag to the number of skills using it."""
+        self._ensure_loaded()
+        return {tag: len(names) for tag, names in self.by_tag.items()}
+
+    def changed_on_disk(self):
+        """Check whether registry.json differs from the version this instance loaded."""
+        return not self.path.exists() or file_digest(self.path) != self.digest
+
+    def save(self, changes=None, journal=True):
+        """Write the registry atomically, journal the changes and regenerate marketplace.json."""
+        if self.marketplace_path is not None:
+            # Derived fields must match what generate-marketplace.js would write
+            hydrate_registry(self.data, read_base_url(site_root_for(self.path) / "docusaurus.config.js"))
+            try:
+                build_marketplace(self.data)
+            except ValueError as e:
+                print(f"❌ {e}")
+                return False
+
+        if not save_registry(self.data, self.path, changes, journal):
+            return False
+        self._mtime = self.path.stat().st_mtime_ns
+        self.digest = file_digest(self.path)
+        self.dirty = False
+
+        if self.marketplace_path is not None:
+            return write_marketplace(self.data, self.marketplace_path)
         return True
-    except json.JSONDecodeError as e:
-        print(f"❌ JSON validation failed: {e}")
+
+# Registries opened by this process, keyed by resolved path
+_registries = {}
+
+def open_registry(registry_path):
+    """Return the shared Registry for a path, loaded on first use and refreshed if the file changed."""
+    key = Path(registry_path).resolve()
+    if key not in _registries:
+        _registries[key] = Registry(registry_path)
+    registry = _registries[key]
+    registry.refresh()
+    return registry
+
+def transact_registry(registry_path, apply, journal=True, keep_backups=None, concurrency=None):
+    """Run one read-modify-write cycle on the registry and commit it.
+
+    apply(registry) mutates a freshly loaded Registry and returns the
+    changes to journal, [] when there is nothing to write, or None to abort.
+    keep_backups=None takes full backups only when journaling is off.
+    Returns whether the cycle succeeded.
+    """
+    if keep_backups is None:
+        keep_backups = 0 if journal else DEFAULT_KEEP_BACKUPS
+    concurrency = {**DEFAULT_CONCURRENCY, **(concurrency or {})}
+    registry = open_registry(registry_path)
+    mode = concurrency['mode']
+
+    def commit(changes):
+        backup_registry(registry_path, keep_backups)
+        return registry.save(changes, journal)
+
+    try:
+        if mode == 'optimistic':
+            for attempt in range(1, concurrency['retries'] + 2):
+                registry.reload()
+                changes = apply(registry)
+                if not changes:
+                    return changes is not None
+
+                # Only the compare-and-commit step is serialized
+                with registry_lock(registry.path, concurrency['timeout']):
+                    if not registry.changed_on_disk():
+                        return commit(changes)
+
+                if attempt <= concurrency['retries']:
+                    print(f"🔁 Registry changed during update, retrying "
+                          f"({attempt}/{concurrency['retries']})")
+            print(f"❌ Registry kept changing; gave up after {concurrency['retries']} retries")
+            return False
+
+        lock = registry_lock(registry.path, concurrency['timeout']) if mode == 'lock' else nullcontext()
+        with lock:
+            registry.reload()
+            changes = apply(registry)
+            if not changes:
+                return changes is not None
+            return commit(changes)
+    except TimeoutError as e:
+        print(f"❌ {e}")
         return False
 
-def check_skill_exists(registry_data, skill_name):
+def check_skill_exists(registry, skill_name):
     """Check if a skill already exists in the registry."""
-    for skill in registry_data.get('skills', []):
-        if skill.get('name') == skill_name:
-            return True
-    return False
+    return skill_name in registry
 
 def generate_skill_entry(skill_name, display_name, description, category, tags, example="", version="1.0.0"):
     """Generate a complete registry entry for a skill."""
@@ -70,77 +629,48 @@ def generate_skill_entry(skill_name, display_name, description, category, tags,
         "zip_file_path": f"assets/zip/{skill_name}.zip"
     }
 
-def add_skill_to_registry(registry_path, skill_name, display_name, description, category, tags, example="", version="1.0.0"):
-    """Add a new skill entry to the registry."""
+def add_skill_to_registry(registry_path, skill_name, display_name, description, category, tags, example="", version="1.0.0",
+                          journal=True, keep_backups=None, concurrency=None, shard_root=None):
+    """Add a new skill entry to the registry, or to its shard file when shard_root is set."""
 
-    # Create backup
-    backup_path = backup_registry(registry_path)
+    if shard_root is not None:
+        skill_entry = generate_skill_entry(skill_name, display_name, description, category, tags, example, version)
+        return write_shard(shard_root, skill_entry)
 
-    # Load registry
-    registry_data = load_registry(registry_path)
+    registry = open_registry(registry_path)
 
-    # Check if skill already exists
-    if check_skill_exists(registry_data, skill_name):
+    # Check if skill already exists (asked before locking so no lock is held while prompting)
+    if check_skill_exists(registry, skill_name):
         print(f"⚠️  Skill '{skill_name}' already exists in registry")
         response = input("Update existing entry? (y/N): ").lower().strip()
         if response not in ['y', 'yes']:
             print("Cancelled")
             return False
-
-        # Remove existing entry
-        registry_data['skills'] = [s for s in registry_data['skills'] if s.get('name') != skill_name]
-        print(f"🔄 Removed existing entry for '{skill_name}'")
+        print(f"🔄 Replacing existing entry for '{skill_name}'")
 
     # Generate new skill entry
     skill_entry = generate_skill_entry(skill_name, display_name, description, category, tags, example, version)
 
-    # Add to registry
-    if 'skills' not in registry_data:
-        registry_data['skills'] = []
+    def apply(registry):
+        # Insert in name order on the freshly loaded registry
+        previous_entry = registry.upsert(skill_entry)
+        return [{'op': 'upsert', 'name': skill_name, 'before': previous_entry, 'after': skill_entry}]
 
-    registry_data['skills'].append(skill_entry)
-
-    # Sort skills alphabetically by name
-    registry_data['skills'] = sorted(registry_data['skills'], key=lambda x: x.get('name', ''))
-
-    # Save registry
-    save_registry(registry_data, registry_path)
-
-    # Validate JSON syntax
-    if validate_json_syntax(registry_path):
-        print(f"✅ JSON validation passed")
-        return True
-    else:
-        print(f"❌ JSON validation failed, restoring backup")
-        shutil.copy2(backup_path, registry_path)
-        return False
+    return transact_registry(registry_path, apply, journal, keep_backups, concurrency)
 
 def get_existing_categories(registry_path):
     """Extract existing categories from the registry."""
-    registry_data = load_registry(registry_path)
-    categories = set()
-
-    for skill in registry_data.get('skills', []):
-        category = skill.get('category', '')
-        if category:
-            categories.add(category)
-
-    return sorted(list(categories))
+    return open_registry(registry_path).categories()
 
 def get_common_tags(registry_path):
     """Extract common tags from existing skills."""
-    registry_data = load_registry(registry_path)
-    tag_counts = {}
-
-    for skill in registry_data.get('skills', []):
-        for tag in skill.get('tags', []):
-            tag_counts[tag] = tag_counts.get(tag, 0) + 1
+    tag_counts = open_registry(registry_path).tag_counts()
 
     # Return tags used by more than one skill, sorted by frequency
     common_tags = [(tag, count) for tag, count in tag_counts.items() if count > 1]
     return sorted(common_tags, key=lambda x: x[1], reverse=True)
 
-def interactive_skill_creation():
+def interactive_skill_creation(journal=True, keep_backups=None, concurrency=None, shard_root=None):
     """Interactive mode for creating skill entries."""
     print("🔧 SLIM Skill Registry Editor")
     print("=" * 50)
@@ -192,7 +722,499 @@ def interactive_skill_creation():
         print("Cancelled")
         return False
 
-    return add_skill_to_registry(registry_path, skill_name, display_name, description, category, tags, example, version)
+    return add_skill_to_registry(registry_path, skill_name, display_name, description, category, tags, example, version,
+                                 journal, keep_backups, concurrency, shard_root)
+
+def read_manifest(manifest_path):
+    """Yield (line number, record, error) for each row of a JSONL or CSV manifest."""
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r', encoding='utf-8', newline='') as f:
+        if manifest_path.suffix.lower() == '.csv':
+            # Line numbers count the header row
+            for line_no, row in enumerate(csv.DictReader(f), 2):
+                yield line_no, {k: v for k, v in row.items() if k and v not in (None, '')}, None
+            return
+
+        for line_no, line in enumerate(f, 1):
+            if not line.strip() or line.lstrip().startswith('#'):
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_no, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, None, "record must be a JSON object"
+                continue
+            yield line_no, record, None
+
+def normalize_manifest_record(record):
+    """Map a manifest record to (op, generate_skill_entry kwargs), raising ValueError if invalid."""
+    op = str(record.get('op', 'upsert')).lower()
+    if op not in ('upsert', 'delete'):
+        raise ValueError(f"unknown op '{op}' (expected upsert or delete)")
+
+    fields = {}
+    for key, value in record.items():
+        if key == 'op':
+            continue
+        if key not in MANIFEST_FIELDS:
+            raise ValueError(f"unknown field '{key}'")
+        fields[MANIFEST_FIELDS[key]] = value
+
+    name = fields.get('skill_name')
+    if not name or not SKILL_NAME_PATTERN.match(str(name)):
+        raise ValueError(f"invalid skill name '{name or ''}' (use lowercase-with-hyphens)")
+    if op == 'delete':
+        return op, {'skill_name': name}
+
+    missing = [field for field in REQUIRED_MANIFEST_FIELDS if not fields.get(field)]
+    if missing:
+        raise ValueError(f"missing required field(s): {', '.join(missing)}")
+
+    tags = fields['tags']
+    if isinstance(tags, str):
+        tags = [tag.strip() for tag in tags.split(',') if tag.strip()]
+    if not isinstance(tags, list) or not all(isinstance(tag, str) for tag in tags):
+        raise ValueError("tags must be a list or comma-separated string")
+    fields['tags'] = tags
+    return op, fields
+
+def apply_batch(registry, manifest_path):
+    """Apply manifest upserts and deletes to a Registry in memory.
+
+    Returns (changes, errors): journal records for applied operations and
+    (line number, message) pairs for rejected ones.
+    """
+    changes = []
+    errors = []
+    for line_no, record, error in read_manifest(manifest_path):
+        if error is None:
+            try:
+                op, fields = normalize_manifest_record(record)
+            except ValueError as e:
+                error = str(e)
+        if error is not None:
+            errors.append((line_no, error))
+            continue
+
+        name = fields['skill_name']
+        if op == 'delete':
+            before = registry.delete(name)
+            if before is None:
+                errors.append((line_no, f"cannot delete '{name}': not in registry"))
+                continue
+            changes.append({'op': 'delete', 'name': name, 'before': before, 'after': None})
+        else:
+            entry = generate_skill_entry(**fields)
+            before = registry.upsert(entry)
+            changes.append({'op': 'upsert', 'name': name, 'before': before, 'after': entry})
+
+    return changes, errors
+
+def run_batch(registry_path, manifest_path, atomic=False, journal=True, keep_backups=None,
+              concurrency=None):
+    """Apply a manifest to the registry with a single load and a single write."""
+    print(f"📦 Applying batch manifest: {manifest_path}")
+    rejected = []
+
+    def apply(registry):
+        try:
+            changes, errors = apply_batch(registry, manifest_path)
+        except (OSError, csv.Error, UnicodeDecodeError) as e:
+            print(f"❌ Cannot read manifest {manifest_path}: {e}")
+            return None
+
+        rejected[:] = errors
+        for line_no, message in errors:
+            print(f"❌ {manifest_path}:{line_no}: {message}")
+
+        upserted = sum(1 for change in changes if change['op'] == 'upsert')
+        deleted = len(changes) - upserted
+        print(f"📊 Batch: {upserted} upserted, {deleted} deleted, {len(errors)} rejected")
+
+        if errors and atomic:
+            print("🚫 Atomic mode: no changes written")
+            return None
+        if not changes:
+            print("ℹ️  Nothing to write")
+        return changes
+
+    saved = transact_registry(registry_path, apply, journal, keep_backups, concurrency)
+    return saved and not rejected
+
+def write_shard(skills_root, entry, confirm=True):
+    """Write one skill's entry to <skills_root>/<name>/registry-entry.json atomically."""
+    skill_dir = Path(skills_root) / entry['name']
+    if not skill_dir.is_dir():
+        print(f"❌ Skill directory does not exist: {skill_dir}")
+        return False
+
+    shard = skill_dir / SHARD_FILE_NAME
+    if confirm and shard.exists():
+        print(f"⚠️  Shard already exists: {shard}")
+        response = input("Update existing entry? (y/N): ").lower().strip()
+        if response not in ['y', 'yes']:
+            print("Cancelled")
+            return False
+
+    try:
+        write_atomic(shard, json.dumps(entry, indent=2, ensure_ascii=False) + "\n")
+    except OSError as e:
+        print(f"❌ Error writing shard {shard}: {e}")
+        return False
+    print(f"✅ Shard written: {shard}")
+    return True
+
+def load_shard_cache(cache_path):
+    """Load the merge cache: shard stats and entries plus the last merge result."""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            cache = json.load(f)
+        if isinstance(cache, dict) and isinstance(cache.get('shards'), dict):
+            return cache
+    except (OSError, ValueError):
+        pass
+    return {'shards': {}, 'names': [], 'registry_digest': None}
+
+def scan_shards(skills_root, cache):
+    """Collect shard entries, re-reading only shards whose mtime or size changed.
+
+    Returns (entries by name, errors as (path, message), number of shards read).
+    The cache's shard table is updated in place.
+    """
+    entries = {}
+    errors = []
+    reread = 0
+    shards = {}
+
+    with os.scandir(skills_root) as skill_dirs:
+        for skill_dir in sorted(skill_dirs, key=lambda d: d.name):
+            if not skill_dir.is_dir() or skill_dir.name.startswith('.'):
+                continue
+            shard = os.path.join(skill_dir.path, SHARD_FILE_NAME)
+            try:
+                stat = os.stat(shard)
+            except FileNotFoundError:
+                continue
+
+            cached = cache['shards'].get(shard)
+            if cached and cached['mtime_ns'] == stat.st_mtime_ns and cached['size'] == stat.st_size:
+                entry = cached['entry']
+            else:
+                reread += 1
+                try:
+                    with open(shard, 'r', encoding='utf-8') as f:
+                        entry = json.load(f)
+                except (OSError, ValueError) as e:
+                    errors.append((shard, f"cannot read shard: {e}"))
+                    continue
+
+            if not isinstance(entry, dict) or entry.get('name') != skill_dir.name:
+                errors.append((shard, f"shard must be an object whose name is '{skill_dir.name}'"))
+                continue
+
+            shards[shard] = {'mtime_ns': stat.st_mtime_ns, 'size': stat.st_size, 'entry': entry}
+            entries[entry['name']] = entry
+
+    cache['shards'] = shards
+    return entries, errors, reread
+
+def merge_shards(registry_path, skills_root, cache_path=DEFAULT_SHARD_CACHE, journal=True,
+                 keep_backups=None, concurrency=None):
+    """Merge per-skill shards into registry.json incrementally.
+
+    Shard entries replace registry entries of the same name and are marked
+    with SHARD_MARKER. Marked entries whose skill no longer has a shard are
+    removed. Entries that never had a shard are left alone, so the registry
+    can be migrated gradually.
+    """
+    skills_root = Path(skills_root)
+    if not skills_root.is_dir():
+        print(f"❌ Skills directory does not exist: {skills_root}")
+        return False
+
+    cache = load_shard_cache(cache_path)
+    previous_names = set(cache.get('names', []))
+    entries, errors, reread = scan_shards(skills_root, cache)
+    for shard, message in errors:
+        print(f"❌ {shard}: {message}")
+    # A shard that fails to read still owns its entry; leave that entry untouched
+    present = set(entries) | {Path(shard).parent.name for shard, _ in errors}
+    print(f"🧩 {len(entries)} shard(s) under {skills_root}, {reread} re-read")
+
+    unchanged = (reread == 0 and set(entries) == previous_names and registry_path.exists()
+                 and cache.get('registry_digest') == file_digest(registry_path))
+    if unchanged:
+        print("✅ Registry already up to date with shards")
+        return not errors
+
+    def apply(registry):
+        changes = []
+        for name, entry in sorted(entries.items()):
+            entry = {**entry, SHARD_MARKER: True}
+            if registry.get(name) != entry:
+                before = registry.upsert(entry)
+                changes.append({'op': 'upsert', 'name': name, 'before': before, 'after': entry})
+        for name in registry.skill_names():
+            if name not in present and registry.get(name).get(SHARD_MARKER):
+                before = registry.delete(name)
+                changes.append({'op': 'delete', 'name': name, 'before': before, 'after': None})
+
+        upserted = sum(1 for change in changes if change['op'] == 'upsert')
+        print(f"📊 Merge: {upserted} updated, {len(changes) - upserted} removed")
+        return changes
+
+    if not transact_registry(registry_path, apply, journal, keep_backups, concurrency):
+        return False
+
+    cache['names'] = sorted(entries)
+    cache['registry_digest'] = file_digest(registry_path)
+    try:
+        Path(cache_path).parent.mkdir(parents=True, exist_ok=True)
+        write_atomic(cache_path, json.dumps(cache))
+    except OSError as e:
+        print(f"⚠️  Could not write shard cache {cache_path}: {e}")
+    return not errors
+
+def split_registry(registry_path, skills_root):
+    """Write a shard for every registry skill that has a directory under skills_root."""
+    skills_root = Path(skills_root)
+    registry = open_registry(registry_path)
+    written = 0
+    for name in registry.skill_names():
+        entry = {key: value for key, value in registry.get(name).items() if key != SHARD_MARKER}
+        shard = skills_root / name / SHARD_FILE_NAME
+        if not shard.parent.is_dir():
+            print(f"⚠️  {name}: no directory under {skills_root}, left in registry.json only")
+            continue
+        if shard.exists():
+            try:
+                with open(shard, 'r', encoding='utf-8') as f:
+                    if json.load(f) == entry:
+                        continue
+            except (OSError, ValueError):
+                pass
+        if not write_shard(skills_root, entry, confirm=False):
+            return False
+        written += 1
+    print(f"📊 Split: {written} shard(s) written")
+    return True
+
+def skill_content_hash(skill_dir):
+    """Hash every packaged file under a skill directory (paths and contents)."""
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(skill_dir):
+        dirs[:] = sorted(d for d in dirs if d != '__pycache__' and not d.startswith('.'))
+        for file_name in sorted(files):
+            # The shard holds registry metadata, not skill content
+            if file_name.startswith('.') or file_name.endswith('.pyc') or file_name == SHARD_FILE_NAME:
+                continue
+            file_path = Path(root) / file_name
+            digest.update(file_path.relative_to(skill_dir).as_posix().encode('utf-8') + b'\0')
+            with open(file_path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    digest.update(chunk)
+            digest.update(b'\0')
+    return digest.hexdigest()
+
+def scan_skill(skill_dir):
+    """Read one skill's SKILL.md frontmatter and content hash for --sync."""
+    skill_dir = Path(skill_dir)
+    result = {'dir': skill_dir.name, 'name': None, 'frontmatter': {}, 'hash': None, 'error': None}
+    try:
+        content = (skill_dir / "SKILL.md").read_text(encoding='utf-8')
+        # Split on delimiter lines only, so '---' inside a value is left alone
+        opening = FRONTMATTER_DELIMITER.match(content)
+        closing = FRONTMATTER_DELIMITER.search(content, opening.end()) if opening else None
+        if closing is None:
+            raise ValueError("SKILL.md has no YAML frontmatter")
+        frontmatter = yaml.safe_load(content[opening.end():closing.start()])
+        if not isinstance(frontmatter, dict) or not frontmatter.get('name'):
+            raise ValueError("frontmatter has no name")
+        result['frontmatter'] = frontmatter
+        result['name'] = str(frontmatter['name'])
+        result['hash'] = skill_content_hash(skill_dir)
+    except (OSError, UnicodeDecodeError, ValueError, yaml.YAMLError) as e:
+        result['error'] = str(e)
+    return result
+
+def plan_sync(registry, scans, present=()):
+    """Diff scanned skills against the registry.
+
+    present names every skill directory found, including ones that were not
+    scanned; only entries with no directory at all are treated as orphans.
+    Returns (changes, notes): journal records for the adds, updates and
+    orphan removals to apply, and messages about skills that were skipped.
+    """
+    changes = []
+    notes = []
+    today = datetime.now().strftime("%Y-%m-%d")
+    scanned = {}
+    # Skipped skills keep their registry entries untouched
+    untouched = set(present)
+
+    for scan in scans:
+        untouched.add(scan['dir'])
+        if scan['error']:
+            notes.append(f"⚠️  {scan['dir']}: skipped ({scan['error']})")
+            continue
+        if scan['name'] != scan['dir']:
+            untouched.add(scan['name'])
+            notes.append(f"⚠️  {scan['dir']}: frontmatter name '{scan['name']}' does not match directory, skipped")
+            continue
+        scanned[scan['name']] = scan
+
+    for name, scan in sorted(scanned.items()):
+        frontmatter = scan['frontmatter']
+        description = str(frontmatter.get('description', '')).strip()
+        before = registry.get(name)
+
+        if before is None:
+            tags = frontmatter.get('tags')
+            if not frontmatter.get('category') or not tags:
+                notes.append(f"⚠️  {name}: new skill needs 'category' and 'tags' in its frontmatter "
+                             f"(or add it with --interactive), skipped")
+                continue
+            display_name = frontmatter.get('displayName') or name.replace('slim-', '', 1).replace('-', ' ').title()
+            entry = generate_skill_entry(name, display_name, description, frontmatter['category'], tags,
+                                         frontmatter.get('example', ""))
+            entry['contentHash'] = scan['hash']
+            changes.append({'op': 'upsert', 'name': name, 'before': None, 'after': entry})
+            continue
+
+        entry = dict(before)
+        if description and entry.get('description') != description:
+            entry['description'] = description
+        if entry.get('contentHash') != scan['hash']:
+            # Without a recorded hash there is nothing to compare; record it without bumping
+            if entry.get('contentHash') is not None:
+                entry['lastUpdated'] = today
+            entry['contentHash'] = scan['hash']
+        if entry != before:
+            changes.append({'op': 'upsert', 'name': name, 'before': before, 'after': entry})
+
+    for name in registry.skill_names():
+        if name not in untouched and registry.get(name).get('type', 'skill') == 'skill':
+            changes.append({'op': 'delete', 'name': name, 'before': registry.get(name), 'after': None})
+
+    return changes, notes
+
+def describe_change(change):
+    """One-line summary of a sync or rewrite change."""
+    if change['op'] == 'delete':
+        return f"➖ {change['name']}: removed (no skill directory)"
+    if change['before'] is None:
+        return f"➕ {change['name']}: added"
+    before, after = change['before'], change['after']
+    updated = [field for field in ('description', 'category', 'tags', 'lastUpdated')
+               if before.get(field) != after.get(field)]
+    if not updated:
+        return f"🔖 {change['name']}: recorded content hash"
+    return f"🔄 {change['name']}: updated {', '.join(updated)}"
+
+def sync_registry(registry_path, skills_root, workers=None, dry_run=False, journal=True,
+                  keep_backups=None, concurrency=None):
+    """Reconcile registry entries with the SKILL.md frontmatter under skills_root."""
+    skills_root = Path(skills_root)
+    if not skills_root.is_dir():
+        print(f"❌ Skills directory does not exist: {skills_root}")
+        return False
+
+    present = {p.name for p in skills_root.iterdir() if p.is_dir() and not p.name.startswith('.')}
+    skill_dirs = sorted(skills_root / name for name in present if (skills_root / name / "SKILL.md").exists())
+    print(f"🔄 Syncing {len(skill_dirs)} skills from {skills_root} into {registry_path}")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        scans = list(executor.map(scan_skill, skill_dirs))
+
+    def apply(registry):
+        changes, notes = plan_sync(registry, scans, present)
+        for note in notes:
+            print(note)
+        for change in changes:
+            print(describe_change(change))
+
+        if not changes:
+            print("✅ Registry already in sync")
+            return changes
+        if dry_run:
+            print(f"ℹ️  Dry run: {len(changes)} change(s) not written")
+            return []
+
+        for change in changes:
+            if change['op'] == 'delete':
+                registry.delete(change['name'])
+            else:
+                registry.upsert(change['after'])
+        return changes
+
+    if dry_run:
+        return apply(open_registry(registry_path)) is not None
+    return transact_registry(registry_path, apply, journal, keep_backups, concurrency)
+
+def load_rewrite_plan(plan_path):
+    """Read a rewrite plan mapping old tag and category names to new ones; raises ValueError if malformed."""
+    with open(plan_path, 'r', encoding='utf-8') as f:
+        plan = json.load(f)
+    if not isinstance(plan, dict) or set(plan) - set(REWRITE_SECTIONS):
+        raise ValueError(f"expected an object with only {' and '.join(REWRITE_SECTIONS)} keys")
+
+    for section in REWRITE_SECTIONS:
+        mapping = plan.setdefault(section, {})
+        if not isinstance(mapping, dict) or not all(isinstance(new, str) and new for new in mapping.values()):
+            raise ValueError(f"'{section}' must map old names to new names")
+        # A name that is both renamed and a rename target would need two passes
+        chained = sorted(set(mapping) & set(mapping.values()))
+        if chained:
+            raise ValueError(f"'{section}' renames to and from {', '.join(chained)}")
+    return plan
+
+def plan_rewrites(registry, plan):
+    """Journal records for every skill entry whose tags or category the plan renames."""
+    tags, categories = plan['tags'], plan['categories']
+    changes = []
+    for name in registry.skill_names():
+        before = registry.get(name)
+        entry = dict(before)
+        if entry.get('category') in categories:
+            entry['category'] = categories[entry['category']]
+        if isinstance(entry.get('tags'), list):
+            # A renamed tag may already be on the entry under its new name
+            entry['tags'] = list(dict.fromkeys(tags.get(tag, tag) for tag in entry['tags']))
+        if entry != before:
+            changes.append({'op': 'upsert', 'name': name, 'before': before, 'after': entry})
+    return changes
+
+def rewrite_registry(registry_path, plan_path, dry_run=False, journal=True, keep_backups=None,
+                     concurrency=None):
+    """Apply a tag/category rewrite plan (from extract-categories.py --rewrite-plan) to the registry."""
+    try:
+        plan = load_rewrite_plan(plan_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Invalid rewrite plan {plan_path}: {e}")
+        return False
+    print(f"✏️  Applying {len(plan['tags'])} tag and {len(plan['categories'])} category rename(s) from {plan_path}")
+
+    def apply(registry):
+        changes = plan_rewrites(registry, plan)
+        for change in changes:
+            print(describe_change(change))
+
+        if not changes:
+            print("✅ No entries use the renamed tags or categories")
+            return changes
+        if dry_run:
+            print(f"ℹ️  Dry run: {len(changes)} change(s) not written")
+            return []
+
+        for change in changes:
+            registry.upsert(change['after'])
+        return changes
+
+    if dry_run:
+        return apply(open_registry(registry_path)) is not None
+    return transact_registry(registry_path, apply, journal, keep_backups, concurrency)
 
 def main():
     parser = argparse.ArgumentParser(description="Update SLIM marketplace registry with new skill")
@@ -211,9 +1233,74 @@ def main():
                        help="List existing categories")
     parser.add_argument("--list-tags", action="store_true",
                        help="List common tags")
+    parser.add_argument("--batch", metavar="MANIFEST",
+                       help="Apply upserts/deletes from a .jsonl or .csv manifest in one write")
+    parser.add_argument("--atomic", action="store_true",
+                       help="With --batch, write nothing if any record is rejected")
+    parser.add_argument("--shard-root", metavar="SKILLS_ROOT",
+                       help=f"Write new entries to <SKILLS_ROOT>/<name>/{SHARD_FILE_NAME} instead of registry.json")
+    parser.add_argument("--merge-shards", metavar="SKILLS_ROOT",
+                       help=f"Merge every {SHARD_FILE_NAME} under SKILLS_ROOT into registry.json")
+    parser.add_argument("--split-shards", metavar="SKILLS_ROOT",
+                       help=f"Export registry skill entries to {SHARD_FILE_NAME} files under SKILLS_ROOT")
+    parser.add_argument("--shard-cache", default=DEFAULT_SHARD_CACHE,
+                       help=f"Incremental merge cache (default: {DEFAULT_SHARD_CACHE})")
+    parser.add_argument("--marketplace", default=None,
+                       help="marketplace.json regenerated with every registry write "
+                            "(default: .claude-plugin/marketplace.json in the site root, if present)")
+    parser.add_argument("--no-marketplace", action="store_true",
+                       help="Do not regenerate marketplace.json")
+    parser.add_argument("--regenerate", action="store_true",
+                       help="Hydrate registry.json and regenerate marketplace.json without other changes")
+    parser.add_argument("--check", action="store_true",
+                       help="Exit non-zero if registry.json or marketplace.json is out of date; writes nothing")
+    parser.add_argument("--sync", metavar="SKILLS_ROOT",
+                       help="Add, update and remove skill entries to match SKILL.md frontmatter under SKILLS_ROOT")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Worker processes for --sync (default: CPU count)")
+    parser.add_argument("--apply-rewrites", metavar="PLAN",
+                       help="Rename tags and categories across entries using a plan from "
+                            "extract-categories.py --rewrite-plan")
+    parser.add_argument("--dry-run", action="store_true",
+                       help="With --sync or --apply-rewrites, show the changes without writing them")
+    parser.add_argument("--lock-timeout", type=float, default=DEFAULT_CONCURRENCY['timeout'],
+                       help=f"Seconds to wait for registry.json.lock (default: {DEFAULT_CONCURRENCY['timeout']:g})")
+    parser.add_argument("--wait", action="store_true",
+                       help="Wait for the registry lock indefinitely")
+    parser.add_argument("--optimistic", action="store_true",
+                       help="Lock only to commit; if the registry changed since it was read, redo the update")
+    parser.add_argument("--retries", type=int, default=DEFAULT_CONCURRENCY['retries'],
+                       help=f"Retries for --optimistic on conflicting writes (default: {DEFAULT_CONCURRENCY['retries']})")
+    parser.add_argument("--no-lock", action="store_true",
+                       help="Skip registry locking (single writer only)")
+    parser.add_argument("--keep-backups", type=int, default=None,
+                       help=f"Full-file backups to keep; 0 disables them (default: 0 with the journal, "
+                            f"{DEFAULT_KEEP_BACKUPS} with --no-journal)")
+    parser.add_argument("--no-journal", action="store_true",
+                       help="Do not append changes to the registry journal (registry.json.journal)")
 
     args = parser.parse_args()
     registry_path = Path(args.registry)
+    concurrency = {
+        'mode': 'none' if args.no_lock else 'optimistic' if args.optimistic else 'lock',
+        'timeout': None if args.wait else args.lock_timeout,
+        'retries': args.retries
+    }
+    transaction = {'journal': not args.no_journal, 'keep_backups': args.keep_backups, 'concurrency': concurrency}
+
+    if args.no_marketplace:
+        marketplace_path = None
+    elif args.marketplace:
+        marketplace_path = Path(args.marketplace)
+    else:
+        marketplace_path = marketplace_path_for(registry_path)
+    open_registry(registry_path).marketplace_path = marketplace_path
+
+    if args.check:
+        sys.exit(0 if check_generated(registry_path, marketplace_path) else 1)
+
+    if args.regenerate:
+        sys.exit(0 if regenerate_outputs(registry_path, marketplace_path, concurrency) else 1)
 
     # List categories or tags
     if args.list_categories:
@@ -228,9 +1315,33 @@ def main():
             print(f"  {tag} ({count} uses)")
         return
 
+    # Shard modes
+    if args.merge_shards:
+        success = merge_shards(registry_path, args.merge_shards, args.shard_cache, **transaction)
+        sys.exit(0 if success else 1)
+
+    if args.split_shards:
+        success = split_registry(registry_path, args.split_shards)
+        sys.exit(0 if success else 1)
+
+    # Sync mode
+    if args.sync:
+        success = sync_registry(registry_path, args.sync, args.workers, args.dry_run, **transaction)
+        sys.exit(0 if success else 1)
+
+    # Tag/category rewrite mode
+    if args.apply_rewrites:
+        success = rewrite_registry(registry_path, args.apply_rewrites, args.dry_run, **transaction)
+        sys.exit(0 if success else 1)
+
+    # Batch mode
+    if args.batch:
+        success = run_batch(registry_path, args.batch, args.atomic, **transaction)
+        sys.exit(0 if success else 1)
+
     # Interactive mode
     if args.interactive:
-        success = interactive_skill_creation()
+        success = interactive_skill_creation(**transaction, shard_root=args.shard_root)
         sys.exit(0 if success else 1)
 
     # Command line mode
@@ -241,7 +1352,8 @@ def main():
 
     success = add_skill_to_registry(
         registry_path, args.skill_name, args.display_name,
-        args.description, args.category, args.tags, args.example or "", args.version
+        args.description, args.category, args.tags, args.example or "", args.version,
+        **transaction, shard_root=args.shard_root
     )
 
     sys.exit(0 if success else 1)
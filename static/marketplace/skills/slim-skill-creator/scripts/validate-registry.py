@@ -0,0 +1,404 @@
+#!/usr/bin/env python3
+"""
+Validate registry.json entries against the SLIM marketplace schema.
+
+The schema is compiled once into nested check functions and every entry is
+checked in a single pass. Errors are reported with JSON-pointer paths, e.g.
+`/skills/3/category`, so the script is fast enough for a pre-commit hook.
+"""
+import re
+import sys
+import json
+import time
+import argparse
+from datetime import date
+from pathlib import Path
+
+# Names are lowercase words joined by single hyphens
+NAME_PATTERN = r'^[a-z0-9]+(-[a-z0-9]+)*$'
+# Only the YYYY-MM-DD form; date.fromisoformat also accepts basic and week dates
+DATE_PATTERN = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+NAME = {'type': 'string', 'pattern': NAME_PATTERN}
+TEXT = {'type': 'string', 'minLength': 1}
+URL = {'type': 'string', 'pattern': r'^https?://'}
+PERSON = {
+    'type': 'object',
+    'required': ['name'],
+    'properties': {'name': TEXT, 'email': TEXT, 'url': URL}
+}
+
+# Fields every entry may carry; generate_skill_entry in update-registry.py writes the required ones
+ENTRY_PROPERTIES = {
+    'name': NAME,
+    'displayName': TEXT,
+    'description': TEXT,
+    'category': TEXT,
+    'tags': {'type': 'array', 'minItems': 1, 'uniqueItems': True, 'items': TEXT},
+    'lastUpdated': {'type': 'string', 'format': 'date'},
+    'skill_file_url': TEXT,
+    'type': {'type': 'string'},
+    'example': {'type': 'string'},
+    'zip_file_path': TEXT,
+    'version': {'type': 'string', 'pattern': r'^\d+\.\d+\.\d+([-+].+)?$'},
+    'author': PERSON,
+    'homepage': URL,
+    'repository': URL,
+    'license': TEXT,
+    'dependencies': {
+        'type': 'object',
+        'additionalProperties': False,
+        'properties': {
+            'skills': {'type': 'array', 'uniqueItems': True, 'items': NAME},
+            'mcp': {'type': 'array', 'uniqueItems': True, 'items': NAME}
+        }
+    },
+    'contentHash': {'type': 'string', 'pattern': r'^[0-9a-f]{64}$'},
+    # Set by update-registry.py --merge-shards on entries owned by a registry-entry.json shard
+    'sharded': {'type': 'boolean'}
+}
+ENTRY_REQUIRED = ['name', 'displayName', 'description', 'category', 'tags', 'lastUpdated',
+                  'skill_file_url', 'type', 'example', 'zip_file_path']
+
+def entry_schema(entry_type, properties=None, required=None):
+    """Schema for one entry type, with `type` pinned to entry_type."""
+    return {
+        'type': 'object',
+        'required': required or ENTRY_REQUIRED,
+        'additionalProperties': False,
+        'properties': {**ENTRY_PROPERTIES, 'type': {'const': entry_type}, **(properties or {})}
+    }
+
+# External MCP servers are hosted elsewhere: no zip, a source descriptor instead
+EXTERNAL_MCP_SCHEMA = entry_schema('mcp', {
+    'external_only': {'type': 'boolean'},
+    'npm_package': TEXT,
+    'source': {
+        'type': 'object',
+        'required': ['source'],
+        'properties': {'source': TEXT, 'repo': URL}
+    },
+    'skill_file_url': URL
+}, [field for field in ENTRY_REQUIRED if field != 'zip_file_path'])
+
+REGISTRY_SCHEMA = {
+    'type': 'object',
+    'required': ['marketplace', 'skills', 'metadata'],
+    'properties': {
+        'marketplace': {
+            'type': 'object',
+            'required': ['name', 'owner', 'metadata'],
+            'properties': {
+                'name': NAME,
+                'owner': PERSON,
+                'metadata': {'type': 'object'},
+                'source': TEXT
+            }
+        },
+        'skills': {'type': 'array', 'items': entry_schema('skill')},
+        'agents': {'type': 'array', 'items': entry_schema('agent')},
+        'mcp': {'type': 'array'},
+        'metadata': {
+            'type': 'object',
+            'required': ['categoryIcons'],
+            'properties': {
+                'categoryIcons': {'type': 'object', 'additionalProperties': {'type': 'string'}}
+            }
+        }
+    }
+}
+
+# Where local entries of each section live, and the file their skill_file_url points at
+SECTIONS = {
+    'skills': ('skill', 'skills', 'SKILL.md'),
+    'agents': ('agent', 'agents', 'AGENT.md'),
+    'mcp': ('mcp', 'mcp-servers', 'MCP.md')
+}
+
+JSON_TYPES = {
+    'object': dict,
+    'array': list,
+    'string': str,
+    'boolean': bool
+}
+
+def pointer_join(pointer, token):
+    """Append a reference token to a JSON pointer (RFC 6901 escaping)."""
+    return f"{pointer}/{str(token).replace('~', '~0').replace('/', '~1')}"
+
+def compile_schema(schema):
+    """Compile a schema into a check(value, pointer, errors) function.
+
+    Supports the subset of JSON Schema the registry needs: type, const,
+    required, properties, additionalProperties, items, minItems,
+    uniqueItems, minLength, pattern and the `date` format.
+    """
+    checks = []
+
+    if 'type' in schema:
+        expected = JSON_TYPES[schema['type']]
+        type_name = schema['type']
+
+        def check_type(value, pointer, errors):
+            if not isinstance(value, expected):
+                errors.append((pointer, f"expected {type_name}, got {type(value).__name__}"))
+                return False
+            return True
+        checks.append(check_type)
+
+    if 'const' in schema:
+        const = schema['const']
+
+        def check_const(value, pointer, errors):
+            if value != const:
+                errors.append((pointer, f"must be {json.dumps(const)}, got {json.dumps(value)}"))
+        checks.append(check_const)
+
+    if 'minLength' in schema:
+        min_length = schema['minLength']
+
+        def check_min_length(value, pointer, errors):
+            if len(value) < min_length:
+                errors.append((pointer, "must not be empty" if min_length == 1
+                               else f"must be at least {min_length} characters"))
+        checks.append(check_min_length)
+
+    if 'pattern' in schema:
+        regex = re.compile(schema['pattern'])
+
+        def check_pattern(value, pointer, errors):
+            if not regex.search(value):
+                errors.append((pointer, f"{json.dumps(value)} does not match {regex.pattern}"))
+        checks.append(check_pattern)
+
+    if schema.get('format') == 'date':
+        def check_date(value, pointer, errors):
+            try:
+                if not DATE_PATTERN.fullmatch(value):
+                    raise ValueError(value)
+                date.fromisoformat(value)
+            except (TypeError, ValueError):
+                errors.append((pointer, f"{json.dumps(value)} is not a YYYY-MM-DD date"))
+        checks.append(check_date)
+
+    if 'required' in schema:
+        required = schema['required']
+
+        def check_required(value, pointer, errors):
+            for field in required:
+                if field not in value:
+                    errors.append((pointer_join(pointer, field), "required field is missing"))
+        checks.append(check_required)
+
+    if 'properties' in schema or 'additionalProperties' in schema:
+        properties = {name: compile_schema(sub) for name, sub in schema.get('properties', {}).items()}
+        additional = schema.get('additionalProperties', True)
+        additional_check = compile_schema(additional) if isinstance(additional, dict) else None
+
+        def check_properties(value, pointer, errors):
+            for field, field_value in value.items():
+                check = properties.get(field, additional_check)
+                if check is not None:
+                    check(field_value, pointer_join(pointer, field), errors)
+                elif additional is False:
+                    errors.append((pointer_join(pointer, field), "unknown field"))
+        checks.append(check_properties)
+
+    if 'minItems' in schema:
+        min_items = schema['minItems']
+
+        def check_min_items(value, pointer, errors):
+            if len(value) < min_items:
+                errors.append((pointer, f"must have at least {min_items} item(s)"))
+        checks.append(check_min_items)
+
+    if schema.get('uniqueItems'):
+        def check_unique(value, pointer, errors):
+            seen = set()
+            for index, item in enumerate(value):
+                key = json.dumps(item, sort_keys=True)
+                if key in seen:
+                    errors.append((pointer_join(pointer, index), f"duplicate item {key}"))
+                seen.add(key)
+        checks.append(check_unique)
+
+    if 'items' in schema:
+        item_check = compile_schema(schema['items'])
+
+        def check_items(value, pointer, errors):
+            for index, item in enumerate(value):
+                item_check(item, pointer_join(pointer, index), errors)
+        checks.append(check_items)
+
+    def check(value, pointer, errors):
+        # A failed type check makes the remaining keyword checks meaningless
+        for keyword_check in checks:
+            if keyword_check(value, pointer, errors) is False:
+                return
+    return check
+
+def is_external(entry):
+    """Whether an MCP entry is hosted externally (mirrors generate-marketplace.js)."""
+    return bool(entry.get('external_only') or entry.get('npm_package') or isinstance(entry.get('source'), dict))
+
+def read_base_url(config_path):
+    """Read the docusaurus baseUrl the same way generate-marketplace.js does."""
+    try:
+        match = re.search(r'baseUrl:\s*["\'`]([^"\'`]+)["\'`]', Path(config_path).read_text(encoding='utf-8'))
+    except OSError:
+        match = None
+    base_url = match.group(1) if match else "/"
+    return base_url if base_url.endswith("/") else base_url + "/"
+
+class RegistryValidator:
+    """Check a parsed registry against the compiled schema and the site tree."""
+
+    check_registry = staticmethod(compile_schema(REGISTRY_SCHEMA))
+    check_external_mcp = staticmethod(compile_schema(EXTERNAL_MCP_SCHEMA))
+    check_local_mcp = staticmethod(compile_schema(entry_schema('mcp')))
+
+    def __init__(self, root_dir, base_url="/"):
+        self.static_dir = Path(root_dir) / "static"
+        self.base_url = base_url
+        self.zip_dir = self.static_dir / "assets" / "zip"
+        # Zips are build outputs; only check them once a build has produced the directory
+        self.check_zips = self.zip_dir.is_dir()
+
+    def validate(self, registry):
+        """Return a list of (JSON pointer, message) errors for the whole registry."""
+        errors = []
+        self.check_registry(registry, "", errors)
+        if not isinstance(registry, dict):
+            return errors
+
+        metadata = registry.get('metadata')
+        categories = metadata.get('categoryIcons', {}) if isinstance(metadata, dict) else {}
+        skill_names = {entry.get('name') for entry in registry.get('skills') or []
+                       if isinstance(entry, dict)}
+
+        for section in SECTIONS:
+            entries = registry.get(section)
+            if not isinstance(entries, list):
+                continue
+            seen = {}
+            for index, entry in enumerate(entries):
+                if not isinstance(entry, dict):
+                    continue
+                pointer = f"/{section}/{index}"
+                if section == 'mcp':
+                    check = self.check_external_mcp if is_external(entry) else self.check_local_mcp
+                    check(entry, pointer, errors)
+                self.check_entry(section, entry, pointer, categories, skill_names, seen, errors)
+
+        errors.sort(key=lambda error: pointer_sort_key(error[0]))
+        return errors
+
+    def check_entry(self, section, entry, pointer, categories, skill_names, seen, errors):
+        """Cross-field checks that a schema cannot express."""
+        name = entry.get('name')
+        if not isinstance(name, str):
+            return
+
+        if name in seen:
+            errors.append((pointer_join(pointer, 'name'), f"duplicate name '{name}' (also at {seen[name]})"))
+        else:
+            seen[name] = pointer
+
+        category = entry.get('category')
+        if isinstance(category, str) and category and category not in categories:
+            errors.append((pointer_join(pointer, 'category'),
+                           f"category '{category}' is not defined in /metadata/categoryIcons"))
+
+        dependencies = entry.get('dependencies')
+        if isinstance(dependencies, dict):
+            for index, dependency in enumerate(dependencies.get('skills') or []):
+                if isinstance(dependency, str) and dependency not in skill_names:
+                    errors.append((f"{pointer}/dependencies/skills/{index}",
+                                   f"depends on unknown skill '{dependency}'"))
+
+        if section == 'mcp' and is_external(entry):
+            if 'zip_file_path' in entry:
+                errors.append((pointer_join(pointer, 'zip_file_path'), "external MCP servers have no local zip"))
+            return
+
+        _, directory, file_name = SECTIONS[section]
+        expected_url = f"{self.base_url}marketplace/{directory}/{name}/{file_name}"
+        skill_file_url = entry.get('skill_file_url')
+        if isinstance(skill_file_url, str) and skill_file_url:
+            if skill_file_url != expected_url:
+                errors.append((pointer_join(pointer, 'skill_file_url'),
+                               f"expected {expected_url}, got {skill_file_url}"))
+            elif not (self.static_dir / "marketplace" / directory / name / file_name).is_file():
+                errors.append((pointer_join(pointer, 'skill_file_url'),
+                               f"static/marketplace/{directory}/{name}/{file_name} does not exist"))
+
+        expected_zip = f"assets/zip/{name}.zip"
+        zip_file_path = entry.get('zip_file_path')
+        if isinstance(zip_file_path, str) and zip_file_path:
+            if zip_file_path != expected_zip:
+                errors.append((pointer_join(pointer, 'zip_file_path'),
+                               f"expected {expected_zip}, got {zip_file_path}"))
+            elif self.check_zips and not (self.zip_dir / f"{name}.zip").is_file():
+                errors.append((pointer_join(pointer, 'zip_file_path'),
+                               f"static/{expected_zip} does not exist"))
+
+def pointer_sort_key(pointer):
+    """Order pointers by position in the document (array indexes numerically)."""
+    return [(0, int(token), "") if token.isdigit() else (1, 0, token) for token in pointer.split('/')]
+
+def main():
+    parser = argparse.ArgumentParser(description="Validate SLIM marketplace registry.json against its schema")
+    parser.add_argument("--registry", default="static/data/registry.json",
+                       help="Path to registry.json file")
+    parser.add_argument("--root", default=None,
+                       help="Site root containing static/ and docusaurus.config.js (default: three levels above the registry)")
+    parser.add_argument("--format", choices=["text", "json"], default="text", dest="output_format",
+                       help="Report format")
+
+    args = parser.parse_args()
+    started = time.perf_counter()
+    registry_path = Path(args.registry)
+    if args.root:
+        root_dir = Path(args.root)
+    else:
+        # Registries outside a site tree (e.g. /tmp/registry.json) fall back to the filesystem root
+        parents = registry_path.resolve().parents
+        root_dir = parents[min(2, len(parents) - 1)]
+
+    try:
+        with open(registry_path, 'rb') as f:
+            registry = json.load(f)
+    except FileNotFoundError:
+        print(f"❌ Registry file not found: {registry_path}")
+        sys.exit(1)
+    except json.JSONDecodeError as e:
+        print(f"❌ Invalid JSON in registry file: {e}")
+        sys.exit(1)
+
+    validator = RegistryValidator(root_dir, read_base_url(root_dir / "docusaurus.config.js"))
+    errors = validator.validate(registry)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    if args.output_format == "json":
+        print(json.dumps({
+            'registry': str(registry_path),
+            'valid': not errors,
+            'errors': [{'pointer': pointer, 'message': message} for pointer, message in errors],
+            'elapsed_ms': round(elapsed_ms, 3)
+        }, indent=2))
+        sys.exit(1 if errors else 0)
+
+    entries = 0
+    if isinstance(registry, dict):
+        entries = sum(len(registry[section]) for section in SECTIONS if isinstance(registry.get(section), list))
+    if errors:
+        print(f"❌ {registry_path}: {len(errors)} schema error(s)")
+        for pointer, message in errors:
+            print(f"  {pointer or '/'}: {message}")
+        print(f"\nChecked {entries} entries in {elapsed_ms:.1f}ms")
+        sys.exit(1)
+
+    print(f"✅ {registry_path}: {entries} entries valid ({elapsed_ms:.1f}ms)")
+
+if __name__ == "__main__":
+    main()
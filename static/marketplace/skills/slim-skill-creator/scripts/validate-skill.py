@@ -5,118 +5,924 @@ Validate SLIM marketplace skills for quality and completeness.
 import os
 import sys
 import re
+import ast
+import json
+import zlib
+import hashlib
+import tempfile
 import yaml
+import heapq
+import time
+import bisect
+import select
+import struct
+import ctypes
+import ctypes.util
 import argparse
+import importlib.util
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from functools import cached_property, lru_cache
 from pathlib import Path
 
+# Bump whenever a validation rule changes so cached results are discarded.
+RULES_VERSION = "7"
+
+TOOL_NAME = "validate-skill"
+SARIF_SCHEMA = "https://json.schemastore.org/sarif-2.1.0.json"
+
+# Text report prefix for each finding severity
+SEVERITY_ICONS = {
+    'error': "❌ ",
+    'warning': "⚠️  "
+}
+
+SKILL_NAME_PATTERN = re.compile(r'^[a-z0-9-]+$')
+
+# Single scan over SKILL.md for headings, placeholders, interactive options and
+# asset/script references. Headings, placeholders and references only consume
+# their leading token and capture the rest in a lookahead, so matches nested in
+# one another (e.g. a reference inside a heading) are all still found.
+DOCUMENT_SCAN_PATTERN = re.compile(
+    r'^(?P<hashes>#{1,6})(?=[ \t]*(?P<title>[^\n]*))'
+    r'|\[(?=(?P<placeholder>(?i:INSERT|PLACEHOLDER|TODO)[^\]]*)\])'
+    r'|(?P<option>\*\*Option [AB])'
+    r'|(?P<ref_kind>assets|scripts)/(?=(?P<ref>[^\s\)]+))',
+    re.MULTILINE
+)
+
+FENCE_PATTERN = re.compile(r'^\s*(```|~~~)')
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s*(.*?)\s*#*\s*$')
+BOLD_LABEL_PATTERN = re.compile(r'^\*\*(.+?)\*\*\s*(?:\(.*\))?\s*:?\s*$')
+LIST_ITEM_PATTERN = re.compile(r'^\s*[-*+]\s+(.*)$')
+ITEM_KIND_PATTERN = re.compile(r'^\*\*(.+?)\*\*\s*:?')
+BACKTICK_NAME_PATTERN = re.compile(r'`([^`]+)`')
+MCP_NAME_PATTERN = re.compile(r'^[A-Za-z0-9@][A-Za-z0-9@/._-]*$')
+
+def dependency_kind(label):
+    """Classify a Dependencies subsection label: 'skills', 'mcp_servers', 'mixed' or None."""
+    label = label.lower()
+    if 'required' not in label:
+        return None
+    if 'mcp' in label:
+        return 'mcp_servers'
+    if 'skill' in label:
+        return 'skills'
+    return 'mixed'
+
+def parse_dependencies(body, line_offset=0):
+    """Extract required skills and MCP servers from a SKILL.md Dependencies section.
+
+    Understands both `### Required Skills` headings and `**Required Skills:**`
+    labels, plus `- **Skills**: `name`` items under a generic "Required"
+    subsection. Fenced code blocks and placeholder names are ignored.
+    Returns {'skills': [(name, line)], 'mcp_servers': [(name, line)]}.
+    """
+    dependencies = {'skills': [], 'mcp_servers': []}
+    in_fence = False
+    in_section = False
+    kind = None
+
+    for number, line in enumerate(body.splitlines(), line_offset + 1):
+        if FENCE_PATTERN.match(line):
+            in_fence = not in_fence
+            continue
+        if in_fence:
+            continue
+
+        heading = HEADING_PATTERN.match(line)
+        if heading:
+            if len(heading.group(1)) <= 2:
+                in_section = heading.group(2).startswith('Dependencies')
+                kind = None
+            elif in_section:
+                kind = dependency_kind(heading.group(2))
+            continue
+        if not in_section:
+            continue
+
+        label = BOLD_LABEL_PATTERN.match(line.strip())
+        if label:
+            kind = dependency_kind(label.group(1))
+            continue
+
+        item = LIST_ITEM_PATTERN.match(line)
+        if not item or kind is None:
+            continue
+
+        text = item.group(1)
+        item_kind = kind
+        if kind == 'mixed':
+            prefix = ITEM_KIND_PATTERN.match(text)
+            item_kind = dependency_kind(f"required {prefix.group(1)}") if prefix else None
+            if item_kind not in ('skills', 'mcp_servers'):
+                continue
+
+        for name in BACKTICK_NAME_PATTERN.findall(text):
+            name = name.strip()
+            pattern = SKILL_NAME_PATTERN if item_kind == 'skills' else MCP_NAME_PATTERN
+            if pattern.match(name):
+                dependencies[item_kind].append((name, number))
+
+    return dependencies
+
+class SkillDocument:
+    """SKILL.md read once and parsed lazily for all validation steps."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    @cached_property
+    def content(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    @cached_property
+    def has_frontmatter(self):
+        return self.content.startswith('---\n')
+
+    @cached_property
+    def parts(self):
+        """Split into (frontmatter text, markdown body), or None if malformed."""
+        if not self.has_frontmatter:
+            return None
+        parts = self.content.split('---\n', 2)
+        if len(parts) < 3:
+            return None
+        return parts[1], parts[2]
+
+    @cached_property
+    def parsed_frontmatter(self):
+        """(frontmatter, error) pair so a YAML failure is only parsed once."""
+        if self.parts is None:
+            return None, None
+        try:
+            return yaml.safe_load(self.parts[0]), None
+        except yaml.YAMLError as e:
+            return None, e
+
+    @property
+    def frontmatter(self):
+        """Parsed YAML frontmatter; raises yaml.YAMLError if invalid."""
+        frontmatter, error = self.parsed_frontmatter
+        if error is not None:
+            raise error
+        return frontmatter
+
+    @property
+    def body(self):
+        return self.parts[1] if self.parts is not None else None
+
+    @cached_property
+    def body_offset(self):
+        if self.parts is None:
+            return len(self.content)
+        return len(self.content) - len(self.parts[1])
+
+    @cached_property
+    def scan(self):
+        """Index headings, placeholders, options and file references in one pass."""
+        result = {
+            'headings': [],
+            'placeholders': [],
+            'has_options': False,
+            'asset_refs': [],
+            'script_refs': []
+        }
+        body_offset = self.body_offset
+        ref_end = placeholder_end = 0
+
+        for match in DOCUMENT_SCAN_PATTERN.finditer(self.content):
+            if match.group('ref_kind'):
+                # References and placeholders keep findall's non-overlapping semantics
+                if match.start() < ref_end:
+                    continue
+                ref_end = match.end('ref')
+                result[f"{match.group('ref_kind')[:-1]}_refs"].append(
+                    (match.group('ref'), self.line_at(match.start())))
+            elif match.start() < body_offset:
+                continue
+            elif match.group('hashes'):
+                result['headings'].append((len(match.group('hashes')), match.group('title').strip()))
+            elif match.group('placeholder') is not None:
+                if match.start() < placeholder_end:
+                    continue
+                placeholder_end = match.end('placeholder') + 1
+                result['placeholders'].append(
+                    (f"[{match.group('placeholder')}]", self.line_at(match.start())))
+            else:
+                result['has_options'] = True
+
+        return result
+
+    @cached_property
+    def line_starts(self):
+        """Offsets at which each line of SKILL.md begins."""
+        starts = [0]
+        index = self.content.find('\n')
+        while index != -1:
+            starts.append(index + 1)
+            index = self.content.find('\n', index + 1)
+        return starts
+
+    def line_at(self, offset):
+        """Convert a character offset into a 1-based line number."""
+        return bisect.bisect_right(self.line_starts, offset)
+
+    def frontmatter_line(self, field):
+        """Line number of a top-level frontmatter key, or None if not found."""
+        if self.parts is None:
+            return None
+        match = re.search(rf'^{re.escape(field)}\s*:', self.parts[0], re.MULTILINE)
+        if not match:
+            return None
+        # Frontmatter starts on line 2, after the opening '---'
+        return self.parts[0].count('\n', 0, match.start()) + 2
+
+    @cached_property
+    def dependencies(self):
+        """Required skills and MCP servers declared in the Dependencies section."""
+        if self.body is None:
+            return {'skills': [], 'mcp_servers': []}
+        return parse_dependencies(self.body, self.line_at(self.body_offset) - 1)
+
+    @property
+    def headings(self):
+        """List of (level, title) tuples for every markdown heading in the body."""
+        return self.scan['headings']
+
+    def has_section(self, title):
+        """Check whether any body heading starts with the given title."""
+        return any(heading.startswith(title) for _, heading in self.headings)
+
+    @property
+    def placeholders(self):
+        """List of (placeholder, line) tuples found in the body."""
+        return self.scan['placeholders']
+
+    @property
+    def has_options(self):
+        return self.scan['has_options']
+
+    @property
+    def asset_refs(self):
+        """List of (path under assets/, line) tuples."""
+        return self.scan['asset_refs']
+
+    @property
+    def script_refs(self):
+        """List of (path under scripts/, line) tuples."""
+        return self.scan['script_refs']
+
+DEFAULT_CACHE_PATH = ".slim-cache/validation.json"
+
+# Rule configuration picked up from the working directory when present
+DEFAULT_RULES_CONFIG = ".slim-rules.yml"
+
+# Per-skill asset budgets; sizes in megabytes
+DEFAULT_ASSET_BUDGETS = {
+    'max_file_mb': 10,
+    'max_total_mb': 50,
+    'max_files': 500
+}
+
+# Number of largest files listed when an asset budget is exceeded
+BUDGET_OFFENDERS_SHOWN = 5
+
+# Parse scripts in a process pool only when a skill has at least this many to parse
+PARALLEL_SCRIPT_THRESHOLD = 32
+
+# Hash duplicate-asset candidates in a process pool only when there are at least this many
+PARALLEL_HASH_THRESHOLD = 32
+
+# Read size used when hashing or compressing asset files
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Upper bound on cached per-script analyses; least recently used are dropped first
+MAX_CACHED_SCRIPTS = 5000
+
+# Exception names whose handlers mark the imports they guard as optional
+IMPORT_GUARD_EXCEPTIONS = {'ImportError', 'ModuleNotFoundError', 'Exception', 'BaseException'}
+
+def catches_import_error(handler):
+    """Check whether an except clause would swallow a failed import."""
+    if handler.type is None:
+        return True
+    names = handler.type.elts if isinstance(handler.type, ast.Tuple) else [handler.type]
+    return any(isinstance(name, ast.Name) and name.id in IMPORT_GUARD_EXCEPTIONS for name in names)
+
+def collect_imports(node, imports, optional=False):
+    """Collect (top-level module, line, optional) for every absolute import under node."""
+    for child in ast.iter_child_nodes(node):
+        if isinstance(child, ast.Try):
+            guarded = optional or any(catches_import_error(h) for h in child.handlers)
+            for stmt in child.body:
+                collect_imports(ast.Module(body=[stmt], type_ignores=[]), imports, guarded)
+            for part in (child.handlers, child.orelse, child.finalbody):
+                for stmt in part:
+                    collect_imports(ast.Module(body=[stmt], type_ignores=[]), imports, optional)
+        elif isinstance(child, ast.Import):
+            for alias in child.names:
+                imports.append((alias.name.split('.')[0], child.lineno, optional))
+        elif isinstance(child, ast.ImportFrom):
+            if child.level == 0 and child.module:
+                imports.append((child.module.split('.')[0], child.lineno, optional))
+        else:
+            collect_imports(child, imports, optional)
+
+def is_main_guard(node):
+    """Check for a top-level `if __name__ == "__main__":` block."""
+    if not isinstance(node, ast.If) or not isinstance(node.test, ast.Compare):
+        return False
+    test = node.test
+    if len(test.ops) != 1 or not isinstance(test.ops[0], ast.Eq):
+        return False
+    operands = [test.left, test.comparators[0]]
+    has_name = any(isinstance(o, ast.Name) and o.id == '__name__' for o in operands)
+    has_main = any(isinstance(o, ast.Constant) and o.value == '__main__' for o in operands)
+    return has_name and has_main
+
+def analyze_script(source):
+    """Parse Python source bytes and summarize its structure.
+
+    Returns a JSON-serializable dict so results can be cached by file hash
+    and shipped between processes.
+    """
+    analysis = {
+        'shebang': source.startswith(b'#!/usr/bin/env python'),
+        'syntax_error': None,
+        'main': False,
+        'main_guard': False,
+        'imports': []
+    }
+    try:
+        tree = ast.parse(source)
+    except (SyntaxError, ValueError) as e:
+        analysis['syntax_error'] = {
+            'message': getattr(e, 'msg', None) or str(e),
+            'line': getattr(e, 'lineno', None)
+        }
+        return analysis
+
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == 'main':
+            analysis['main'] = True
+        elif is_main_guard(node):
+            analysis['main_guard'] = True
+
+    imports = []
+    collect_imports(tree, imports)
+    analysis['imports'] = imports
+    return analysis
+
+@lru_cache(maxsize=None)
+def interpreter_key():
+    """Identify this interpreter and its import path, which decide scripts/unavailable-import.
+
+    Import directories are stamped by mtime so installing or removing a
+    package also invalidates cached results.
+    """
+    stamps = []
+    # sys.path[0] is this script's directory, not an install location
+    for entry in sys.path[1:]:
+        try:
+            stamps.append([entry, os.stat(entry).st_mtime_ns])
+        except OSError:
+            continue
+    return [sys.executable, sys.version, stamps]
+
+@lru_cache(maxsize=None)
+def module_installed(name):
+    """Check whether a top-level module can be imported in this interpreter."""
+    if name in sys.builtin_module_names or name in getattr(sys, 'stdlib_module_names', ()):
+        return True
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
+
+def module_available(name, search_dirs):
+    """Check a module against sibling script files/packages, then the interpreter."""
+    for search_dir in search_dirs:
+        if os.path.isfile(os.path.join(search_dir, f"{name}.py")) or \
+                os.path.isdir(os.path.join(search_dir, name)):
+            return True
+    return module_installed(name)
+
+def iter_files(root):
+    """Stream every regular file under root as an os.DirEntry.
+
+    Uses os.scandir so each entry's type and stat information is cached,
+    and never materializes the full listing. Symlinked directories are not
+    followed.
+    """
+    stack = [root]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                elif entry.is_file():
+                    yield entry
+
+def format_size(size_bytes):
+    """Format a byte count for reports."""
+    if size_bytes < 1024:
+        return f"{size_bytes}B"
+    if size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.1f}KB"
+    return f"{size_bytes / (1024 * 1024):.1f}MB"
+
+def skill_fingerprint(skill_path, salt=""):
+    """Compute a content fingerprint for a skill directory.
+
+    Covers the SKILL.md contents plus the relative path, size and mtime of
+    every file under scripts/ and assets/. The salt captures validator
+    settings that affect results.
+    """
+    skill_path = Path(skill_path)
+    digest = hashlib.sha256(salt.encode())
+
+    skill_md = skill_path / "SKILL.md"
+    try:
+        digest.update(skill_md.read_bytes())
+    except OSError:
+        digest.update(b"<no SKILL.md>")
+
+    for dir_name in ("scripts", "assets"):
+        dir_path = skill_path / dir_name
+        digest.update(f"\0{dir_name}:{dir_path.is_dir()}".encode())
+        for root, dirs, files in os.walk(dir_path):
+            dirs.sort()
+            for file_name in sorted(files):
+                file_path = os.path.join(root, file_name)
+                try:
+                    st = os.stat(file_path)
+                except OSError:
+                    continue
+                rel_path = os.path.relpath(file_path, skill_path)
+                digest.update(f"\0{rel_path}\0{st.st_size}\0{st.st_mtime_ns}".encode())
+
+    return digest.hexdigest()
+
+class ValidationCache:
+    """Persistent on-disk cache of validation results keyed by skill fingerprint."""
+
+    def __init__(self, cache_path=DEFAULT_CACHE_PATH):
+        self.cache_path = Path(cache_path)
+        data = self.load()
+        self.entries = data.get('entries', {})
+        self.scripts = data.get('scripts', {})
+        self.dirty = False
+
+    def load(self):
+        """Load cached data, discarding it if the rules version changed."""
+        try:
+            with open(self.cache_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {}
+
+        if not isinstance(data, dict) or data.get('rules_version') != RULES_VERSION:
+            return {}
+        return data
+
+    @staticmethod
+    def key(skill_path):
+        return str(Path(skill_path).resolve())
+
+    def get(self, skill_path, fingerprint):
+        """Return the cached entry (findings, dependencies) for an unchanged skill, else None."""
+        entry = self.entries.get(self.key(skill_path))
+        if entry and entry.get('fingerprint') == fingerprint:
+            return entry
+        return None
+
+    def put(self, skill_path, fingerprint, findings, dependencies):
+        """Record validation findings and declared dependencies for a skill fingerprint."""
+        self.entries[self.key(skill_path)] = {
+            'fingerprint': fingerprint,
+            'findings': list(findings),
+            'dependencies': dependencies
+        }
+        self.dirty = True
+
+    def get_script(self, digest):
+        """Return the cached analysis for a script content hash, else None."""
+        analysis = self.scripts.pop(digest, None)
+        if analysis is not None:
+            # Re-insert to keep recently used analyses at the end
+            self.scripts[digest] = analysis
+        return analysis
+
+    def put_scripts(self, analyses):
+        """Record script analyses keyed by content hash."""
+        if not analyses:
+            return
+        self.scripts.update(analyses)
+        while len(self.scripts) > MAX_CACHED_SCRIPTS:
+            del self.scripts[next(iter(self.scripts))]
+        self.dirty = True
+
+    def save(self):
+        """Atomically write the cache back to disk if it changed."""
+        if not self.dirty:
+            return
+
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {'rules_version': RULES_VERSION, 'entries': self.entries, 'scripts': self.scripts}
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_path.parent, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise
+        self.dirty = False
+
+# Artifacts a rule can declare, mapped to the SkillValidator method that loads each
+ARTIFACT_LOADERS = {
+    'frontmatter': 'load_frontmatter',
+    'body': 'load_body',
+    'assets': 'load_asset_listing',
+    'scripts': 'load_script_analyses'
+}
+
+# Findings reported by the validator itself rather than by a rule
+VALIDATOR_FINDINGS = ("validator/rule-failed",)
+
+class Rule:
+    """A registered validation rule, the artifacts it reads and the finding ids it reports."""
+
+    def __init__(self, rule_id, func, requires=(), description="", enabled=True, findings=()):
+        self.id = rule_id
+        self.func = func
+        self.requires = tuple(requires)
+        self.description = description
+        self.enabled = enabled
+        self.findings = tuple(findings)
+
+class RuleRegistry:
+    """Ordered registry of validation rules.
+
+    Rules are functions taking the SkillValidator. They read the artifacts
+    they declare through validator.artifact(name) and report through
+    validator.add_error()/add_warning(). Plugins listed in the rules config
+    define register(rules) and add rules the same way the built-ins do:
+
+        def register(rules):
+            @rules.rule("org-license", requires=("scripts",),
+                        description="Scripts carry the org license header",
+                        findings=("org-license/missing-header",))
+            def check_license(validator):
+                for path, analysis in validator.artifact("scripts") or []:
+                    ...
+    """
+
+    def __init__(self, rules=None):
+        self.rules = dict(rules or {})
+
+    def rule(self, rule_id, requires=(), description="", enabled=True, findings=()):
+        """Decorator registering a rule function under rule_id.
+
+        findings lists the finding ids the rule reports so a rules config can
+        be checked for typos; a rule that declares none accepts any
+        `rule_id/...` id in `disable`.
+        """
+        unknown = set(requires) - set(ARTIFACT_LOADERS)
+        if unknown:
+            raise ValueError(f"Rule '{rule_id}' requires unknown artifact(s): {', '.join(sorted(unknown))}")
+
+        def decorator(func):
+            self.rules[rule_id] = Rule(rule_id, func, requires, description or (func.__doc__ or "").strip(), enabled,
+                                       findings)
+            return func
+        return decorator
+
+    def copy(self):
+        return RuleRegistry(self.rules)
+
+BUILTIN_RULES = RuleRegistry()
+
+class RuleSet:
+    """Rules enabled for a run, resolved from a registry and a rules config.
+
+    Config entries under `enable`/`disable` that name a registered rule turn
+    it on or off. Other `disable` entries suppress individual findings by
+    finding id or id prefix (e.g. `markdown/placeholder` or `validator`).
+    Unknown ids raise ValueError.
+    """
+
+    def __init__(self, registry, config=None, plugin_digests=()):
+        config = config or {}
+        self.registry = registry
+        enabled = {rule_id for rule_id, rule in registry.rules.items() if rule.enabled}
+
+        for rule_id in config.get('enable') or []:
+            if rule_id not in registry.rules:
+                raise ValueError(f"Unknown rule in enable: {rule_id}")
+            enabled.add(rule_id)
+
+        self.suppressed = set()
+        for rule_id in config.get('disable') or []:
+            if rule_id in registry.rules:
+                enabled.discard(rule_id)
+            elif self.is_known_finding(registry, rule_id.rstrip('/')):
+                self.suppressed.add(rule_id.rstrip('/'))
+            else:
+                raise ValueError(f"Unknown rule or finding in disable: {rule_id}")
+
+        self.rules = [rule for rule_id, rule in registry.rules.items() if rule_id in enabled]
+        self.artifacts = []
+        for rule in self.rules:
+            for artifact in rule.requires:
+                if artifact not in self.artifacts:
+                    self.artifacts.append(artifact)
+
+        self.signature = json.dumps({
+            'rules': [rule.id for rule in self.rules],
+            'suppressed': sorted(self.suppressed),
+            'plugins': list(plugin_digests)
+        }, sort_keys=True)
+
+    @staticmethod
+    def is_known_finding(registry, finding_id):
+        """Check whether a finding id or id prefix can be reported by the registered rules."""
+        if finding_id in VALIDATOR_FINDINGS or finding_id in {f.split('/')[0] for f in VALIDATOR_FINDINGS}:
+            return True
+        prefix = finding_id.split('/')[0]
+        rule = registry.rules.get(prefix)
+        if rule is None:
+            return False
+        return not rule.findings or finding_id == prefix or finding_id in rule.findings
+
+    def is_suppressed(self, finding_rule):
+        """Check whether findings with this rule id are disabled by the config."""
+        return any(finding_rule == prefix or finding_rule.startswith(prefix + '/')
+                   for prefix in self.suppressed)
+
+@lru_cache(maxsize=None)
+def load_rule_set(config_path=None):
+    """Build the rule set from built-in rules, plugins and a YAML/JSON config file.
+
+    Cached per process so pool workers load plugins once.
+    """
+    registry = BUILTIN_RULES.copy()
+    if config_path is None:
+        return RuleSet(registry)
+
+    config_path = Path(config_path)
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    if not isinstance(config, dict):
+        raise ValueError(f"Rules config must be a mapping: {config_path}")
+
+    plugin_digests = []
+    for plugin in config.get('plugins') or []:
+        plugin_path = (config_path.parent / plugin).resolve()
+        source = plugin_path.read_bytes()
+        plugin_digests.append(hashlib.sha256(source).hexdigest())
+
+        spec = importlib.util.spec_from_file_location(f"slim_rules_{plugin_path.stem}", plugin_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        if not hasattr(module, 'register'):
+            raise ValueError(f"Rules plugin has no register(rules) function: {plugin_path}")
+        module.register(registry)
+
+    return RuleSet(registry, config, plugin_digests)
+
+def format_findings(findings, severity):
+    """Format findings of one severity as text report lines."""
+    icon = SEVERITY_ICONS[severity]
+    return [f"{icon}{f['message']}" for f in findings if f['severity'] == severity]
+
 class SkillValidator:
-    def __init__(self, skill_path):
+    def __init__(self, skill_path, quiet=False, cache=None, asset_budgets=None, script_workers=None,
+                 rules_config=None, sibling_dependencies=False):
         self.skill_path = Path(skill_path)
-        self.errors = []
-        self.warnings = []
+        self.quiet = quiet
+        self.cache = cache
+        # Resolve dependencies against the other skills in the same root (single-skill runs)
+        self.sibling_dependencies = sibling_dependencies
+        self.rule_set = load_rule_set(rules_config)
+        self.artifacts = {}
+        self.asset_budgets = {**DEFAULT_ASSET_BUDGETS, **(asset_budgets or {})}
+        self.script_workers = script_workers
+        self.script_analyses = {}
+        self.findings = []
+        self.timings = []
         self.skill_data = {}
-
-    def add_error(self, message):
+        self.dependencies = {'skills': [], 'mcp_servers': []}
+        self.document = SkillDocument(self.skill_path / "SKILL.md")
+        self.fingerprint = None
+        self.from_cache = False
+
+    def settings_key(self):
+        """Serialize the settings and interpreter that influence validation results."""
+        return json.dumps([self.asset_budgets, self.rule_set.signature, interpreter_key()], sort_keys=True)
+
+    def log(self, message):
+        """Print progress output unless running quietly."""
+        if not self.quiet:
+            print(message)
+
+    def add_finding(self, severity, rule, message, file=None, line=None):
+        """Record a structured validation finding."""
+        if self.rule_set.suppressed and self.rule_set.is_suppressed(rule):
+            return
+        self.findings.append({
+            'rule': rule,
+            'severity': severity,
+            'message': message,
+            'file': file,
+            'line': line
+        })
+
+    def add_error(self, message, rule, file=None, line=None):
         """Add validation error."""
-        self.errors.append(f"❌ {message}")
+        self.add_finding('error', rule, message, file, line)
 
-    def add_warning(self, message):
+    def add_warning(self, message, rule, file=None, line=None):
         """Add validation warning."""
-        self.warnings.append(f"⚠️  {message}")
+        self.add_finding('warning', rule, message, file, line)
+
+    @property
+    def errors(self):
+        return format_findings(self.findings, 'error')
+
+    @property
+    def warnings(self):
+        return format_findings(self.findings, 'warning')
+
+    def result(self):
+        """Summarize the validation outcome as a plain, picklable dict."""
+        return {
+            'name': self.skill_path.name,
+            'path': self.skill_path.as_posix(),
+            'valid': not self.errors,
+            'cached': self.from_cache,
+            'fingerprint': self.fingerprint,
+            'findings': self.findings,
+            'timings': self.timings,
+            'dependencies': self.dependencies,
+            'script_analyses': self.script_analyses
+        }
+
+    def artifact(self, name):
+        """Load an artifact on first use and share it between rules."""
+        if name not in self.artifacts:
+            self.artifacts[name] = getattr(self, ARTIFACT_LOADERS[name])()
+        return self.artifacts[name]
+
+    def load_frontmatter(self):
+        """Parsed frontmatter, or None if SKILL.md or its frontmatter is unusable."""
+        try:
+            frontmatter, error = self.document.parsed_frontmatter
+        except Exception:
+            return None
+        return frontmatter if error is None else None
+
+    def load_body(self):
+        """Markdown body of SKILL.md, or None if unavailable."""
+        try:
+            return self.document.body
+        except Exception:
+            return None
+
+    def load_asset_listing(self):
+        """List (relative path, size) for every file under assets/, or None without an assets directory."""
+        assets_dir = self.skill_path / "assets"
+        if not assets_dir.is_dir():
+            return None
+        return [(os.path.relpath(entry.path, assets_dir), entry.stat().st_size)
+                for entry in iter_files(assets_dir)]
 
+    def load_script_analyses(self):
+        """Pair every .py file under scripts/ with its ast analysis, or None without a scripts directory."""
+        scripts_dir = self.skill_path / "scripts"
+        if not scripts_dir.is_dir():
+            return None
+        python_files = sorted(entry.path for entry in iter_files(scripts_dir)
+                              if entry.name.endswith('.py'))
+        return list(zip(python_files, self.analyze_scripts(python_files)))
+
+    @BUILTIN_RULES.rule("structure", description="Skill directory, SKILL.md and subdirectory layout",
+                        findings=("structure/missing-directory", "structure/not-a-directory",
+                                  "structure/missing-skill-md", "structure/skill-md-not-file"))
     def validate_directory_structure(self):
         """Validate basic directory structure."""
-        print("🔍 Validating directory structure...")
+        self.log("🔍 Validating directory structure...")
 
         if not self.skill_path.is_dir():
-            self.add_error(f"Skill directory does not exist: {self.skill_path}")
+            self.add_error(f"Skill directory does not exist: {self.skill_path}", "structure/missing-directory")
             return False
 
         # Check for SKILL.md
         skill_md = self.skill_path / "SKILL.md"
         if not skill_md.exists():
-            self.add_error("SKILL.md file is missing")
+            self.add_error("SKILL.md file is missing", "structure/missing-skill-md", "SKILL.md")
         elif not skill_md.is_file():
-            self.add_error("SKILL.md is not a file")
+            self.add_error("SKILL.md is not a file", "structure/skill-md-not-file", "SKILL.md")
 
         # Check subdirectories
         expected_dirs = ["scripts", "assets"]
         for dir_name in expected_dirs:
             dir_path = self.skill_path / dir_name
             if dir_path.exists() and not dir_path.is_dir():
-                self.add_error(f"{dir_name}/ exists but is not a directory")
+                self.add_error(f"{dir_name}/ exists but is not a directory", "structure/not-a-directory", dir_name)
 
         return len(self.errors) == 0
 
+    @BUILTIN_RULES.rule("frontmatter", requires=("frontmatter",),
+                        description="SKILL.md YAML frontmatter fields and format",
+                        findings=("frontmatter/unreadable", "frontmatter/missing", "frontmatter/invalid-format",
+                                  "frontmatter/invalid-yaml", "frontmatter/empty", "frontmatter/missing-field",
+                                  "frontmatter/empty-field", "frontmatter/name-format",
+                                  "frontmatter/short-description", "frontmatter/missing-when-to-use"))
     def validate_skill_md(self):
         """Validate SKILL.md file format and content."""
-        print("📄 Validating SKILL.md...")
+        self.log("📄 Validating SKILL.md...")
 
         skill_md = self.skill_path / "SKILL.md"
         if not skill_md.exists():
             return False
 
+        document = self.document
         try:
-            with open(skill_md, 'r', encoding='utf-8') as f:
-                content = f.read()
+            document.content
         except Exception as e:
-            self.add_error(f"Cannot read SKILL.md: {e}")
+            self.add_error(f"Cannot read SKILL.md: {e}", "frontmatter/unreadable", "SKILL.md")
             return False
 
         # Check for YAML frontmatter
-        if not content.startswith('---\n'):
-            self.add_error("SKILL.md missing YAML frontmatter (must start with '---')")
+        if not document.has_frontmatter:
+            self.add_error("SKILL.md missing YAML frontmatter (must start with '---')",
+                           "frontmatter/missing", "SKILL.md", 1)
             return False
 
         # Parse frontmatter
-        try:
-            # Extract frontmatter
-            parts = content.split('---\n', 2)
-            if len(parts) < 3:
-                self.add_error("Invalid YAML frontmatter format")
-                return False
-
-            frontmatter = yaml.safe_load(parts[1])
-            if not frontmatter:
-                self.add_error("Empty YAML frontmatter")
-                return False
-
-            self.skill_data = frontmatter
-            markdown_body = parts[2]
+        if document.parts is None:
+            self.add_error("Invalid YAML frontmatter format", "frontmatter/invalid-format", "SKILL.md", 1)
+            return False
 
+        try:
+            frontmatter = document.frontmatter
         except yaml.YAMLError as e:
-            self.add_error(f"Invalid YAML in frontmatter: {e}")
+            mark = getattr(e, 'problem_mark', None)
+            line = mark.line + 2 if mark is not None else 1
+            self.add_error(f"Invalid YAML in frontmatter: {e}", "frontmatter/invalid-yaml", "SKILL.md", line)
+            return False
+
+        if not frontmatter:
+            self.add_error("Empty YAML frontmatter", "frontmatter/empty", "SKILL.md", 1)
             return False
 
+        self.skill_data = frontmatter
+
         # Validate required frontmatter fields
         required_fields = ['name', 'description']
         for field in required_fields:
             if field not in frontmatter:
-                self.add_error(f"Missing required field in frontmatter: {field}")
+                self.add_error(f"Missing required field in frontmatter: {field}",
+                               "frontmatter/missing-field", "SKILL.md", 1)
             elif not frontmatter[field] or not str(frontmatter[field]).strip():
-                self.add_error(f"Empty required field in frontmatter: {field}")
+                self.add_error(f"Empty required field in frontmatter: {field}",
+                               "frontmatter/empty-field", "SKILL.md", document.frontmatter_line(field))
 
         # Validate name format
         if 'name' in frontmatter:
             name = frontmatter['name']
-            if not re.match(r'^[a-z0-9-]+$', name):
-                self.add_error("Skill name must be lowercase letters, numbers, and hyphens only")
+            if not SKILL_NAME_PATTERN.match(name):
+                self.add_error("Skill name must be lowercase letters, numbers, and hyphens only",
+                               "frontmatter/name-format", "SKILL.md", document.frontmatter_line('name'))
 
         # Validate description completeness
         if 'description' in frontmatter:
             desc = frontmatter['description']
+            desc_line = document.frontmatter_line('description')
             if len(desc) < 50:
-                self.add_warning("Description is quite short (less than 50 characters)")
+                self.add_warning("Description is quite short (less than 50 characters)",
+                                 "frontmatter/short-description", "SKILL.md", desc_line)
             if 'use when' not in desc.lower() and 'when to' not in desc.lower():
-                self.add_warning("Description should include 'when to use' information")
-
-        # Check markdown body content
-        self.validate_markdown_structure(markdown_body)
+                self.add_warning("Description should include 'when to use' information",
+                                 "frontmatter/missing-when-to-use", "SKILL.md", desc_line)
 
         return len(self.errors) == 0
 
-    def validate_markdown_structure(self, markdown_body):
+    @BUILTIN_RULES.rule("markdown", requires=("frontmatter", "body"),
+                        description="Recommended sections, interactive options and leftover placeholders",
+                        findings=("markdown/missing-section", "markdown/missing-options",
+                                  "markdown/missing-dependencies", "markdown/placeholder"))
+    def validate_markdown_structure(self):
         """Validate markdown body structure and content."""
+        # Only meaningful once the frontmatter parsed cleanly
+        if not self.artifact("frontmatter") or self.artifact("body") is None:
+            return
+
+        document = self.document
         required_sections = [
             "Overview",
             "Prerequisites",
@@ -125,165 +931,321 @@ class SkillValidator:
 
         # Check for required sections
         for section in required_sections:
-            if f"## {section}" not in markdown_body and f"#{section}" not in markdown_body:
-                self.add_warning(f"Missing recommended section: {section}")
+            if not document.has_section(section):
+                self.add_warning(f"Missing recommended section: {section}", "markdown/missing-section", "SKILL.md")
 
         # Check for Dependencies section (important for SLIM)
-        if "## Dependencies" not in markdown_body and "# Dependencies" not in markdown_body:
-            self.add_warning("Missing Dependencies section (recommended for SLIM skills)")
+        if not document.has_section("Dependencies"):
+            self.add_warning("Missing Dependencies section (recommended for SLIM skills)",
+                             "markdown/missing-dependencies", "SKILL.md")
 
         # Check for interactive elements
-        if "**Option A" not in markdown_body and "**Option B" not in markdown_body:
-            self.add_warning("Consider adding interactive user options for better AI experience")
+        if not document.has_options:
+            self.add_warning("Consider adding interactive user options for better AI experience",
+                             "markdown/missing-options", "SKILL.md")
 
         # Check for placeholder content
-        placeholder_patterns = [
-            r'\[INSERT[^\]]*\]',
-            r'\[PLACEHOLDER[^\]]*\]',
-            r'\[TODO[^\]]*\]'
-        ]
-
-        for pattern in placeholder_patterns:
-            matches = re.findall(pattern, markdown_body, re.IGNORECASE)
-            for match in matches:
-                self.add_warning(f"Found placeholder that needs replacement: {match}")
-
+        for placeholder, line in document.placeholders:
+            self.add_warning(f"Found placeholder that needs replacement: {placeholder}",
+                             "markdown/placeholder", "SKILL.md", line)
+
+    @BUILTIN_RULES.rule("dependencies", requires=("body",),
+                        description="Collect declared skill and MCP server dependencies",
+                        findings=("dependencies/missing-skill", "dependencies/missing-mcp-server",
+                                  "dependencies/cycle"))
+    def collect_dependencies(self):
+        """Record the skills and MCP servers this skill declares as required."""
+        if self.artifact("body") is not None:
+            self.dependencies = self.document.dependencies
+
+    @BUILTIN_RULES.rule("assets", requires=("assets",),
+                        description="Asset directory contents and size budgets",
+                        findings=("assets/missing-directory", "assets/not-a-directory", "assets/empty",
+                                  "assets/hidden-file", "assets/file-size-budget", "assets/total-size-budget",
+                                  "assets/file-count-budget"))
     def validate_assets(self):
         """Validate assets directory and files."""
-        print("📁 Validating assets...")
+        self.log("📁 Validating assets...")
 
         assets_dir = self.skill_path / "assets"
         if not assets_dir.exists():
-            self.add_warning("No assets directory found")
+            self.add_warning("No assets directory found", "assets/missing-directory")
             return
 
-        if not assets_dir.is_dir():
-            self.add_error("assets/ exists but is not a directory")
+        listing = self.artifact("assets")
+        if listing is None:
+            self.add_error("assets/ exists but is not a directory", "assets/not-a-directory", "assets")
             return
 
-        # Check for empty directory
-        asset_files = list(assets_dir.rglob('*'))
-        if not asset_files:
-            self.add_warning("assets/ directory is empty")
-            return
+        budgets = self.asset_budgets
+        max_file_bytes = budgets['max_file_mb'] * 1024 * 1024
+        max_total_bytes = budgets['max_total_mb'] * 1024 * 1024
 
-        # Validate individual files
-        for asset_file in asset_files:
-            if asset_file.is_file():
-                # Check file size (warn if very large)
-                size_mb = asset_file.stat().st_size / (1024 * 1024)
-                if size_mb > 10:
-                    self.add_warning(f"Large asset file: {asset_file.name} ({size_mb:.1f}MB)")
+        file_count = 0
+        total_bytes = 0
+        oversized = []
+        largest = []  # min-heap of the largest (size, path) pairs seen so far
 
-                # Check for common issues
-                if asset_file.name.startswith('.'):
-                    self.add_warning(f"Hidden file in assets: {asset_file.name}")
+        for rel_path, size in listing:
+            file_count += 1
+            total_bytes += size
 
+            if size > max_file_bytes:
+                oversized.append((size, rel_path))
+
+            if len(largest) < BUDGET_OFFENDERS_SHOWN:
+                heapq.heappush(largest, (size, rel_path))
+            elif size > largest[0][0]:
+                heapq.heapreplace(largest, (size, rel_path))
+
+            # Check for common issues
+            file_name = os.path.basename(rel_path)
+            if file_name.startswith('.'):
+                self.add_warning(f"Hidden file in assets: {file_name}", "assets/hidden-file", f"assets/{rel_path}")
+
+        # Check for empty directory
+        if file_count == 0:
+            self.add_warning("assets/ directory is empty", "assets/empty", "assets")
+            return
+
+        # Check per-skill budgets, reporting the largest offenders
+        if oversized:
+            top = heapq.nlargest(BUDGET_OFFENDERS_SHOWN, oversized)
+            self.add_warning(
+                f"{len(oversized)} asset file(s) exceed {format_size(max_file_bytes)}: "
+                f"{self.format_offenders(top, len(oversized))}",
+                "assets/file-size-budget", f"assets/{top[0][1]}"
+            )
+
+        if total_bytes > max_total_bytes:
+            top = sorted(largest, reverse=True)
+            self.add_warning(
+                f"Assets total {format_size(total_bytes)}, over the {format_size(max_total_bytes)} budget; "
+                f"largest: {self.format_offenders(top, file_count)}",
+                "assets/total-size-budget", "assets"
+            )
+
+        if file_count > budgets['max_files']:
+            self.add_warning(
+                f"assets/ contains {file_count} files, over the {budgets['max_files']} file budget",
+                "assets/file-count-budget", "assets"
+            )
+
+    @staticmethod
+    def format_offenders(offenders, total):
+        """Format (size, path) pairs, noting how many were left out."""
+        listed = ', '.join(f"{path} ({format_size(size)})" for size, path in offenders)
+        if total > len(offenders):
+            listed += f" +{total - len(offenders)} more"
+        return listed
+
+    @BUILTIN_RULES.rule("scripts", requires=("scripts",),
+                        description="Script syntax, entry points and importable dependencies",
+                        findings=("scripts/missing-directory", "scripts/not-a-directory", "scripts/no-python",
+                                  "scripts/unreadable", "scripts/syntax-error", "scripts/missing-shebang",
+                                  "scripts/missing-main", "scripts/missing-main-guard",
+                                  "scripts/unavailable-import"))
     def validate_scripts(self):
         """Validate scripts directory and files."""
-        print("🐍 Validating scripts...")
+        self.log("🐍 Validating scripts...")
 
         scripts_dir = self.skill_path / "scripts"
         if not scripts_dir.exists():
-            self.add_warning("No scripts directory found")
+            self.add_warning("No scripts directory found", "scripts/missing-directory")
             return
 
-        if not scripts_dir.is_dir():
-            self.add_error("scripts/ exists but is not a directory")
+        scripts = self.artifact("scripts")
+        if scripts is None:
+            self.add_error("scripts/ exists but is not a directory", "scripts/not-a-directory", "scripts")
             return
 
-        # Check for Python files
-        python_files = list(scripts_dir.glob('*.py'))
-        if not python_files:
-            self.add_warning("No Python scripts found in scripts/")
+        # Check for Python files anywhere under scripts/
+        if not scripts:
+            self.add_warning("No Python scripts found in scripts/", "scripts/no-python", "scripts")
             return
 
-        # Basic validation of Python scripts
-        for py_file in python_files:
+        for py_file, analysis in scripts:
+            rel_path = Path(os.path.relpath(py_file, scripts_dir)).as_posix()
+            script_file = f"scripts/{rel_path}"
+
+            if isinstance(analysis, Exception):
+                self.add_warning(f"Cannot validate script {rel_path}: {analysis}", "scripts/unreadable", script_file)
+                continue
+
+            syntax_error = analysis['syntax_error']
+            if syntax_error:
+                self.add_error(f"Script has a syntax error: {rel_path}: {syntax_error['message']}",
+                               "scripts/syntax-error", script_file, syntax_error['line'])
+                continue
+
+            # Top-level scripts, and nested ones with a shebang, are entry points
+            if '/' not in rel_path or analysis['shebang']:
+                if not analysis['shebang']:
+                    self.add_warning(f"Script missing shebang: {rel_path}", "scripts/missing-shebang", script_file, 1)
+
+                if not analysis['main']:
+                    self.add_warning(f"Script missing main() function: {rel_path}", "scripts/missing-main", script_file)
+
+                if not analysis['main_guard']:
+                    self.add_warning(f"Script missing main guard: {rel_path}", "scripts/missing-main-guard", script_file)
+
+            # Imports guarded by try/except ImportError are optional
+            search_dirs = (os.path.dirname(py_file), str(scripts_dir))
+            reported = set()
+            for module, line, optional in analysis['imports']:
+                if optional or module in reported or module_available(module, search_dirs):
+                    continue
+                reported.add(module)
+                self.add_warning(f"Script imports unavailable module '{module}': {rel_path}",
+                                 "scripts/unavailable-import", script_file, line)
+
+    def analyze_scripts(self, python_files):
+        """Analyze scripts with ast, reusing cached analyses by content hash.
+
+        Returns one analysis dict (or the read error) per file. Cache misses
+        are parsed in a process pool when there are enough of them.
+        """
+        analyses = [None] * len(python_files)
+        pending = []
+
+        for index, py_file in enumerate(python_files):
             try:
-                with open(py_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
+                with open(py_file, 'rb') as f:
+                    source = f.read()
+            except OSError as e:
+                analyses[index] = e
+                continue
+
+            digest = hashlib.sha256(source).hexdigest()
+            cached = self.cache.get_script(digest) if self.cache is not None else None
+            if cached is not None:
+                analyses[index] = cached
+            else:
+                pending.append((index, digest, source))
 
-                # Check for shebang
-                if not content.startswith('#!/usr/bin/env python'):
-                    self.add_warning(f"Script missing shebang: {py_file.name}")
+        if len(pending) >= PARALLEL_SCRIPT_THRESHOLD and self.script_workers != 1:
+            with ProcessPoolExecutor(max_workers=self.script_workers) as executor:
+                parsed = list(executor.map(analyze_script, [source for _, _, source in pending],
+                                           chunksize=8))
+        else:
+            parsed = [analyze_script(source) for _, _, source in pending]
 
-                # Check for basic structure
-                if 'def main(' not in content:
-                    self.add_warning(f"Script missing main() function: {py_file.name}")
+        for (index, digest, _), analysis in zip(pending, parsed):
+            analyses[index] = analysis
+            self.script_analyses[digest] = analysis
 
-                if '__name__ == "__main__"' not in content:
-                    self.add_warning(f"Script missing main guard: {py_file.name}")
+        if self.cache is not None:
+            self.cache.put_scripts(self.script_analyses)
 
-            except Exception as e:
-                self.add_warning(f"Cannot validate script {py_file.name}: {e}")
+        return analyses
 
+    @BUILTIN_RULES.rule("references", description="Asset and script paths mentioned in SKILL.md exist",
+                        findings=("references/missing-asset", "references/missing-script"))
     def validate_file_references(self):
         """Validate that referenced files actually exist."""
-        print("🔗 Validating file references...")
+        self.log("🔗 Validating file references...")
 
         skill_md = self.skill_path / "SKILL.md"
         if not skill_md.exists():
             return
 
         try:
-            with open(skill_md, 'r', encoding='utf-8') as f:
-                content = f.read()
+            self.document.content
         except Exception:
             return
 
-        # Find references to assets and scripts
-        asset_refs = re.findall(r'assets/([^\s\)]+)', content)
-        script_refs = re.findall(r'scripts/([^\s\)]+)', content)
-
         # Check asset references
-        for asset_ref in asset_refs:
+        for asset_ref, line in self.document.asset_refs:
             asset_path = self.skill_path / "assets" / asset_ref
             if not asset_path.exists():
-                self.add_error(f"Referenced asset does not exist: assets/{asset_ref}")
+                self.add_error(f"Referenced asset does not exist: assets/{asset_ref}",
+                               "references/missing-asset", "SKILL.md", line)
 
         # Check script references
-        for script_ref in script_refs:
+        for script_ref, line in self.document.script_refs:
             script_path = self.skill_path / "scripts" / script_ref
             if not script_path.exists():
-                self.add_error(f"Referenced script does not exist: scripts/{script_ref}")
+                self.add_error(f"Referenced script does not exist: scripts/{script_ref}",
+                               "references/missing-script", "SKILL.md", line)
 
+    @BUILTIN_RULES.rule("naming", requires=("frontmatter",),
+                        description="Directory name format and match with the frontmatter name",
+                        findings=("naming/directory-name", "naming/name-mismatch"))
     def validate_naming_conventions(self):
         """Validate naming conventions."""
-        print("📝 Validating naming conventions...")
+        self.log("📝 Validating naming conventions...")
 
         skill_name = self.skill_path.name
+        frontmatter = self.artifact("frontmatter")
+        skill_data = frontmatter if isinstance(frontmatter, dict) else {}
 
         # Check directory name
-        if not re.match(r'^[a-z0-9-]+$', skill_name):
-            self.add_error("Skill directory name must be lowercase letters, numbers, and hyphens only")
+        if not SKILL_NAME_PATTERN.match(skill_name):
+            self.add_error("Skill directory name must be lowercase letters, numbers, and hyphens only",
+                           "naming/directory-name")
 
         # Check consistency with SKILL.md name field
-        if 'name' in self.skill_data:
-            if self.skill_data['name'] != skill_name:
-                self.add_error(f"Directory name '{skill_name}' doesn't match SKILL.md name '{self.skill_data['name']}'")
+        if 'name' in skill_data:
+            if skill_data['name'] != skill_name:
+                self.add_error(f"Directory name '{skill_name}' doesn't match SKILL.md name '{skill_data['name']}'",
+                               "naming/name-mismatch", "SKILL.md", self.document.frontmatter_line('name'))
 
     def run_validation(self):
         """Run complete skill validation."""
-        print(f"🔍 Validating skill: {self.skill_path.name}")
-        print("=" * 60)
-
-        validation_steps = [
-            self.validate_directory_structure,
-            self.validate_skill_md,
-            self.validate_assets,
-            self.validate_scripts,
-            self.validate_file_references,
-            self.validate_naming_conventions
-        ]
-
-        for step in validation_steps:
-            try:
-                step()
-            except Exception as e:
-                self.add_error(f"Validation step failed: {e}")
-
-        # Report results
+        self.log(f"🔍 Validating skill: {self.skill_path.name}")
+        self.log("=" * 60)
+
+        if self.cache is not None:
+            self.fingerprint = skill_fingerprint(self.skill_path, self.settings_key())
+            cached = self.cache.get(self.skill_path, self.fingerprint)
+            if cached is not None:
+                self.findings = [dict(finding) for finding in cached['findings']]
+                self.dependencies = cached['dependencies']
+                self.from_cache = True
+                self.log("♻️  Skill unchanged, replaying cached results")
+                return self.finish()
+
+        # Load each artifact an enabled rule declares exactly once, up front,
+        # so per-rule timings measure the checks rather than the I/O
+        for artifact in self.rule_set.artifacts:
+            self.timed('artifact', artifact, self.artifact, artifact)
+
+        for rule in self.rule_set.rules:
+            self.timed('rule', rule.id, rule.func, self)
+
+        if self.cache is not None:
+            self.cache.put(self.skill_path, self.fingerprint, self.findings, self.dependencies)
+
+        return self.finish()
+
+    def timed(self, kind, name, func, *args):
+        """Run func, recording its wall-clock and CPU time; failures become findings."""
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        try:
+            func(*args)
+        except Exception as e:
+            self.add_error(f"Validation step failed: {e}", "validator/rule-failed")
+        self.timings.append({
+            'step': name,
+            'kind': kind,
+            'wall_ms': round((time.perf_counter() - wall_start) * 1000, 3),
+            'cpu_ms': round((time.process_time() - cpu_start) * 1000, 3)
+        })
+
+    def finish(self):
+        """Report results (unless quiet) and return whether the skill is valid."""
+        # Depends on other skills, so never cached with this skill's findings
+        if self.sibling_dependencies:
+            check_skill_dependencies(self.result(), self.rule_set)
+
+        if self.quiet:
+            return len(self.errors) == 0
+
+        return self.print_report()
+
+    def print_report(self):
+        """Print validation results and return whether the skill is valid."""
         print("\n" + "=" * 60)
         print("📊 Validation Results")
         print("=" * 60)
@@ -316,21 +1278,1041 @@ class SkillValidator:
             print(f"\n❌ Skill validation failed with {error_count} error(s) and {warning_count} warning(s)")
             return False
 
+def find_skill_dirs(skills_root):
+    """Find every skill directory directly under the skills root."""
+    skills_root = Path(skills_root)
+    return sorted(p for p in skills_root.iterdir()
+                  if p.is_dir() and not p.name.startswith('.'))
+
+# Read-only copies of the validation cache and validator options inside each pool worker.
+_worker_cache = None
+_worker_options = {}
+
+def init_worker(cache, options):
+    """Process pool initializer: share the loaded cache and options once per worker."""
+    global _worker_cache, _worker_options
+    _worker_cache = cache
+    _worker_options = options
+
+def validate_skill_worker(skill_path):
+    """Validate a single skill quietly; used as the process pool task."""
+    # Skills already run in parallel here, so parse each skill's scripts serially
+    options = {**_worker_options, 'script_workers': 1}
+    validator = SkillValidator(skill_path, quiet=True, cache=_worker_cache, **options)
+    validator.run_validation()
+    return validator.result()
+
+def is_result_valid(result, strict=False):
+    """Check a validation result, optionally treating warnings as errors."""
+    if strict:
+        return not result['findings']
+    return result['valid']
+
+def run_all(skill_dirs, workers=None, cache=None, options=None):
+    """Validate skill directories across a process pool and return their results."""
+    options = options or {}
+    if workers == 1:
+        init_worker(cache, options)
+        results = [validate_skill_worker(skill_dir) for skill_dir in skill_dirs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                                 initargs=(cache, options)) as executor:
+            results = list(executor.map(validate_skill_worker, skill_dirs))
+
+    # Workers only hold a copy of the cache; record fresh results here
+    if cache is not None:
+        for result in results:
+            cache.put_scripts(result['script_analyses'])
+            if not result['cached']:
+                cache.put(result['path'], result['fingerprint'], result['findings'],
+                          result['dependencies'])
+
+    return results
+
+class DependencyGraph:
+    """Cross-skill dependency graph built once per run from every skill's results."""
+
+    def __init__(self, results, mcp_servers=()):
+        self.results = {result['name']: result for result in results}
+        self.mcp_servers = set(mcp_servers)
+        self.edges = {}
+        self.edge_lines = {}
+        for name, result in self.results.items():
+            targets = []
+            for dep, line in result['dependencies']['skills']:
+                if dep not in self.edge_lines.setdefault(name, {}):
+                    self.edge_lines[name][dep] = line
+                    targets.append(dep)
+            self.edges[name] = targets
+
+    def missing_skills(self):
+        """Yield (skill, dependency, line) for required skills not in the marketplace."""
+        for name, targets in self.edges.items():
+            for dep in targets:
+                if dep not in self.results:
+                    yield name, dep, self.edge_lines[name][dep]
+
+    def missing_mcp_servers(self):
+        """Yield (skill, server, line) for required MCP servers not in the marketplace."""
+        for name, result in self.results.items():
+            for server, line in result['dependencies']['mcp_servers']:
+                if server not in self.mcp_servers:
+                    yield name, server, line
+
+    def strongly_connected(self):
+        """Tarjan's algorithm (iterative) over edges between known skills."""
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        counter = 0
+
+        for root in sorted(self.edges):
+            if root in index:
+                continue
+            work = [(root, iter(self.edges[root]))]
+            index[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+
+            while work:
+                node, targets = work[-1]
+                advanced = False
+                for target in targets:
+                    if target not in self.edges:
+                        continue
+                    if target not in index:
+                        index[target] = lowlink[target] = counter
+                        counter += 1
+                        stack.append(target)
+                        on_stack.add(target)
+                        work.append((target, iter(self.edges[target])))
+                        advanced = True
+                        break
+                    if target in on_stack:
+                        lowlink[node] = min(lowlink[node], index[target])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def cycles(self):
+        """Return one representative cycle path (first node repeated at the end) per cycle."""
+        cycles = []
+        for component in self.strongly_connected():
+            members = set(component)
+            start = min(component)
+            if len(component) == 1 and start not in self.edges[start]:
+                continue
+
+            # Breadth-first search inside the component for a path back to start
+            previous = {start: None}
+            queue = [start]
+            path = None
+            while queue and path is None:
+                node = queue.pop(0)
+                for target in self.edges[node]:
+                    if target == start:
+                        path = [node]
+                        while previous[path[-1]] is not None:
+                            path.append(previous[path[-1]])
+                        path.reverse()
+                        break
+                    if target in members and target not in previous:
+                        previous[target] = node
+                        queue.append(target)
+            cycles.append(path + [start])
+        return cycles
+
+    def install_order(self):
+        """Topologically order skills so dependencies install first.
+
+        Skills caught in (or depending on) a cycle cannot be ordered and are
+        returned separately.
+        """
+        dependents = {name: [] for name in self.edges}
+        remaining = {}
+        for name, targets in self.edges.items():
+            known = [dep for dep in targets if dep in self.edges]
+            remaining[name] = len(known)
+            for dep in known:
+                dependents[dep].append(name)
+
+        ready = [name for name, count in remaining.items() if count == 0]
+        heapq.heapify(ready)
+        order = []
+        while ready:
+            name = heapq.heappop(ready)
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    heapq.heappush(ready, dependent)
+
+        blocked = sorted(name for name, count in remaining.items() if count > 0)
+        return order, blocked
+
+    def connected_skills(self):
+        """Skills that declare or are the target of at least one dependency."""
+        names = set()
+        for name, targets in self.edges.items():
+            if targets:
+                names.add(name)
+                names.update(dep for dep in targets if dep in self.edges)
+        return names
+
+    def to_dict(self):
+        order, blocked = self.install_order()
+        return {
+            'edges': {name: targets for name, targets in self.edges.items() if targets},
+            'installOrder': order,
+            'blocked': blocked,
+            'cycles': self.cycles()
+        }
+
+def find_mcp_servers(skills_root):
+    """Names of MCP servers shipped next to the skills directory or listed in registry.json."""
+    skills_root = Path(skills_root)
+    servers = set()
+    mcp_root = skills_root.parent / "mcp-servers"
+    if mcp_root.is_dir():
+        servers.update(p.name for p in mcp_root.iterdir() if p.is_dir() and not p.name.startswith('.'))
+
+    # static/data/registry.json sits beside static/marketplace/skills; it also lists external servers
+    registry_path = skills_root.resolve().parent.parent / "data" / "registry.json"
+    try:
+        with open(registry_path, 'r', encoding='utf-8') as f:
+            registry_data = json.load(f)
+    except (OSError, ValueError):
+        return servers
+    if not isinstance(registry_data, dict):
+        return servers
+    for entries in registry_data.values():
+        if isinstance(entries, list):
+            servers.update(entry['name'] for entry in entries
+                           if isinstance(entry, dict) and entry.get('type') == 'mcp' and entry.get('name'))
+    return servers
+
+def check_dependencies(results, skills_root, rule_set=None):
+    """Resolve declared dependencies across all skills and add findings for problems.
+
+    Findings the rule set suppresses are dropped, and nothing is reported
+    when its `dependencies` rule is disabled.
+    """
+    # Replace findings from an earlier pass over the same results (--watch)
+    for result in results:
+        result['findings'][:] = [f for f in result['findings'] if not f['rule'].startswith("dependencies/")]
+
+    graph = DependencyGraph(results, find_mcp_servers(skills_root))
+    if rule_set is not None and not any(rule.id == "dependencies" for rule in rule_set.rules):
+        return graph
+
+    def add(name, severity, rule, message, line):
+        if rule_set is not None and rule_set.is_suppressed(rule):
+            return
+        graph.results[name]['findings'].append({
+            'rule': rule,
+            'severity': severity,
+            'message': message,
+            'file': "SKILL.md",
+            'line': line
+        })
+
+    for name, dep, line in graph.missing_skills():
+        add(name, 'error', "dependencies/missing-skill",
+            f"Required skill not found in marketplace: {dep}", line)
+
+    for name, server, line in graph.missing_mcp_servers():
+        add(name, 'warning', "dependencies/missing-mcp-server",
+            f"Required MCP server not found in marketplace: {server}", line)
+
+    for cycle in graph.cycles():
+        description = ' -> '.join(cycle)
+        for name, dep in zip(cycle, cycle[1:]):
+            add(name, 'error', "dependencies/cycle",
+                f"Dependency cycle: {description}", graph.edge_lines[name][dep])
+
+    for result in results:
+        result['valid'] = not any(f['severity'] == 'error' for f in result['findings'])
+
+    return graph
+
+def sibling_results(skills_root, skill_path):
+    """Name and declared dependencies of the other skills under skills_root, read from SKILL.md only."""
+    results = []
+    for skill_dir in find_skill_dirs(skills_root):
+        if skill_dir.resolve() == Path(skill_path).resolve():
+            continue
+        try:
+            dependencies = SkillDocument(skill_dir / "SKILL.md").dependencies
+        except (OSError, UnicodeDecodeError):
+            dependencies = {'skills': [], 'mcp_servers': []}
+        results.append({'name': skill_dir.name, 'findings': [], 'dependencies': dependencies})
+    return results
+
+def check_skill_dependencies(result, rule_set=None):
+    """Resolve one skill's dependencies against the other skills in its parent directory.
+
+    Returns the graph, or None for a skill outside a skills root (no siblings).
+    """
+    skill_path = Path(result['path'])
+    others = sibling_results(skill_path.parent, skill_path)
+    if not others:
+        return None
+    return check_dependencies([result] + others, skill_path.parent, rule_set)
+
+def print_install_order(graph):
+    """Print the dependency-first install order for skills with dependencies."""
+    order, blocked = graph.install_order()
+    connected = graph.connected_skills()
+
+    print("\n📦 Install Order (dependencies first):")
+    ordered = [name for name in order if name in connected]
+    for i, name in enumerate(ordered, 1):
+        print(f"  {i}. {name}")
+    if blocked:
+        print(f"  ⛔ Blocked by dependency cycles: {', '.join(blocked)}")
+    independent = len(order) - len(ordered)
+    if independent:
+        print(f"  {independent} skill(s) without dependencies can be installed in any order")
+
+def rule_profile(results):
+    """Aggregate rule and artifact timings across results, slowest first."""
+    profile = {}
+    for result in results:
+        for timing in result['timings']:
+            key = (timing.get('kind', 'rule'), timing['step'])
+            entry = profile.setdefault(key, {'kind': key[0], 'name': key[1], 'calls': 0,
+                                             'wall_ms': 0.0, 'cpu_ms': 0.0})
+            entry['calls'] += 1
+            entry['wall_ms'] += timing['wall_ms']
+            entry['cpu_ms'] += timing['cpu_ms']
+
+    for entry in profile.values():
+        entry['wall_ms'] = round(entry['wall_ms'], 3)
+        entry['cpu_ms'] = round(entry['cpu_ms'], 3)
+    return sorted(profile.values(), key=lambda entry: entry['wall_ms'], reverse=True)
+
+def print_rule_profile(results):
+    """Print the per-rule timing table for --profile-rules."""
+    profile = rule_profile(results)
+    replayed = sum(1 for result in results if result['cached'])
+
+    print("\n⏱️  Rule Profile")
+    print("=" * 60)
+    if not profile:
+        print("  No rules ran (all results replayed from cache)")
+        return
+
+    print(f"  {'rule':<28} {'calls':>6} {'wall ms':>11} {'cpu ms':>11}")
+    for entry in profile:
+        label = entry['name'] if entry['kind'] == 'rule' else f"[load {entry['name']}]"
+        print(f"  {label:<28} {entry['calls']:>6} {entry['wall_ms']:>11.3f} {entry['cpu_ms']:>11.3f}")
+    if replayed:
+        print(f"  ({replayed} skill(s) replayed from cache are not included)")
+
+def list_rules(rule_set):
+    """Print every registered rule with its status and declared artifacts."""
+    enabled = {rule.id for rule in rule_set.rules}
+    print("📋 Validation rules")
+    print("=" * 60)
+    for rule_id, rule in rule_set.registry.rules.items():
+        status = "✅" if rule_id in enabled else "⏸️ "
+        requires = f" [needs: {', '.join(rule.requires)}]" if rule.requires else ""
+        print(f"  {status} {rule_id}: {rule.description}{requires}")
+    if rule_set.suppressed:
+        print(f"\n  Suppressed findings: {', '.join(sorted(rule_set.suppressed))}")
+
+def hash_asset(path):
+    """Return the sha256 hex digest of a file, or None if it cannot be read."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+def deflated_size(path):
+    """Size of a file after deflate at zip's default level, i.e. what it adds to a skill zip."""
+    compressor = zlib.compressobj(6, zlib.DEFLATED, -zlib.MAX_WBITS)
+    total = 0
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            total += len(compressor.compress(chunk))
+    return total + len(compressor.flush())
+
+def find_duplicate_assets(skills_root, workers=None):
+    """Find byte-identical files across every skill's assets directory.
+
+    Files are first bucketed by size, so only files sharing a size with
+    another file are hashed; those are hashed in one pass across a process
+    pool. Symlinked files are already shared and are not counted.
+    """
+    skills_root = Path(skills_root)
+    by_size = {}
+    scanned = 0
+    linked = 0
+
+    for skill_dir in find_skill_dirs(skills_root):
+        assets_dir = skill_dir / "assets"
+        if not assets_dir.is_dir():
+            continue
+        for entry in iter_files(assets_dir):
+            if entry.is_symlink():
+                linked += 1
+                continue
+            scanned += 1
+            size = entry.stat().st_size
+            if size:
+                by_size.setdefault(size, []).append(entry.path)
+
+    candidates = sorted(path for paths in by_size.values() if len(paths) > 1 for path in paths)
+    if len(candidates) >= PARALLEL_HASH_THRESHOLD and workers != 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            digests = list(executor.map(hash_asset, candidates, chunksize=16))
+    else:
+        digests = [hash_asset(path) for path in candidates]
+
+    by_digest = {}
+    for path, digest in zip(candidates, digests):
+        if digest is not None:
+            by_digest.setdefault(digest, []).append(path)
+
+    groups = []
+    for digest, paths in by_digest.items():
+        if len(paths) < 2:
+            continue
+        size = os.path.getsize(paths[0])
+        zip_size = deflated_size(paths[0])
+        files = [os.path.relpath(path, skills_root) for path in paths]
+        groups.append({
+            'sha256': digest,
+            'size': size,
+            'zip_size': zip_size,
+            'files': files,
+            'skills': sorted({Path(file).parts[0] for file in files}),
+            'wasted_bytes': size * (len(paths) - 1),
+            'wasted_zip_bytes': zip_size * (len(paths) - 1)
+        })
+    groups.sort(key=lambda group: (-group['wasted_bytes'], group['files'][0]))
+
+    return {
+        'skills_root': str(skills_root),
+        'files_scanned': scanned,
+        'files_hashed': len(candidates),
+        'symlinked_files': linked,
+        'groups': groups,
+        'wasted_bytes': sum(group['wasted_bytes'] for group in groups),
+        'wasted_zip_bytes': sum(group['wasted_zip_bytes'] for group in groups)
+    }
+
+def link_duplicate_assets(report):
+    """Replace every duplicate but the first in each group with a relative symlink to it.
+
+    zip -r follows symlinks, so skill archives still contain real files.
+    Returns the number of files replaced.
+    """
+    skills_root = Path(report['skills_root'])
+    replaced = 0
+    for group in report['groups']:
+        canonical = skills_root / group['files'][0]
+        for file in group['files'][1:]:
+            duplicate = skills_root / file
+            target = os.path.relpath(canonical, duplicate.parent)
+            temp_link = duplicate.with_name(f".{duplicate.name}.link")
+            os.symlink(target, temp_link)
+            os.replace(temp_link, duplicate)
+            replaced += 1
+    return replaced
+
+def print_duplicate_report(report):
+    """Print duplicate asset groups and the space they waste."""
+    groups = report['groups']
+    print(f"\n🧬 Duplicate Assets under: {report['skills_root']}")
+    print("=" * 60)
+    print(f"  Files scanned: {report['files_scanned']} ({report['files_hashed']} hashed after size filter)")
+    if report['symlinked_files']:
+        print(f"  Already shared via symlink: {report['symlinked_files']}")
+
+    if not groups:
+        print("\n✅ No duplicate assets found")
+        return
+
+    for group in groups:
+        print(f"\n  {len(group['files'])} copies of {format_size(group['size'])} "
+              f"(wastes {format_size(group['wasted_bytes'])}, "
+              f"{format_size(group['wasted_zip_bytes'])} in zips) sha256:{group['sha256'][:12]}")
+        for file in group['files']:
+            print(f"    - {file}")
+
+    print(f"\n📊 {len(groups)} duplicate group(s) across "
+          f"{len({skill for group in groups for skill in group['skills']})} skill(s)")
+    print(f"  Wasted on disk: {format_size(report['wasted_bytes'])}")
+    print(f"  Wasted in skill zips (deflated): {format_size(report['wasted_zip_bytes'])}")
+
+def validate_all(skills_root, workers=None, strict=False, cache=None, options=None,
+                 output_format="text", profile=False):
+    """Validate every skill under skills_root in parallel and print one merged report."""
+    options = options or {}
+    rule_set = load_rule_set(options.get('rules_config'))
+    skill_dirs = find_skill_dirs(skills_root)
+    if not skill_dirs:
+        print(f"❌ No skill directories found under: {skills_root}", file=sys.stderr)
+        return False
+
+    if output_format != "text":
+        results = run_all(skill_dirs, workers, cache, options)
+        graph = check_dependencies(results, skills_root, rule_set)
+        print_structured_report(results, output_format, strict, graph, profile)
+        return all(is_result_valid(result, strict) for result in results)
+
+    print(f"🔍 Validating {len(skill_dirs)} skills under: {skills_root}")
+    print("=" * 60)
+
+    results = run_all(skill_dirs, workers, cache, options)
+    graph = check_dependencies(results, skills_root, rule_set)
+
+    failed = []
+    total_errors = 0
+    total_warnings = 0
+    cached_count = 0
+
+    for result in results:
+        if result['cached']:
+            cached_count += 1
+
+        total_errors += sum(1 for f in result['findings'] if f['severity'] == 'error')
+        total_warnings += sum(1 for f in result['findings'] if f['severity'] == 'warning')
+        if not is_result_valid(result, strict):
+            failed.append(result['name'])
+
+        print()
+        print_skill_result(result, strict)
+
+    print_install_order(graph)
+
+    # Summary
+    print("\n" + "=" * 60)
+    print("📊 Marketplace Validation Results")
+    print("=" * 60)
+    print(f"  Skills validated: {len(results)}")
+    if cache is not None:
+        print(f"  Replayed from cache: {cached_count}")
+    print(f"  Total errors: {total_errors}")
+    print(f"  Total warnings: {total_warnings}")
+
+    if strict and total_warnings:
+        print("\n🚫 Strict mode: treating warnings as errors")
+
+    if profile:
+        print_rule_profile(results)
+
+    if failed:
+        print(f"\n❌ {len(failed)} of {len(results)} skill(s) failed validation: {', '.join(failed)}")
+        return False
+
+    print(f"\n✅ All {len(results)} skills are valid")
+    return True
+
+def print_skill_result(result, strict=False, suffix=""):
+    """Print one skill's status line followed by its findings."""
+    errors = format_findings(result['findings'], 'error')
+    warnings = format_findings(result['findings'], 'warning')
+    status = "✅" if is_result_valid(result, strict) else "❌"
+    print(f"{status} {result['name']} ({len(errors)} error(s), {len(warnings)} warning(s)){suffix}")
+    for error in errors:
+        print(f"  {error}")
+    for warning in warnings:
+        print(f"  {warning}")
+
+def finding_uri(result, finding):
+    """Path of the file a finding refers to, relative to the working directory."""
+    if finding['file']:
+        return f"{result['path']}/{finding['file']}"
+    return result['path']
+
+def build_json_report(results, strict=False, graph=None):
+    """Build the JSON report: per-skill findings and step timings plus a summary."""
+    findings = [f for result in results for f in result['findings']]
+    report = {
+        'tool': TOOL_NAME,
+        'rulesVersion': RULES_VERSION,
+        'valid': all(is_result_valid(result, strict) for result in results),
+        'summary': {
+            'skills': len(results),
+            'errors': sum(1 for f in findings if f['severity'] == 'error'),
+            'warnings': sum(1 for f in findings if f['severity'] == 'warning'),
+            'cached': sum(1 for result in results if result['cached']),
+            'failed': [result['name'] for result in results
+                       if not is_result_valid(result, strict)]
+        },
+        'skills': [
+            {
+                'name': result['name'],
+                'path': result['path'],
+                'valid': is_result_valid(result, strict),
+                'cached': result['cached'],
+                'findings': result['findings'],
+                'timings': result['timings']
+            }
+            for result in results
+        ]
+    }
+    if graph is not None:
+        report['dependencies'] = graph.to_dict()
+    return report
+
+def build_sarif_report(results, graph=None):
+    """Build a SARIF 2.1.0 log with one result per finding."""
+    rule_ids = sorted({f['rule'] for result in results for f in result['findings']})
+    rule_index = {rule_id: index for index, rule_id in enumerate(rule_ids)}
+    sarif_results = []
+
+    for result in results:
+        for finding in result['findings']:
+            location = {'artifactLocation': {'uri': finding_uri(result, finding)}}
+            if finding['line']:
+                location['region'] = {'startLine': finding['line']}
+            sarif_results.append({
+                'ruleId': finding['rule'],
+                'ruleIndex': rule_index[finding['rule']],
+                'level': finding['severity'],
+                'message': {'text': finding['message']},
+                'locations': [{'physicalLocation': location}]
+            })
+
+    sarif = {
+        '$schema': SARIF_SCHEMA,
+        'version': "2.1.0",
+        'runs': [{
+            'tool': {
+                'driver': {
+                    'name': TOOL_NAME,
+                    'version': RULES_VERSION,
+                    'rules': [{'id': rule_id} for rule_id in rule_ids]
+                }
+            },
+            'invocations': [{
+                'executionSuccessful': True,
+                'properties': {
+                    'stepTimings': {result['name']: result['timings'] for result in results}
+                }
+            }],
+            'results': sarif_results
+        }]
+    }
+    if graph is not None:
+        sarif['runs'][0]['invocations'][0]['properties']['dependencies'] = graph.to_dict()
+    return sarif
+
+def print_structured_report(results, output_format, strict=False, graph=None, profile=False):
+    """Print results as JSON or SARIF."""
+    if output_format == "sarif":
+        report = build_sarif_report(results, graph)
+        if profile:
+            report['runs'][0]['invocations'][0]['properties']['ruleProfile'] = rule_profile(results)
+    else:
+        report = build_json_report(results, strict, graph)
+        if profile:
+            report['ruleProfile'] = rule_profile(results)
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+
+# inotify event flags (see inotify(7))
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+
+INOTIFY_EVENT = struct.Struct('iIII')
+
+class InotifyWatcher:
+    """Recursive directory watcher using Linux inotify through ctypes."""
+
+    EVENT_MASK = (IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+                  IN_CREATE | IN_DELETE | IN_DELETE_SELF | IN_MOVE_SELF)
+
+    def __init__(self, root):
+        self.root = str(root)
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(self.libc, 'inotify_init1'):
+            raise OSError("inotify is not available on this platform")
+
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self.watches = {}
+        self.add_tree(self.root)
+
+    def add_tree(self, path):
+        """Watch a directory and every directory below it."""
+        for dir_path, dir_names, _ in os.walk(path):
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dir_path), self.EVENT_MASK)
+            if wd >= 0:
+                self.watches[wd] = dir_path
+
+    def wait(self, timeout=None):
+        """Block up to timeout seconds and return the set of changed paths."""
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return set()
+
+        changed = set()
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_len = INOTIFY_EVENT.unpack_from(data, offset)
+                offset += INOTIFY_EVENT.size
+                name = os.fsdecode(data[offset:offset + name_len].rstrip(b'\0'))
+                offset += name_len
+
+                if mask & IN_Q_OVERFLOW:
+                    # Events were dropped; treat the whole tree as changed
+                    changed.add(self.root)
+                    continue
+
+                dir_path = self.watches.get(wd)
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                if dir_path is None:
+                    continue
+
+                path = os.path.join(dir_path, name) if name else dir_path
+                changed.add(path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    self.add_tree(path)
+
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Portable fallback watcher that rescans file sizes and mtimes."""
+
+    def __init__(self, root, interval=0.5):
+        self.root = str(root)
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for entry in iter_files(self.root):
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            snapshot[entry.path] = (st.st_size, st.st_mtime_ns)
+        return snapshot
+
+    def wait(self, timeout=None):
+        """Poll until something changes or timeout seconds pass."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, max(0, deadline - time.monotonic()))
+            time.sleep(delay)
+
+            snapshot = self.scan()
+            changed = {path for path in snapshot.keys() | self.snapshot.keys()
+                       if snapshot.get(path) != self.snapshot.get(path)}
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+
+    def close(self):
+        pass
+
+def create_watcher(root, force_poll=False, poll_interval=0.5):
+    """Create an inotify watcher, falling back to polling where unavailable."""
+    if not force_poll:
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError, TypeError):
+            pass
+    return PollingWatcher(root, poll_interval)
+
+def affected_skills(changed_paths, watch_root, single_skill=None, ignored=()):
+    """Map changed file paths to the skill directories that need revalidation."""
+    watch_root = os.path.abspath(watch_root)
+    skills = set()
+
+    for path in changed_paths:
+        path = os.path.abspath(path)
+        if any(path == ignore or path.startswith(ignore + os.sep) for ignore in ignored):
+            continue
+        if single_skill is not None:
+            return {single_skill}
+
+        rel_path = os.path.relpath(path, watch_root)
+        if rel_path == os.curdir:
+            # Whole tree changed (e.g. inotify queue overflow)
+            return set(find_skill_dirs(watch_root))
+        top = rel_path.split(os.sep, 1)[0]
+        if top == os.pardir or top.startswith('.'):
+            continue
+        skills.add(Path(watch_root) / top)
+
+    return skills
+
+def watch(target, is_root, strict=False, cache=None, options=None, output_format="text",
+          debounce=0.05, force_poll=False, poll_interval=0.5):
+    """Keep a warm validator running and revalidate skills as their files change."""
+    options = options or {}
+    rule_set = load_rule_set(options.get('rules_config'))
+    target = Path(target)
+    single_skill = None if is_root else target
+    ignored = []
+    if cache is not None:
+        ignored.append(os.path.abspath(cache.cache_path.parent))
+
+    watcher = create_watcher(target, force_poll, poll_interval)
+    mode = "inotify" if isinstance(watcher, InotifyWatcher) else "polling"
+    print(f"👀 Watching {target} ({mode}); press Ctrl+C to stop", file=sys.stderr)
+
+    # Latest result per skill, so the dependency graph is rebuilt from cached
+    # dependencies on every pass instead of revalidating every skill
+    latest = {}
+
+    def dependency_findings(result):
+        return [f for f in result['findings'] if f['rule'].startswith("dependencies/")]
+
+    def revalidate(skill_dirs):
+        elapsed = {}
+        for skill_dir in sorted(skill_dirs):
+            if not skill_dir.is_dir():
+                print(f"🗑️  {skill_dir.name} removed", file=sys.stderr)
+                latest.pop(skill_dir.name, None)
+                continue
+            start = time.perf_counter()
+            validator = SkillValidator(skill_dir, quiet=True, cache=cache, sibling_dependencies=not is_root,
+                                       **options)
+            validator.run_validation()
+            result = validator.result()
+            elapsed[result['name']] = (time.perf_counter() - start) * 1000
+            latest[result['name']] = result
+
+        reported = set(elapsed)
+        if is_root:
+            # Other skills are reported too when a change adds or clears their dependency findings
+            before = {name: dependency_findings(result) for name, result in latest.items()}
+            check_dependencies(list(latest.values()), target, rule_set)
+            reported |= {name for name, result in latest.items() if dependency_findings(result) != before[name]}
+
+        results = [latest[name] for name in sorted(reported)]
+        if output_format == "text":
+            for result in results:
+                stamp = datetime.now().strftime("%H:%M:%S")
+                suffix = (f" in {elapsed[result['name']]:.1f}ms" if result['name'] in elapsed
+                          else " (dependencies changed)")
+                print(f"\n[{stamp}] ", end="")
+                print_skill_result(result, strict, suffix)
+
+        if results and output_format != "text":
+            report = build_sarif_report(results) if output_format == "sarif" else build_json_report(results, strict)
+            print(json.dumps(report, ensure_ascii=False))
+        sys.stdout.flush()
+        save_cache(cache)
+
+    try:
+        revalidate(find_skill_dirs(target) if is_root else [target])
+        while True:
+            changed = watcher.wait()
+            # Debounce: keep collecting until events stop arriving
+            while True:
+                more = watcher.wait(debounce)
+                if not more:
+                    break
+                changed |= more
+
+            skill_dirs = affected_skills(changed, target, single_skill, ignored)
+            if skill_dirs:
+                revalidate(skill_dirs)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching", file=sys.stderr)
+    finally:
+        watcher.close()
+
+def save_cache(cache):
+    """Persist the validation cache, warning instead of failing on I/O errors."""
+    if cache is None:
+        return
+    try:
+        cache.save()
+    except OSError as e:
+        print(f"⚠️  Could not write validation cache {cache.cache_path}: {e}", file=sys.stderr)
+
 def main():
     parser = argparse.ArgumentParser(description="Validate SLIM marketplace skill")
-    parser.add_argument("skill_path", help="Path to skill directory")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("skill_path", nargs="?", help="Path to skill directory")
+    target.add_argument("--all", metavar="SKILLS_ROOT", dest="skills_root",
+                       help="Validate every skill under this directory in parallel")
+    parser.add_argument("--workers", type=int, default=None,
+                       help="Worker processes for --all (default: CPU count)")
     parser.add_argument("--strict", action="store_true",
                        help="Treat warnings as errors")
+    parser.add_argument("--format", choices=["text", "json", "sarif"], default="text",
+                       dest="output_format",
+                       help="Report format; json and sarif include rule ids, locations and step timings")
+    parser.add_argument("--watch", action="store_true",
+                       help="Keep running and revalidate skills whenever their files change")
+    parser.add_argument("--debounce-ms", type=int, default=50,
+                       help="Quiet period that ends a burst of changes in --watch mode")
+    parser.add_argument("--poll", action="store_true",
+                       help="Use the polling watcher even where inotify is available")
+    parser.add_argument("--poll-interval", type=float, default=0.5,
+                       help="Seconds between scans for the polling watcher")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                       help=f"Validation cache file (default: {DEFAULT_CACHE_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                       help="Always revalidate and do not read or write the cache")
+    parser.add_argument("--max-asset-mb", type=float, default=DEFAULT_ASSET_BUDGETS['max_file_mb'],
+                       help="Largest allowed single asset file in MB")
+    parser.add_argument("--max-assets-total-mb", type=float, default=DEFAULT_ASSET_BUDGETS['max_total_mb'],
+                       help="Total asset size budget per skill in MB")
+    parser.add_argument("--max-asset-files", type=int, default=DEFAULT_ASSET_BUDGETS['max_files'],
+                       help="Asset file count budget per skill")
+    parser.add_argument("--duplicates", action="store_true",
+                       help="With --all, report byte-identical asset files across skills instead of validating")
+    parser.add_argument("--link-duplicates", action="store_true",
+                       help="With --duplicates, replace each duplicate with a relative symlink to its first copy")
+    parser.add_argument("--rules-config", default=None,
+                       help=f"YAML/JSON file enabling/disabling rules and loading rule plugins "
+                            f"(default: {DEFAULT_RULES_CONFIG} if present)")
+    parser.add_argument("--list-rules", action="store_true",
+                       help="List registered rules and whether they are enabled, then exit")
+    parser.add_argument("--profile-rules", action="store_true",
+                       help="Report time spent in each rule and artifact load")
 
     args = parser.parse_args()
 
+    rules_config = args.rules_config
+    if rules_config is None and Path(DEFAULT_RULES_CONFIG).is_file():
+        rules_config = DEFAULT_RULES_CONFIG
+
+    try:
+        rule_set = load_rule_set(rules_config)
+    except (OSError, yaml.YAMLError, ValueError, AttributeError, ImportError, SyntaxError) as e:
+        print(f"❌ Cannot load rules config {rules_config}: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    if args.list_rules:
+        list_rules(rule_set)
+        return
+
+    if not (args.skill_path or args.skills_root):
+        parser.error("one of the arguments skill_path --all is required")
+
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.duplicates or args.link_duplicates:
+        if not args.skills_root:
+            parser.error("--duplicates requires --all SKILLS_ROOT")
+        if not Path(args.skills_root).is_dir():
+            print(f"❌ Skills directory does not exist: {args.skills_root}")
+            sys.exit(1)
+
+        report = find_duplicate_assets(args.skills_root, args.workers)
+        if args.output_format == "text":
+            print_duplicate_report(report)
+        else:
+            print(json.dumps(report, indent=2))
+
+        if args.link_duplicates and report['groups']:
+            try:
+                replaced = link_duplicate_assets(report)
+            except OSError as e:
+                print(f"❌ Failed to link duplicates: {e}")
+                sys.exit(1)
+            if args.output_format == "text":
+                print(f"\n🔗 Replaced {replaced} duplicate file(s) with symlinks")
+        return
+
+    cache = None if args.no_cache else ValidationCache(args.cache)
+    options = {
+        'asset_budgets': {
+            'max_file_mb': args.max_asset_mb,
+            'max_total_mb': args.max_assets_total_mb,
+            'max_files': args.max_asset_files
+        },
+        'rules_config': rules_config
+    }
+
+    if args.watch:
+        target = Path(args.skills_root or args.skill_path)
+        if not target.is_dir():
+            print(f"❌ Directory does not exist: {target}", file=sys.stderr)
+            sys.exit(1)
+
+        watch(target, bool(args.skills_root), args.strict, cache, options, args.output_format,
+              args.debounce_ms / 1000, args.poll, args.poll_interval)
+        return
+
+    if args.skills_root:
+        skills_root = Path(args.skills_root)
+        if not skills_root.is_dir():
+            print(f"❌ Skills directory does not exist: {skills_root}", file=sys.stderr)
+            sys.exit(1)
+
+        is_valid = validate_all(skills_root, args.workers, args.strict, cache, options,
+                                args.output_format, args.profile_rules)
+        save_cache(cache)
+        sys.exit(0 if is_valid else 1)
+
     skill_path = Path(args.skill_path)
     if not skill_path.exists():
-        print(f"❌ Skill directory does not exist: {skill_path}")
+        print(f"❌ Skill directory does not exist: {skill_path}", file=sys.stderr)
         sys.exit(1)
 
-    validator = SkillValidator(skill_path)
+    if args.output_format != "text":
+        validator = SkillValidator(skill_path, quiet=True, cache=cache, sibling_dependencies=True, **options)
+        validator.run_validation()
+        save_cache(cache)
+        result = validator.result()
+        print_structured_report([result], args.output_format, args.strict, profile=args.profile_rules)
+        sys.exit(0 if is_result_valid(result, args.strict) else 1)
+
+    validator = SkillValidator(skill_path, cache=cache, sibling_dependencies=True, **options)
     is_valid = validator.run_validation()
+    save_cache(cache)
+
+    if args.profile_rules:
+        print_rule_profile([validator.result()])
 
     if args.strict and validator.warnings:
         print("\n🚫 Strict mode: treating warnings as errors")